@@ -2,21 +2,37 @@
 """Python package that wraps ``sphinx`` documentation package for creating HTML documentation.
 """
 import os
-import pathlib
 
+from functools import lru_cache
 from typing import List
 
 name: str = "auto-doc"
 
-_pkg_path: str = os.path.join(str(pathlib.Path(os.path.abspath(__file__)).parents[0]))
+_pkg_path: str = os.path.dirname(os.path.abspath(__file__))
 
 _MISCDIR: str = os.path.abspath(os.path.join(_pkg_path, "misc"))
 
 _version_file: str = os.path.abspath(os.path.join(_MISCDIR, "version.txt"))
 
-with open(_version_file, "r") as f:
-    file_contents: str = f.read()
-    _version: str = file_contents.strip("\n")
+
+@lru_cache(maxsize=None)
+def _read_version() -> str:
+    """Helper function that reads the package version (on first use).
+
+    Returns:
+        Version string.
+    """
+    with open(_version_file, "r") as f:
+        file_contents: str = f.read()
+    return file_contents.strip("\n")
+
+
+def __getattr__(attr: str) -> str:
+    """Module attribute hook that reads the version lazily, so that importing ``autodoc`` does not read any files."""
+    if attr in ("__version__", "_version"):
+        return _read_version()
+    raise AttributeError(f"module {__name__!r} has no attribute {attr!r}")
+
 
 __author__: str = "Adebayo Braimah"
 __maintainer__: str = __author__
@@ -27,7 +43,6 @@ __credits__: List[str] = [
     "CCHMC Dept. of Radiology",
 ]
 __license__: str = "GPL"
-__version__: str = _version
 __maintainer__: str = "Adebayo Braimah"
 __email__: str = "adebayo.braimah@gmail.com"
 __status__: str = "Development"
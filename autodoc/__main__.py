@@ -0,0 +1,7 @@
+"""Run the command line interface with ``python -m autodoc``.
+"""
+import sys
+
+from autodoc.cli import main
+
+sys.exit(main())
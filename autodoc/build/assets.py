@@ -0,0 +1,316 @@
+"""Post-build processing of Sphinx HTML output: content-hashed asset filenames and precompression.
+
+Usage example:
+    .. code-block:: python
+
+        >>> postprocess("path/to/repo/doc/build/html")
+        {'hashed': 12, 'compressed': 57}
+
+NOTE:
+    * Content-hashed assets can be cached by browsers indefinitely (e.g. ``Cache-Control: immutable``).
+    * Precompressed files (``.gz``, ``.br``, ``.zst``) can be served by static servers as is (e.g. ``gzip_static`` for nginx).
+"""
+import gzip
+import hashlib
+import os
+import re
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterator, List, Optional, Pattern, Set, Tuple
+
+# Extensions of the static assets that are content-hashed
+HASHED_EXTENSIONS: Tuple[str, ...] = (".css", ".js")
+
+# Extensions of the files that are precompressed
+COMPRESSED_EXTENSIONS: Tuple[str, ...] = (".html", ".css", ".js", ".svg", ".json", ".txt", ".xml")
+
+# Number of hexadecimal digits of content hashes
+_HASH_LENGTH: int = 10
+
+# References to (optionally already hashed, optionally versioned) static assets in HTML pages
+_ASSET_REF_RE: Pattern = re.compile(
+    r"(_static/[^\"'?#\s<>]+?)(?:\.[0-9a-f]{%d})?(\.(?:css|js))(?:\?v=[0-9a-f]+)?(?=[\"'#\s>])" % _HASH_LENGTH
+)
+
+# Content-hashed asset filenames
+_HASHED_NAME_RE: Pattern = re.compile(r"^(.+)\.[0-9a-f]{%d}(\.(?:css|js))$" % _HASH_LENGTH)
+
+
+def postprocess(
+    htmldir: str,
+    hash_assets: bool = True,
+    compress: bool = True,
+    workers: Optional[int] = None,
+) -> Dict[str, int]:
+    """Post-processes Sphinx HTML output: content-hashes static assets, then precompresses text files.
+
+    NOTE:
+        See :func:`hash_static_assets` and :func:`precompress`.
+
+    Args:
+        htmldir: Sphinx HTML output directory (e.g. ``<outdir>/doc/build/html``).
+        hash_assets: Content-hash static assets and rewrite references to them. Defaults to True.
+        compress: Precompress text files. Defaults to True.
+        workers: Number of files to compress concurrently. Defaults to None (the number of CPUs).
+
+    Returns:
+        Dictionary with the number of ``hashed`` assets and (re-)``compressed`` files.
+    """
+    summary: Dict[str, int] = {"hashed": 0, "compressed": 0}
+
+    if hash_assets:
+        summary["hashed"] = len(hash_static_assets(htmldir))
+
+    if compress:
+        summary["compressed"] = precompress(htmldir, workers=workers)
+
+    return summary
+
+
+def hash_static_assets(htmldir: str) -> Dict[str, str]:
+    """Content-hashes the CSS and JavaScript files of ``_static``, and rewrites references to them in HTML pages.
+
+    Each asset ``_static/<name>.<ext>`` is copied to ``_static/<name>.<hash>.<ext>``, and references in HTML pages
+    (including Sphinx's ``?v=`` cache-busting query strings, and references to previously hashed copies) are
+    rewritten to the hashed copy. Hashed copies that are no longer current are removed.
+
+    NOTE:
+        * Assets are copied rather than renamed, as some are loaded by name (e.g. from CSS ``@import`` rules, or by Sphinx's search page).
+        * Relative references of assets (e.g. fonts of CSS files) are unaffected, as hashed copies are in the same directory.
+        * Running this function again (e.g. after an incremental build) is idempotent.
+
+    Args:
+        htmldir: Sphinx HTML output directory.
+
+    Returns:
+        Dictionary that maps asset paths (relative to ``htmldir``, e.g. ``_static/pygments.css``) to their hashed copies.
+    """
+    staticdir: str = os.path.join(htmldir, "_static")
+    hashed: Dict[str, str] = {}
+
+    if not os.path.isdir(staticdir):
+        return hashed
+
+    previous: Set[str] = set()
+
+    for dirpath, _, filenames in os.walk(staticdir):
+        for fname in filenames:
+            path: str = os.path.join(dirpath, fname)
+            match = _HASHED_NAME_RE.match(fname)
+
+            if match is not None and os.path.exists(os.path.join(dirpath, match.group(1) + match.group(2))):
+                previous.add(path)
+            elif fname.endswith(HASHED_EXTENSIONS):
+                hashed_path: str = _hashed_copy(path)
+                hashed[_relpath(path, htmldir)] = _relpath(hashed_path, htmldir)
+
+    for page in _iter_files(htmldir, (".html",)):
+        _rewrite_references(page, hashed)
+
+    current: Set[str] = {os.path.join(htmldir, x) for x in hashed.values()}
+
+    for path in previous - current:
+        os.remove(path)
+
+    return hashed
+
+
+def precompress(htmldir: str, workers: Optional[int] = None, min_size: int = 1024) -> int:
+    """Precompresses the text files (HTML, CSS, JavaScript, etc.) of Sphinx HTML output.
+
+    Each file is compressed with gzip (``<file>.gz``), and with brotli (``<file>.br``) and zstandard (``<file>.zst``)
+    if the ``brotli`` and ``zstandard`` packages are installed. Compressed files are up to date if their modification
+    time is that of their source, in which case they are skipped. Compressed files of removed sources are removed.
+
+    Args:
+        htmldir: Sphinx HTML output directory.
+        workers: Number of files to compress concurrently. Defaults to None (the number of CPUs).
+        min_size: Minimum file size (in bytes) to compress. Defaults to 1024.
+
+    Returns:
+        Number of (re-)compressed files.
+    """
+    compressors: Dict[str, Callable[[bytes], bytes]] = _compressors()
+    jobs: List[Tuple[str, str, Callable[[bytes], bytes]]] = []
+
+    # Remove compressed files of removed sources (e.g. stale hashed assets), but not other archives (e.g. downloads)
+    for path in _iter_files(htmldir, (".gz", ".br", ".zst")):
+        src: str = os.path.splitext(path)[0]
+
+        if src.endswith(COMPRESSED_EXTENSIONS) and not os.path.exists(src):
+            os.remove(path)
+
+    for path in _iter_files(htmldir, COMPRESSED_EXTENSIONS):
+        st: os.stat_result = os.stat(path)
+
+        if st.st_size < min_size:
+            continue
+
+        for ext, compressor in compressors.items():
+            if not _up_to_date(path + ext, st):
+                jobs.append((path, path + ext, compressor))
+
+    if workers is None:
+        workers: int = os.cpu_count() or 1
+
+    # zlib, brotli and zstandard release the GIL while compressing
+    if workers > 1 and len(jobs) > 1:
+        with ThreadPoolExecutor(max_workers=min(workers, len(jobs))) as executor:
+            list(executor.map(_compress, jobs))
+    else:
+        for job in jobs:
+            _compress(job)
+
+    return len({src for src, _, _ in jobs})
+
+
+def _compressors() -> Dict[str, Callable[[bytes], bytes]]:
+    """Helper function that returns the available compressors.
+
+    Returns:
+        Dictionary that maps compressed file extensions to compression functions.
+    """
+    compressors: Dict[str, Callable[[bytes], bytes]] = {
+        # mtime=0: the output only depends on the input
+        ".gz": lambda data: gzip.compress(data, compresslevel=9, mtime=0),
+    }
+
+    try:
+        import brotli
+
+        compressors[".br"] = lambda data: brotli.compress(data, quality=11)
+    except ImportError:
+        pass
+
+    try:
+        import zstandard
+
+        compressors[".zst"] = lambda data: zstandard.ZstdCompressor(level=19).compress(data)
+    except ImportError:
+        pass
+
+    return compressors
+
+
+def _compress(job: Tuple[str, str, Callable[[bytes], bytes]]) -> None:
+    """Helper function that compresses a file atomically, and gives the compressed file the modification time of its source.
+
+    Args:
+        job: Tuple of the source file path, compressed file path, and compression function.
+    """
+    src, dst, compressor = job
+    st: os.stat_result = os.stat(src)
+
+    with open(src, mode="rb") as f:
+        data: bytes = compressor(f.read())
+
+    tmp: str = f"{dst}.{os.getpid()}.tmp"
+
+    with open(tmp, mode="wb") as f:
+        f.write(data)
+
+    os.utime(tmp, ns=(st.st_atime_ns, st.st_mtime_ns))
+    os.replace(tmp, dst)
+    return None
+
+
+def _up_to_date(dst: str, st: os.stat_result) -> bool:
+    """Helper function that checks whether a compressed file is up to date.
+
+    Args:
+        dst: Compressed file path.
+        st: Status of the source file.
+
+    Returns:
+        True if the compressed file exists and has the modification time of its source, False otherwise.
+    """
+    try:
+        return os.stat(dst).st_mtime_ns == st.st_mtime_ns
+    except OSError:
+        return False
+
+
+def _hashed_copy(path: str) -> str:
+    """Helper function that copies a file to its content-hashed filename (if it does not exist yet).
+
+    Args:
+        path: File path.
+
+    Returns:
+        Content-hashed file path.
+    """
+    with open(path, mode="rb") as f:
+        data: bytes = f.read()
+
+    root, ext = os.path.splitext(path)
+    hashed_path: str = f"{root}.{hashlib.sha256(data).hexdigest()[:_HASH_LENGTH]}{ext}"
+
+    if not os.path.exists(hashed_path):
+        tmp: str = f"{hashed_path}.{os.getpid()}.tmp"
+        with open(tmp, mode="wb") as f:
+            f.write(data)
+        os.replace(tmp, hashed_path)
+
+    return hashed_path
+
+
+def _rewrite_references(page: str, hashed: Dict[str, str]) -> bool:
+    """Helper function that rewrites the static asset references of an HTML page to their content-hashed copies.
+
+    NOTE:
+        The page is only rewritten if its contents change.
+
+    Args:
+        page: HTML page path.
+        hashed: Dictionary that maps asset paths (relative to the HTML output directory) to their hashed copies.
+
+    Returns:
+        True if the page was rewritten, False otherwise.
+    """
+    with open(page, mode="r", encoding="utf-8", errors="surrogateescape") as f:
+        text: str = f.read()
+
+    def _replace(match) -> str:
+        ref: str = match.group(1) + match.group(2)
+        # References of pages in subdirectories are prefixed (e.g. "../_static/x.css"), but start with "_static/"
+        return hashed.get(ref, match.group(0))
+
+    new_text: str = _ASSET_REF_RE.sub(_replace, text)
+
+    if new_text == text:
+        return False
+
+    tmp: str = f"{page}.{os.getpid()}.tmp"
+    with open(tmp, mode="w", encoding="utf-8", errors="surrogateescape") as f:
+        f.write(new_text)
+    os.replace(tmp, page)
+    return True
+
+
+def _iter_files(directory: str, extensions: Tuple[str, ...]) -> Iterator[str]:
+    """Helper function that yields the files of a directory tree with the given extensions.
+
+    Args:
+        directory: Directory path.
+        extensions: File extensions.
+
+    Yields:
+        File paths.
+    """
+    for dirpath, _, filenames in os.walk(directory):
+        for fname in filenames:
+            if fname.endswith(extensions):
+                yield os.path.join(dirpath, fname)
+
+
+def _relpath(path: str, start: str) -> str:
+    """Helper function that returns a relative path with forward slashes (as used in URLs).
+
+    Args:
+        path: Path.
+        start: Start directory.
+
+    Returns:
+        Relative path.
+    """
+    return os.path.relpath(path, start).replace(os.sep, "/")
@@ -1,36 +1,250 @@
 """Wrapper module to build sphinx documentation.
 """
 import os
+import re
+import tempfile
+import time
+
+from typing import Dict, List, Optional, Pattern, Tuple, Union
 
-from commandio.command import Command
 from commandio.workdir import WorkDir
 
+from autodoc.utils.manifest import manifest_path
+from autodoc.utils.trace import stage
+from autodoc.utils.util import run_command
+
+# Parent directory of the autodoc package, so that ``conf.py`` can import its Sphinx extensions if autodoc is not installed
+_AUTODOC_PATH: str = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Sphinx build output: environment update summary
+_UPDATE_RE: Pattern = re.compile(
+    r"updating environment: .*?(\d+) added, (\d+) changed, (\d+) removed"
+)
+
+# Source file suffixes of the documentation (see ``source_suffix`` of :func:`autodoc.conf.write_conf._conf_info`)
+_SOURCE_SUFFIXES: Tuple[str, ...] = (".rst", ".txt", ".md")
 
-def build_docs(outdir: str) -> None:
+
+def build_docs(
+    outdir: str,
+    clean: bool = False,
+    jobs: Optional[Union[int, str]] = 1,
+    postprocess: bool = False,
+) -> Dict[str, int]:
     """Builds Sphinx HTML documentation locally.
 
     The output location of the documentation should be: ``<outdir>/doc/build``.
 
+    By default, the build is incremental: the Sphinx environment and doctrees (``<outdir>/doc/build/doctrees``)
+    are kept, so that only new or outdated documents are read and written.
+
+    If ``jobs`` is not 1, Sphinx reads and writes documents in parallel (``sphinx-build -j``), provided that
+    every loaded Sphinx extension declares itself safe for parallel reading and writing (see :func:`parallel_safety`).
+    Otherwise, a warning is printed and the build falls back to serial.
+
     NOTE:
-        ``out_dir`` is assumed to be the main/parent directory of the repository.
+        * ``out_dir`` is assumed to be the main/parent directory of the repository.
+        * The Sphinx build output is written to ``<outdir>/doc/.autodoc/build.log``.
+        * The ``AUTODOC_PATH`` environment variable of the build is set to the parent directory of autodoc (unless already set), from which ``conf.py`` imports the autodoc Sphinx extensions if autodoc is not installed.
+        * The size of the search index (``searchindex.js``) before and after the build is printed (see ``search`` of :func:`autodoc.documentation.write.write`).
+        * The working directory of the current process is not changed.
 
     Args:
         outdir: Output parent directory.
-    """
-    cwd: str = os.getcwd()
+        clean: Remove previous build output (``make clean``) before building. Defaults to False.
+        jobs: Number of parallel Sphinx processes, or "auto" (number of CPUs). Defaults to 1 (serial).
+        postprocess: Content-hash static assets and precompress the HTML output after building (see :func:`autodoc.build.assets.postprocess`). Defaults to False.
 
+    Returns:
+        Dictionary with the number of documents ``added``, ``changed``, ``removed``, ``read`` and ``written``.
+    """
     with WorkDir(outdir) as od:
         docdir: str = od.join("doc")
 
-    os.chdir(docdir)
+    log: str = manifest_path(outdir=outdir, name="build.log")
+    htmldir: str = os.path.join(docdir, "build", "html")
+    searchindex: str = os.path.join(htmldir, "searchindex.js")
+    index_size: int = _file_size(searchindex)
+    start: float = time.time()
+    env: Dict[str, str] = {"AUTODOC_PATH": os.environ.get("AUTODOC_PATH", _AUTODOC_PATH)}
+
+    with stage("build"):
+        # make clean
+        if clean:
+            run_command(["make", "clean"], cwd=docdir, log=log, env=env)
+
+        if jobs is not None and str(jobs) != "1" and not _parallel_allowed(outdir):
+            jobs: int = 1
+
+        # make html
+        if jobs is None or str(jobs) == "1":
+            run_command(["make", "html"], cwd=docdir, log=log, env=env)
+        else:
+            run_command(["make", "html", f"O=-j {jobs}"], cwd=docdir, log=log, env=env)
+
+    # Before post-processing, which rewrites the HTML pages
+    summary: Dict[str, int] = _build_summary(
+        log=log, srcdir=os.path.join(docdir, "source"), htmldir=htmldir, since=start
+    )
+
+    if postprocess:
+        from autodoc.build.assets import postprocess as postprocess_assets
+
+        with stage("assets"):
+            assets: Dict[str, int] = postprocess_assets(htmldir)
+        print(
+            f"\n{docdir}: Content-hashed {assets['hashed']} static asset(s) and precompressed {assets['compressed']} file(s).\n"
+        )
+
+    print(
+        f"\n{docdir}: Sphinx read {summary['read']} and wrote {summary['written']} document(s).\n"
+    )
+    print(
+        f"\n{searchindex}: Search index size {index_size:,} -> {_file_size(searchindex):,} bytes.\n"
+    )
+    return summary
+
+
+def parallel_safety(outdir: str) -> Dict[str, Tuple[Optional[bool], Optional[bool]]]:
+    """Checks whether the Sphinx extensions used by the documentation are safe for parallel builds.
+
+    The documentation's ``conf.py`` (see :func:`autodoc.conf.write_conf._conf_info`) and extensions are loaded
+    in a throwaway Sphinx application, and the ``parallel_read_safe`` and ``parallel_write_safe`` metadata of each
+    loaded extension is collected.
+
+    NOTE:
+        * ``out_dir`` is assumed to be the main/parent directory of the repository.
+        * Sphinx temporarily changes the working directory of the current process while it loads ``conf.py``, so this function should not be run concurrently in threads of the same process.
+
+    Args:
+        outdir: Output parent directory.
+
+    Raises:
+        ImportError: Exception that is raised if Sphinx is not installed.
+
+    Returns:
+        Dictionary that maps extension names to a tuple of whether they are safe for parallel reading and writing (**OR** None if undeclared).
+    """
+    from sphinx.application import Sphinx
+
+    with WorkDir(outdir) as od:
+        srcdir: str = od.join("doc", "source")
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        app = Sphinx(
+            srcdir=srcdir,
+            confdir=srcdir,
+            outdir=os.path.join(tmpdir, "html"),
+            doctreedir=os.path.join(tmpdir, "doctrees"),
+            buildername="html",
+            status=None,
+            warning=None,
+        )
+        safety: Dict[str, Tuple[Optional[bool], Optional[bool]]] = {
+            name: (
+                getattr(ext, "parallel_read_safe", None),
+                getattr(ext, "parallel_write_safe", None),
+            )
+            for name, ext in app.extensions.items()
+        }
+    return safety
+
+
+def _parallel_allowed(outdir: str) -> bool:
+    """Helper function that checks whether a parallel build is possible, and prints a warning if not.
+
+    Args:
+        outdir: Output parent directory.
+
+    Returns:
+        True if all Sphinx extensions are safe for parallel reading and writing, False otherwise.
+    """
+    try:
+        safety: Dict[str, Tuple[Optional[bool], Optional[bool]]] = parallel_safety(outdir)
+    except Exception as e:
+        print(f"\nWARNING: Unable to check Sphinx extensions for parallel safety ({e}). Building serially.\n")
+        return False
+
+    unsafe: List[str] = sorted(
+        name for name, (read_safe, write_safe) in safety.items() if not (read_safe and write_safe)
+    )
+
+    if unsafe:
+        print(
+            f"\nWARNING: Sphinx extension(s) not declared safe for parallel builds: {', '.join(unsafe)}. Building serially.\n"
+        )
+        return False
+    return True
+
+
+def _file_size(file: str) -> int:
+    """Helper function that returns the size of a file.
+
+    Args:
+        file: File path.
+
+    Returns:
+        File size (in bytes), **OR** 0 if the file does not exist.
+    """
+    try:
+        return os.path.getsize(file)
+    except OSError:
+        return 0
+
+
+def _build_summary(log: str, srcdir: str, htmldir: str, since: float) -> Dict[str, int]:
+    """Helper function that summarizes a Sphinx build.
+
+    The numbers of documents added, changed and removed are taken from the environment update line of the build
+    output (``updating environment: X added, Y changed, Z removed``), and the documents read are those added or
+    changed. The documents written are the HTML pages of source documents that the builder wrote since ``since``.
+
+    NOTE:
+        The per-document progress lines of the build output are not used, as parallel builds report one line per chunk of documents.
+
+    Args:
+        log: Sphinx build output (log) file.
+        srcdir: Documentation source directory.
+        htmldir: HTML output directory.
+        since: Start time of the build (seconds since the epoch).
+
+    Returns:
+        Dictionary with the number of documents ``added``, ``changed``, ``removed``, ``read`` and ``written``.
+    """
+    with open(log, mode="r", encoding="utf-8", errors="replace") as f:
+        text: str = f.read()
+
+    summary: Dict[str, int] = {
+        "added": 0,
+        "changed": 0,
+        "removed": 0,
+        "read": 0,
+        "written": 0,
+    }
+
+    update: List[str] = _UPDATE_RE.findall(text)
+    if update:
+        added, changed, removed = update[-1]
+        summary["added"] = int(added)
+        summary["changed"] = int(changed)
+        summary["removed"] = int(removed)
+        summary["read"] = int(added) + int(changed)
+
+    for dirpath, _, fnames in os.walk(htmldir):
+        for fname in fnames:
+            docname, ext = os.path.splitext(fname)
+            if ext != ".html":
+                continue
+
+            page: str = os.path.join(dirpath, fname)
+            source: str = os.path.join(srcdir, os.path.relpath(dirpath, htmldir), docname)
 
-    # make clean
-    clean: Command = Command("make clean")
-    clean.run()
+            try:
+                written: bool = os.path.getmtime(page) >= since
+            except OSError:
+                continue
 
-    # make html
-    html: Command = Command("make html")
-    html.run()
+            if written and any(os.path.isfile(source + x) for x in _SOURCE_SUFFIXES):
+                summary["written"] += 1
 
-    os.chdir(cwd)
-    return None
+    return summary
@@ -0,0 +1,332 @@
+"""Command line interface.
+
+Usage example:
+    .. code-block:: bash
+
+        autodoc init path/to/pkg -o path/to/repo
+        autodoc write path/to/pkg -o path/to/repo
+        autodoc build -o path/to/repo -j auto
+        autodoc all path/to/pkg -o path/to/repo   # init, write and build (skips up-to-date tasks)
+        autodoc all path/to/pkg -o path/to/repo --dry-run
+
+NOTE:
+    Subsystems (Sphinx, ``commandio``, etc.) are only imported by the sub-command that needs them, so that
+    starting the command line interface stays fast (see ``autodoc/tests/test_import_time.py``).
+"""
+import argparse
+import os
+import sys
+
+from typing import Optional, Sequence
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Entry point of the ``autodoc`` command line interface.
+
+    Args:
+        argv: Command line arguments. Defaults to None (``sys.argv``).
+
+    Returns:
+        Exit code.
+    """
+    parser: argparse.ArgumentParser = _parser()
+    args: argparse.Namespace = parser.parse_args(argv)
+
+    if args.command is None:
+        parser.print_help()
+        return 2
+
+    # Relative paths are resolved against different directories downstream (e.g. ``<outdir>/doc`` by sphinx-apidoc)
+    args.outdir = os.path.abspath(args.outdir)
+    if getattr(args, "pkg", None) is not None:
+        args.pkg = os.path.abspath(args.pkg)
+
+    if args.trace is None and args.profile_dir is None:
+        args.func(args)
+        return 0
+
+    from autodoc.utils.trace import TraceRecorder
+
+    with TraceRecorder(profile_dir=args.profile_dir) as rec:
+        args.func(args)
+
+    if args.trace is not None:
+        rec.export_chrome_trace(args.trace)
+    print(rec.summary())
+    return 0
+
+
+def _init(args: argparse.Namespace) -> None:
+    """Helper function for the ``init`` sub-command."""
+    from autodoc.documentation.initialize import doc_init
+
+    doc_init(
+        outdir=args.outdir,
+        pkg=args.pkg,
+        project=args.project,
+        copyright=args.copyright,
+        author=args.author,
+        release=args.release,
+        theme=args.theme,
+        profile=args.profile,
+    )
+    return None
+
+
+def _write(args: argparse.Namespace) -> None:
+    """Helper function for the ``write`` sub-command."""
+    from autodoc.documentation.write import write
+
+    write(
+        outdir=args.outdir,
+        pkg=args.pkg,
+        convert_tabs_to_spaces=not args.keep_tabs,
+        num_spaces=args.num_spaces,
+        workers=args.workers,
+        include=args.include or None,
+        exclude=args.exclude or None,
+        max_file_size=args.max_file_size,
+        reference_threshold=args.reference_threshold,
+        layout=args.layout,
+        api_engine=args.api_engine,
+        search=args.search,
+        page_lines=args.page_lines,
+        page_bytes=args.page_bytes,
+    )
+    return None
+
+
+def _build(args: argparse.Namespace) -> None:
+    """Helper function for the ``build`` sub-command."""
+    from autodoc.documentation.build import build_docs
+
+    build_docs(outdir=args.outdir, clean=args.clean, jobs=args.jobs, postprocess=args.postprocess)
+    return None
+
+
+def _all(args: argparse.Namespace) -> None:
+    """Helper function for the ``all`` sub-command.
+
+    The documentation pipeline runs as a task graph: independent tasks run concurrently, and up-to-date tasks
+    are skipped (see :func:`autodoc.documentation.pipeline.doc_pipeline`).
+    """
+    from autodoc.documentation.pipeline import doc_pipeline, format_plan
+
+    pipeline = doc_pipeline(
+        outdir=args.outdir,
+        pkg=args.pkg,
+        init_options={
+            "project": args.project,
+            "copyright": args.copyright,
+            "author": args.author,
+            "release": args.release,
+            "theme": args.theme,
+            "profile": args.profile,
+        },
+        write_options={
+            "convert_tabs_to_spaces": not args.keep_tabs,
+            "num_spaces": args.num_spaces,
+            "workers": args.workers,
+            "include": args.include or None,
+            "exclude": args.exclude or None,
+            "max_file_size": args.max_file_size,
+            "reference_threshold": args.reference_threshold,
+            "layout": args.layout,
+            "api_engine": args.api_engine,
+            "search": args.search,
+            "page_lines": args.page_lines,
+            "page_bytes": args.page_bytes,
+        },
+        build_options={
+            "clean": args.clean,
+            "jobs": args.jobs,
+            "postprocess": args.postprocess,
+        },
+    )
+
+    if args.dry_run:
+        print(f"\n{format_plan(pipeline.plan())}\n")
+        return None
+
+    print(f"\n{format_plan(pipeline.run())}\n")
+    return None
+
+
+class _VersionAction(argparse.Action):
+    """``--version`` action that reads the version only when requested."""
+
+    def __init__(self, option_strings, dest=argparse.SUPPRESS, default=argparse.SUPPRESS, help=None):
+        super().__init__(option_strings=option_strings, dest=dest, default=default, nargs=0, help=help)
+
+    def __call__(self, parser, namespace, values, option_string=None):
+        import autodoc
+
+        print(f"{parser.prog} {autodoc.__version__}")
+        parser.exit()
+
+
+def _parser() -> argparse.ArgumentParser:
+    """Helper function that creates the argument parser.
+
+    Returns:
+        Argument parser.
+    """
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(
+        prog="autodoc",
+        description="Create HTML documentation for python packages and script libraries quickly.",
+    )
+    parser.add_argument(
+        "--version", action=_VersionAction, help="Print the version and exit."
+    )
+
+    # Options shared by all sub-commands
+    common: argparse.ArgumentParser = argparse.ArgumentParser(add_help=False)
+    common.add_argument(
+        "-o",
+        "--outdir",
+        default=".",
+        help="Output parent directory, usually the repository (default: current directory).",
+    )
+    common.add_argument(
+        "--trace",
+        metavar="FILE",
+        default=None,
+        help="Write a Chrome trace (JSON) of the run to FILE, and print a summary.",
+    )
+    common.add_argument(
+        "--profile-dir",
+        metavar="DIR",
+        default=None,
+        help="Write cProfile statistics of each stage to DIR.",
+    )
+
+    init: argparse.ArgumentParser = argparse.ArgumentParser(add_help=False)
+    init.add_argument("--project", default=None, help="Project name.")
+    init.add_argument("--copyright", default=None, help="Copyright information.")
+    init.add_argument("--author", default=None, help="Author name.")
+    init.add_argument("--release", default=None, help="Release/version number.")
+    init.add_argument("--theme", default=None, help="Sphinx theme.")
+    init.add_argument(
+        "--profile",
+        choices=["default", "fast"],
+        default="default",
+        help='conf.py profile: "fast" disables expensive extensions and uses locally cached intersphinx inventories (default: default).',
+    )
+
+    write: argparse.ArgumentParser = argparse.ArgumentParser(add_help=False)
+    write.add_argument(
+        "--keep-tabs", action="store_true", help="Do not convert tabs to spaces."
+    )
+    write.add_argument(
+        "--num-spaces", type=int, default=4, help="Number of spaces per tab (default: 4)."
+    )
+    write.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of scripts to document concurrently (default: number of CPUs).",
+    )
+    write.add_argument(
+        "--include", action="append", default=[], help="Glob pattern of script files to include (repeatable)."
+    )
+    write.add_argument(
+        "--exclude", action="append", default=[], help="Glob pattern of files/directories to exclude (repeatable)."
+    )
+    write.add_argument(
+        "--max-file-size", type=int, default=None, help="Maximum script file size in bytes."
+    )
+    write.add_argument(
+        "--reference-threshold",
+        type=int,
+        default=None,
+        metavar="BYTES",
+        help="Reference scripts of at least BYTES bytes with literalinclude instead of copying them.",
+    )
+    write.add_argument(
+        "--layout",
+        choices=["flat", "tree"],
+        default="flat",
+        help='Script documentation layout: "tree" mirrors the package hierarchy under doc/source/scripts (default: flat).',
+    )
+    write.add_argument(
+        "--api-engine",
+        choices=["apidoc", "ast"],
+        default="apidoc",
+        help='Python API documentation engine: "ast" parses modules statically instead of importing them (default: apidoc).',
+    )
+    write.add_argument(
+        "--search",
+        choices=["full", "summary", "exclude"],
+        default="full",
+        help='Search indexing of script pages: "summary" indexes only titles and header comments, "exclude" removes them from the search index (default: full).',
+    )
+    write.add_argument(
+        "--page-lines",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Split script pages longer than N lines into numbered pages.",
+    )
+    write.add_argument(
+        "--page-bytes",
+        type=int,
+        default=None,
+        metavar="BYTES",
+        help="Split script pages larger than BYTES bytes into numbered pages.",
+    )
+
+    build: argparse.ArgumentParser = argparse.ArgumentParser(add_help=False)
+    build.add_argument(
+        "--clean", action="store_true", help="Remove previous build output first."
+    )
+    build.add_argument(
+        "-j",
+        "--jobs",
+        default="1",
+        help='Number of parallel Sphinx processes, or "auto" (default: 1).',
+    )
+    build.add_argument(
+        "--postprocess",
+        action="store_true",
+        help="Content-hash static assets and precompress HTML/CSS/JS files (gzip, plus brotli/zstd if installed).",
+    )
+
+    pkg: argparse.ArgumentParser = argparse.ArgumentParser(add_help=False)
+    pkg.add_argument("pkg", help="Path to package/repository.")
+
+    subparsers = parser.add_subparsers(dest="command", metavar="COMMAND")
+
+    sub: argparse.ArgumentParser = subparsers.add_parser(
+        "init", parents=[pkg, common, init], help="Initialize the documentation directory."
+    )
+    sub.set_defaults(func=_init)
+
+    sub: argparse.ArgumentParser = subparsers.add_parser(
+        "write", parents=[pkg, common, write], help="Write reStructured Text files."
+    )
+    sub.set_defaults(func=_write)
+
+    sub: argparse.ArgumentParser = subparsers.add_parser(
+        "build", parents=[common, build], help="Build HTML documentation."
+    )
+    sub.set_defaults(func=_build)
+
+    sub: argparse.ArgumentParser = subparsers.add_parser(
+        "all",
+        parents=[pkg, common, init, write, build],
+        help="Initialize, write and build documentation.",
+    )
+    sub.add_argument(
+        "-n",
+        "--dry-run",
+        action="store_true",
+        help="Print the tasks that would run (and why), without running them.",
+    )
+    sub.set_defaults(func=_all)
+
+    return parser
+
+
+if __name__ == "__main__":
+    sys.exit(main())
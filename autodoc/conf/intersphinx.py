@@ -0,0 +1,129 @@
+"""Local cache of intersphinx inventories, for offline builds.
+
+Inventories (``objects.inv`` files) are copied to ``<outdir>/doc/.autodoc/intersphinx``, and recorded in a
+mapping file (``mapping.json``) that the ``conf.py`` of the "fast" configuration profile reads its
+``intersphinx_mapping`` from (see :func:`autodoc.conf.write_conf._conf_info`).
+
+Usage example:
+    >>> cache_inventory(outdir, name="python", uri="https://docs.python.org/3", inventory="/path/to/python/objects.inv")
+    >>> refresh_inventories(outdir, {"python": ("https://docs.python.org/3", "/path/to/python/objects.inv")})
+"""
+import json
+import os
+import shutil
+
+from typing import Dict, List, Mapping, Tuple
+
+from autodoc.utils.manifest import file_hash, manifest_path
+from autodoc.utils.util import atomic_write
+
+# First line of Sphinx inventory files
+_INVENTORY_HEADER: bytes = b"# Sphinx inventory version"
+
+
+def inventory_dir(outdir: str) -> str:
+    """Returns the intersphinx inventory cache directory (``<outdir>/doc/.autodoc/intersphinx``), and creates it if it does not exist.
+
+    NOTE:
+        ``out_dir`` is assumed to be the main/parent directory of the repository.
+
+    Args:
+        outdir: Output parent directory.
+
+    Returns:
+        Inventory cache directory absolute path.
+    """
+    cachedir: str = manifest_path(outdir=outdir, name="intersphinx")
+    os.makedirs(cachedir, exist_ok=True)
+    return cachedir
+
+
+def load_inventory_mapping(outdir: str) -> Dict[str, Dict[str, str]]:
+    """Loads the mapping of the cached intersphinx inventories.
+
+    Args:
+        outdir: Output parent directory.
+
+    Returns:
+        Dictionary that maps project names to their base URI (``uri``) and cached inventory file name (``file``).
+    """
+    mapping_file: str = os.path.join(inventory_dir(outdir), "mapping.json")
+
+    if not os.path.exists(mapping_file):
+        return {}
+
+    try:
+        with open(mapping_file, mode="r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def cache_inventory(outdir: str, name: str, uri: str, inventory: str) -> bool:
+    """Copies an intersphinx inventory file to the local cache, and records it in the inventory mapping.
+
+    The cached inventory is only replaced if its contents change.
+
+    Args:
+        outdir: Output parent directory.
+        name: Project name (the ``intersphinx_mapping`` key, used in cross-references e.g. ``:py:class:`python:dict```).
+        uri: Base URI of the project's documentation.
+        inventory: Inventory (``objects.inv``) file path.
+
+    Raises:
+        ValueError: Exception that is raised if the file is not a Sphinx inventory.
+
+    Returns:
+        True if the cache was updated, False otherwise.
+    """
+    return bool(refresh_inventories(outdir, {name: (uri, inventory)}))
+
+
+def refresh_inventories(outdir: str, sources: Mapping[str, Tuple[str, str]]) -> List[str]:
+    """Pre-populates or refreshes the local intersphinx inventory cache from files.
+
+    Inventories are only copied if they are not cached yet, or if their contents changed. Cached inventories of
+    projects not in ``sources`` are kept.
+
+    Args:
+        outdir: Output parent directory.
+        sources: Dictionary that maps project names to a tuple of base URI and inventory (``objects.inv``) file path.
+
+    Raises:
+        ValueError: Exception that is raised if a file is not a Sphinx inventory.
+
+    Returns:
+        Sorted list of the names of the updated projects.
+    """
+    cachedir: str = inventory_dir(outdir)
+    mapping: Dict[str, Dict[str, str]] = load_inventory_mapping(outdir)
+    updated: List[str] = []
+
+    for name, (uri, inventory) in sorted(sources.items()):
+        with open(inventory, mode="rb") as f:
+            if not f.read(len(_INVENTORY_HEADER)) == _INVENTORY_HEADER:
+                raise ValueError(f"{inventory}: Not a Sphinx inventory file.")
+
+        fname: str = f"{name}.inv"
+        cached: str = os.path.join(cachedir, fname)
+        entry: Dict[str, str] = {"uri": uri, "file": fname}
+
+        if (
+            mapping.get(name, None) == entry
+            and os.path.exists(cached)
+            and file_hash(cached) == file_hash(inventory)
+        ):
+            continue
+
+        # Copy to a temporary file first, so that builds never read partially written inventories
+        tmp: str = os.path.join(cachedir, f".{fname}.{os.getpid()}.tmp")
+        shutil.copyfile(inventory, tmp)
+        os.replace(tmp, cached)
+
+        mapping[name] = entry
+        updated.append(name)
+
+    if updated:
+        with atomic_write(os.path.join(cachedir, "mapping.json")) as f:
+            json.dump(mapping, f, indent=2, sort_keys=True)
+    return updated
@@ -1,11 +1,74 @@
 """Generate text/information for sphinx configuration file for automated documentation.
 """
 import os
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 
-from commandio.fileio import File
 from commandio.workdir import WorkDir
 
+from autodoc.utils.util import write_file
+
+# Sphinx extensions enabled in ``conf.py``
+_EXTENSIONS: List[str] = [
+    "sphinx.ext.autodoc",
+    "sphinx.ext.napoleon",
+    "sphinxarg.ext",
+    "sphinx_autodoc_typehints",
+    "myst_parser",
+    "sphinx.ext.intersphinx",
+    "sphinx_tabs.tabs",
+    "sphinx.ext.viewcode",
+    "sphinx_rtd_dark_mode",
+]
+
+# MyST (markdown) syntax extensions enabled in ``conf.py``
+_MYST_EXTENSIONS: List[str] = [
+    "amsmath",
+    "colon_fence",
+    "deflist",
+    "dollarmath",
+    "fieldlist",
+    "html_admonition",
+    "html_image",
+    "linkify",
+    "replacements",
+    "smartquotes",
+    "strikethrough",
+    "substitution",
+    "tasklist",
+]
+
+# Configuration profiles: Sphinx extensions and MyST extensions
+#   * default: All extensions.
+#   * fast: No source code pages (viewcode), only inexpensive MyST extensions, and intersphinx inventories from a local cache (no network access).
+_PROFILES: Dict[str, Dict[str, List[str]]] = {
+    "default": {
+        "extensions": _EXTENSIONS,
+        "myst_extensions": _MYST_EXTENSIONS,
+    },
+    "fast": {
+        "extensions": [x for x in _EXTENSIONS if x != "sphinx.ext.viewcode"],
+        "myst_extensions": ["colon_fence", "deflist", "fieldlist"],
+    },
+}
+
+# Intersphinx configuration of the fast profile: inventories are read from the local cache (see autodoc.conf.intersphinx)
+_INTERSPHINX_TEXT: str = """
+# Intersphinx inventories are read from a local cache (see autodoc.conf.intersphinx), so builds do not access the network.
+import json
+
+_inventory_dir: str = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, ".autodoc", "intersphinx")
+_inventory_mapping: str = os.path.join(_inventory_dir, "mapping.json")
+
+intersphinx_mapping = {}
+
+if os.path.isfile(_inventory_mapping):
+    with open(_inventory_mapping, mode="r", encoding="utf-8") as f:
+        intersphinx_mapping = {
+            name: (x["uri"], os.path.join(_inventory_dir, x["file"]))
+            for name, x in json.load(f).items()
+        }
+"""
+
 
 def write_conf(
     outdir: str,
@@ -15,6 +78,7 @@ def write_conf(
     author: Optional[str] = None,
     release: Optional[str] = None,
     theme: Optional[str] = None,
+    profile: str = "default",
 ) -> str:
     """Writes sphinx configuration information to ``conf.py``.
 
@@ -30,6 +94,7 @@ def write_conf(
         author: Author name. Defaults to None.
         release: Release/version number/ID. Defaults to None.
         theme: Sphinx theme. Defaults to None.
+        profile: Configuration profile, "default" or "fast" (see :func:`_conf_info`). Defaults to "default".
 
     Returns:
         Path to sphinx configuration file.
@@ -42,6 +107,7 @@ def write_conf(
         "author": author,
         "release": release,
         "theme": theme,
+        "profile": profile,
     }
 
     with WorkDir(outdir) as od:
@@ -51,8 +117,7 @@ def write_conf(
 
             if not os.path.exists(conf_file):
                 conf_text: str = _conf_info(**conf_args)
-                with File(conf_file) as cf:
-                    cf.write(conf_text)
+                write_file(conf_file, text=conf_text, mode="w", atomic=True)
             else:
                 print(f"\n{conf_file}: Already exists in output directory.")
 
@@ -66,11 +131,16 @@ def _conf_info(
     author: Optional[str] = None,
     release: Optional[str] = None,
     theme: Optional[str] = None,
+    profile: str = "default",
 ) -> str:
     """Helper function for sphinx configuration file information.
 
     This function fills in the details for a sphinx ``conf.py`` file.
 
+    Profiles:
+        * ``default``: All extensions are enabled.
+        * ``fast``: Faster, offline builds. Source code pages (``sphinx.ext.viewcode``) and expensive MyST extensions (e.g. ``linkify``, math) are disabled, and ``intersphinx_mapping`` points at inventories cached in ``<outdir>/doc/.autodoc/intersphinx`` (see :mod:`autodoc.conf.intersphinx`).
+
     NOTE:
         ``pkg_path`` should be the relative path of the package/repository to the document directory.
 
@@ -81,10 +151,19 @@ def _conf_info(
         author: Author name. Defaults to None.
         release: Release/version number/ID. Defaults to None.
         theme: Sphinx theme. Defaults to None.
+        profile: Configuration profile, "default" or "fast". Defaults to "default".
+
+    Raises:
+        ValueError: Exception that is raised if the profile is not known.
 
     Returns:
         Returns sphinx configuration file text as strings.
     """
+    if profile not in _PROFILES:
+        raise ValueError(
+            f"Unknown configuration profile: {profile}. Choose from: {', '.join(_PROFILES)}."
+        )
+
     # Set NoneType to empty strings
     if pkg_path is None:
         pkg_path: str = ""
@@ -104,6 +183,12 @@ def _conf_info(
     if theme is None:
         theme: str = ""
 
+    extensions: str = "\n".join(f'    "{x}",' for x in _PROFILES[profile]["extensions"])
+    myst_extensions: str = "\n".join(
+        f'    "{x}",' for x in _PROFILES[profile]["myst_extensions"]
+    )
+    intersphinx: str = _INTERSPHINX_TEXT if profile == "fast" else ""
+
     _CONF_TEXT = f"""# Configuration file for the Sphinx documentation builder.
 #
 # This file only contains a selection of the most common options. For a full
@@ -122,6 +207,12 @@ import sys
 _pkg_path: str = os.path.abspath("{pkg_path}")
 sys.path.insert(0, _pkg_path)
 
+# Parent directory of autodoc (for its Sphinx extensions), if it is not installed (set by ``autodoc build``).
+# An installed autodoc takes precedence.
+_autodoc_path: str = os.environ.get("AUTODOC_PATH", "")
+if _autodoc_path and _autodoc_path not in sys.path:
+    sys.path.append(_autodoc_path)
+
 
 # -- Project information -----------------------------------------------------
 
@@ -139,17 +230,31 @@ release = "{release}"
 # extensions coming with Sphinx (named 'sphinx.ext.*') or your custom
 # ones.
 extensions = [
-    "sphinx.ext.autodoc",
-    "sphinx.ext.napoleon",
-    "sphinxarg.ext",
-    "sphinx_autodoc_typehints",
-    "myst_parser",
-    "sphinx.ext.intersphinx",
-    "sphinx_tabs.tabs",
-    "sphinx.ext.viewcode",
-    "sphinx-rtd-dark-mode",
+{extensions}
 ]
 
+# autodoc Sphinx extensions, if available:
+#   * highlight_cache: Cache highlighted code blocks across builds
+#   * search_summary: Index only the header comments of summarized script pages
+for _ext in ("autodoc.sphinxext.highlight_cache", "autodoc.sphinxext.search_summary"):
+    try:
+        __import__(_ext)
+    except ImportError as e:
+        print(f"\\nWARNING: Sphinx extension {{_ext}} could not be imported ({{e}}), and is disabled.\\n")
+        continue
+    extensions.append(_ext)
+
+# Script pages with summarized search entries (":autodoc-search: summary") would otherwise be fully indexed
+if "autodoc.sphinxext.search_summary" not in extensions:
+    for _dirpath, _, _filenames in os.walk(os.path.dirname(os.path.abspath(__file__))):
+        for _fname in (x for x in _filenames if x.endswith(".rst")):
+            with open(os.path.join(_dirpath, _fname), mode="r", encoding="utf-8", errors="replace") as f:
+                if f.readline().startswith(":autodoc-search: summary"):
+                    raise RuntimeError(
+                        f"{{os.path.join(_dirpath, _fname)}}: Summarized search entries require the "
+                        "autodoc.sphinxext.search_summary Sphinx extension, which could not be imported."
+                    )
+
 source_suffix = {{
     ".rst": "restructuredtext",
     ".txt": "markdown",
@@ -157,26 +262,14 @@ source_suffix = {{
 }}
 
 myst_enable_extensions = [
-    "amsmath",
-    "colon_fence",
-    "deflist",
-    "dollarmath",
-    "fieldlist",
-    "html_admonition",
-    "html_image",
-    "linkify",
-    "replacements",
-    "smartquotes",
-    "strikethrough",
-    "substitution",
-    "tasklist",
+{myst_extensions}
 ]
 
 # Sphinx-tab configuration
 sphinx_tabs_valid_builders = ["linkcheck"]
 sphinx_tabs_disable_tab_closing = True
 sphinx_tabs_disable_css_loading = False
-
+{intersphinx}
 
 # Add any paths that contain templates here, relative to this directory.
 templates_path = ["_templates"]
@@ -0,0 +1,668 @@
+"""Static python API documentation: an alternative to ``sphinx-apidoc`` and ``sphinx.ext.autodoc``.
+
+Python modules are parsed with :mod:`ast` (they are never imported), and their docstrings, signatures and
+type hints are written to reStructured Text pages with Python domain directives (``.. py:function::`` etc.).
+Sphinx then builds the API documentation without importing the package or any of its dependencies.
+"""
+import ast
+import hashlib
+import json
+import os
+import re
+
+from concurrent.futures import ProcessPoolExecutor
+from fnmatch import fnmatch
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple, Union
+
+from commandio.workdir import WorkDir
+
+from autodoc.doccode.shell import _chunksize
+from autodoc.utils.manifest import file_hash, load_manifest, manifest_path, save_manifest
+from autodoc.utils.util import atomic_write
+from autodoc.utils.walk import _PRUNE_DIRS
+
+# Version of the extracted documentation format: bump to invalidate cached extractions
+_CACHE_VERSION: str = "1"
+
+# Maximum length of values shown for module data and class attributes
+_MAX_VALUE_LENGTH: int = 80
+
+# Page names of the documentation source directory that module pages must not overwrite
+_RESERVED_PAGES: Set[str] = {"index", "modules", "conf"}
+
+# Decorators that do not make a function a separate kind of object
+_SKIPPED_DECORATORS: Set[str] = {"overload", "typing.overload"}
+
+
+def ast_apidoc(
+    outdir: str,
+    pkg_path: str,
+    excludes: Optional[Sequence[str]] = None,
+    workers: Optional[int] = None,
+    napoleon: bool = True,
+) -> List[str]:
+    """Writes python API documentation by statically parsing modules.
+
+    One page is written per module or package (``<outdir>/doc/source/<module name>.rst``), and the table of
+    contents is written to ``<outdir>/doc/source/modules.rst``, as with ``sphinx-apidoc``. Packages and modules are
+    found the same way as ``sphinx-apidoc`` does: directories are only descended into if they are packages (contain an
+    ``__init__.py`` file), and private (``_``-prefixed) modules and members are skipped.
+
+    The documentation extracted from each module is cached by content hash in ``<outdir>/doc/.autodoc/astapi``, so
+    only new or changed modules are parsed, in parallel. Pages are only replaced if their contents change, and
+    pages of modules that no longer exist are removed.
+
+    NOTE:
+        * ``out_dir`` is assumed to be the main/parent directory of the repository.
+        * Relative ``pkg_path`` and ``excludes`` paths are relative to the ``<outdir>/doc`` directory.
+        * Google style docstrings are converted to reStructured Text with ``sphinx.ext.napoleon`` if ``napoleon`` is True and Sphinx is installed.
+
+    Args:
+        outdir: Output parent directory.
+        pkg_path: Package path.
+        excludes: Paths (or ``fnmatch`` patterns) of files and/or directories to exclude. Defaults to None.
+        workers: Number of modules to parse concurrently (in separate processes). Defaults to None (the number of CPUs).
+        napoleon: Convert Google style docstrings to reStructured Text. Defaults to True.
+
+    Returns:
+        List of written reStructured Text files.
+    """
+    with WorkDir(outdir) as od:
+        docdir: str = od.join("doc")
+        srcdir: str = od.join("doc", "source")
+
+    root: str = os.path.abspath(os.path.join(docdir, pkg_path))
+    patterns: List[str] = [os.path.abspath(os.path.join(docdir, x)) for x in (excludes or [])]
+
+    modules: Dict[str, str] = find_modules(root, excludes=patterns)
+
+    cachedir: str = manifest_path(outdir=outdir, name="astapi")
+    os.makedirs(cachedir, exist_ok=True)
+
+    manifest: str = manifest_path(outdir=outdir, name="astapi.json")
+    entries: Dict[str, Dict[str, Any]] = load_manifest(manifest)
+    new_entries: Dict[str, Dict[str, Any]] = {}
+
+    keys: Dict[str, str] = {
+        name: _cache_key(path, napoleon) for name, path in modules.items()
+    }
+    extracted: Dict[str, Dict[str, str]] = {}
+    jobs: List[Tuple[str, str, bool]] = []
+
+    for name, path in modules.items():
+        cached: Union[Dict[str, str], None] = _load_cached(cachedir, keys[name])
+
+        if cached is None:
+            jobs.append((name, path, napoleon))
+        else:
+            extracted[name] = cached
+
+    if workers is None:
+        workers: int = os.cpu_count() or 1
+
+    # Parsing is CPU bound: use processes
+    if workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as executor:
+            results: List[Tuple[str, Dict[str, str]]] = list(
+                executor.map(_extract_job, jobs, chunksize=_chunksize(len(jobs), workers))
+            )
+    else:
+        results: List[Tuple[str, Dict[str, str]]] = [_extract_job(job) for job in jobs]
+
+    for name, doc in results:
+        extracted[name] = doc
+        with atomic_write(os.path.join(cachedir, f"{keys[name]}.json")) as f:
+            json.dump(doc, f)
+
+    pages: List[str] = []
+    packages: Set[str] = {
+        name for name, path in modules.items() if os.path.basename(path) == "__init__.py"
+    }
+    docnames: Dict[str, str] = _page_names(outdir, srcdir, modules, owned=set(entries))
+
+    for name in sorted(modules):
+        children: List[str] = sorted(
+            docnames[x] for x in modules if x.rsplit(".", 1)[0] == name and x != name
+        )
+        page: str = os.path.join(srcdir, f"{docnames[name]}.rst")
+
+        with atomic_write(page) as f:
+            f.write(_render_page(name, extracted[name], name in packages, children))
+
+        new_entries[page] = {"module": name, "hash": keys[name]}
+        pages.append(page)
+
+    # Table of contents
+    toc: str = os.path.join(srcdir, "modules.rst")
+    title: str = _escape(os.path.basename(root))
+    lines: List[str] = [title, "=" * len(title), "", ".. toctree::", "   :maxdepth: 4", ""]
+    lines.extend(f"   {docnames[x]}" for x in sorted(x for x in modules if "." not in x))
+
+    with atomic_write(toc) as f:
+        f.write("\n".join(lines) + "\n")
+
+    new_entries[toc] = {"module": None, "hash": None}
+    pages.append(toc)
+
+    # Remove pages of modules that no longer exist, and unused cached extractions
+    for page in entries:
+        if page not in new_entries and os.path.exists(page):
+            os.remove(page)
+
+    used: Set[str] = {f"{x}.json" for x in keys.values()}
+    for fname in os.listdir(cachedir):
+        if fname.endswith(".json") and fname not in used:
+            os.remove(os.path.join(cachedir, fname))
+
+    save_manifest(manifest, new_entries)
+    return pages
+
+
+def _page_names(
+    outdir: str, srcdir: str, modules: Iterable[str], owned: Set[str]
+) -> Dict[str, str]:
+    """Helper function that returns the page (document) names of modules, renaming those that would collide with other pages.
+
+    Pages are named after their module, unless that name is reserved (``index``, ``modules``, ``conf``), or the page
+    exists and was not written by :func:`ast_apidoc` (e.g. script documentation). Colliding names are suffixed
+    with underscores (e.g. ``index_``), as with the "tree" script documentation layout.
+
+    Args:
+        outdir: Output parent directory.
+        srcdir: Documentation source directory.
+        modules: Fully qualified module names.
+        owned: Pages written by the previous run of :func:`ast_apidoc`.
+
+    Returns:
+        Dictionary that maps module names to page names.
+    """
+    # Script documentation pages, which may not be written yet (e.g. when scripts are documented concurrently)
+    scripts: Set[str] = {
+        x["outfile"] for x in load_manifest(manifest_path(outdir=outdir)).values() if "outfile" in x
+    }
+    docnames: Dict[str, str] = {}
+    used: Set[str] = set()
+
+    for name in sorted(modules):
+        docname: str = name
+
+        while True:
+            page: str = os.path.join(srcdir, f"{docname}.rst")
+            collides: bool = (
+                docname in _RESERVED_PAGES
+                or docname in used
+                or page in scripts
+                or (os.path.exists(page) and page not in owned)
+            )
+            if not collides:
+                break
+            docname += "_"
+
+        if docname != name:
+            print(f"\n{name}: Page name is reserved or already used. Writing its documentation to {docname}.rst.\n")
+
+        docnames[name] = docname
+        used.add(docname)
+
+    return docnames
+
+
+def remove_ast_apidoc(outdir: str) -> List[str]:
+    """Removes the pages written by :func:`ast_apidoc`, e.g. before switching back to ``sphinx-apidoc``.
+
+    NOTE:
+        ``out_dir`` is assumed to be the main/parent directory of the repository.
+
+    Args:
+        outdir: Output parent directory.
+
+    Returns:
+        List of removed reStructured Text files.
+    """
+    manifest: str = manifest_path(outdir=outdir, name="astapi.json")
+
+    if not os.path.exists(manifest):
+        return []
+
+    removed: List[str] = []
+
+    for page in load_manifest(manifest):
+        if os.path.exists(page):
+            os.remove(page)
+            removed.append(page)
+
+    os.remove(manifest)
+    return removed
+
+
+def find_modules(root: str, excludes: Optional[Sequence[str]] = None) -> Dict[str, str]:
+    """Finds the python modules and packages of a package/repository.
+
+    If ``root`` is a package (contains an ``__init__.py`` file), then it is the top-level package. Otherwise, its
+    packages and python files are top-level packages and modules.
+
+    Args:
+        root: Package/repository path.
+        excludes: Absolute paths (or ``fnmatch`` patterns) of files and/or directories to exclude. Defaults to None.
+
+    Returns:
+        Dictionary that maps fully qualified module names to file paths, in sorted order.
+    """
+    root: str = os.path.abspath(root)
+    excludes: List[str] = list(excludes or [])
+    modules: Dict[str, str] = {}
+
+    if os.path.isfile(os.path.join(root, "__init__.py")):
+        base: str = os.path.dirname(root)
+    else:
+        base: str = root
+
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(
+            x
+            for x in dirnames
+            if x not in _PRUNE_DIRS
+            and not x.startswith(("_", "."))
+            and os.path.isfile(os.path.join(dirpath, x, "__init__.py"))
+            and not _excluded(os.path.join(dirpath, x), excludes)
+        )
+
+        rel: str = os.path.relpath(dirpath, base)
+        parts: List[str] = [] if rel == os.curdir else rel.split(os.sep)
+
+        for fname in sorted(filenames):
+            stem, ext = os.path.splitext(fname)
+            path: str = os.path.join(dirpath, fname)
+
+            if ext != ".py" or (stem.startswith("_") and stem != "__init__"):
+                continue
+
+            if _excluded(path, excludes) or not stem.isidentifier():
+                continue
+
+            name: str = ".".join(parts if stem == "__init__" else parts + [stem])
+
+            if name:
+                modules[name] = path
+
+    return dict(sorted(modules.items()))
+
+
+def _excluded(path: str, excludes: List[str]) -> bool:
+    """Helper function that checks whether a path is excluded.
+
+    Args:
+        path: Absolute file or directory path.
+        excludes: Absolute paths or ``fnmatch`` patterns.
+
+    Returns:
+        True if the path matches any exclusion, False otherwise.
+    """
+    return any(path == x or fnmatch(path, x) for x in excludes)
+
+
+def _cache_key(path: str, napoleon: bool) -> str:
+    """Helper function that computes the cache key of a module's extracted documentation.
+
+    Args:
+        path: Module file path.
+        napoleon: Whether docstrings are converted with ``sphinx.ext.napoleon``.
+
+    Returns:
+        Cache key (hexadecimal digest).
+    """
+    key: str = f"{_CACHE_VERSION}:{int(napoleon)}:{file_hash(path)}"
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+def _load_cached(cachedir: str, key: str) -> Union[Dict[str, str], None]:
+    """Helper function that loads a module's cached extracted documentation.
+
+    Args:
+        cachedir: Cache directory.
+        key: Cache key.
+
+    Returns:
+        Extracted documentation **OR** None if it is not cached (or unreadable).
+    """
+    try:
+        with open(os.path.join(cachedir, f"{key}.json"), mode="r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _extract_job(job: Tuple[str, str, bool]) -> Tuple[str, Dict[str, str]]:
+    """Helper function that extracts the documentation of a single module (in a worker process).
+
+    Args:
+        job: Tuple of the module name, file path, and whether to convert docstrings with ``sphinx.ext.napoleon``.
+
+    Returns:
+        Tuple of the module name and its extracted documentation.
+    """
+    name, path, napoleon = job
+    return name, extract_module(path, napoleon=napoleon)
+
+
+def extract_module(path: str, napoleon: bool = True) -> Dict[str, str]:
+    """Extracts the documentation of a python module, without importing it.
+
+    Args:
+        path: Module file path.
+        napoleon: Convert Google style docstrings to reStructured Text. Defaults to True.
+
+    Returns:
+        Dictionary with the module docstring (``doc``) and the reStructured Text of its public members (``members``).
+    """
+    with open(path, mode="rb") as f:
+        source: bytes = f.read()
+
+    try:
+        tree: ast.Module = ast.parse(source, filename=path)
+    except (SyntaxError, ValueError) as e:
+        return {"doc": f".. warning:: Unable to parse ``{os.path.basename(path)}``: {e}", "members": ""}
+
+    doc: Union[str, None] = ast.get_docstring(tree)
+
+    return {
+        "doc": "\n".join(_docstring(doc, napoleon, what="module", indent="")) if doc else "",
+        "members": "\n".join(_render_body(tree.body, indent="", napoleon=napoleon, in_class=False)),
+    }
+
+
+def _render_page(name: str, doc: Dict[str, str], is_package: bool, children: List[str]) -> str:
+    """Helper function that renders the page of a module or package.
+
+    Args:
+        name: Fully qualified module name.
+        doc: Extracted documentation (see :func:`extract_module`).
+        is_package: Whether the module is a package.
+        children: Fully qualified names of the subpackages and submodules.
+
+    Returns:
+        reStructured Text of the page.
+    """
+    title: str = f"{_escape(name)} {'package' if is_package else 'module'}"
+    lines: List[str] = [title, "=" * len(title), "", f".. py:module:: {name}", ""]
+
+    if doc["doc"]:
+        lines.extend([doc["doc"], ""])
+
+    if children:
+        lines.extend([".. toctree::", "   :maxdepth: 4", ""])
+        lines.extend(f"   {x}" for x in children)
+        lines.append("")
+
+    if doc["members"]:
+        lines.append(doc["members"])
+
+    return "\n".join(lines).rstrip("\n") + "\n"
+
+
+def _render_body(
+    body: List[ast.stmt], indent: str, napoleon: bool, in_class: bool
+) -> List[str]:
+    """Helper function that renders the public members defined in a module or class body.
+
+    Args:
+        body: Module or class body statements.
+        indent: Indentation of the directives.
+        napoleon: Convert Google style docstrings to reStructured Text.
+        in_class: Whether the body is a class body.
+
+    Returns:
+        Lines of reStructured Text.
+    """
+    lines: List[str] = []
+    seen: Set[str] = set()
+
+    for node in body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            decorators: List[str] = [ast.unparse(x) for x in node.decorator_list]
+
+            # Skip overload stubs, and property setters/deleters
+            if any(x in _SKIPPED_DECORATORS or x.endswith((".setter", ".deleter")) for x in decorators):
+                continue
+
+            if node.name.startswith("_") or node.name in seen:
+                continue
+
+            seen.add(node.name)
+            lines.extend(_render_function(node, decorators, indent, napoleon, in_class))
+        elif isinstance(node, ast.ClassDef):
+            if node.name.startswith("_") or node.name in seen:
+                continue
+
+            seen.add(node.name)
+            lines.extend(_render_class(node, indent, napoleon))
+        elif isinstance(node, (ast.Assign, ast.AnnAssign)):
+            targets: List[ast.expr] = node.targets if isinstance(node, ast.Assign) else [node.target]
+
+            if len(targets) != 1 or not isinstance(targets[0], ast.Name):
+                continue
+
+            name: str = targets[0].id
+
+            if name.startswith("_") or name in seen:
+                continue
+
+            seen.add(name)
+            lines.extend(_render_data(node, name, indent, in_class))
+
+    return lines
+
+
+def _render_function(
+    node: Union[ast.FunctionDef, ast.AsyncFunctionDef],
+    decorators: List[str],
+    indent: str,
+    napoleon: bool,
+    in_class: bool,
+) -> List[str]:
+    """Helper function that renders a function, method or property.
+
+    Args:
+        node: Function definition.
+        decorators: Decorator expressions.
+        indent: Indentation of the directive.
+        napoleon: Convert Google style docstrings to reStructured Text.
+        in_class: Whether the function is defined in a class body.
+
+    Returns:
+        Lines of reStructured Text.
+    """
+    names: Set[str] = {x.rsplit(".", 1)[-1] for x in decorators}
+    options: List[str] = []
+
+    if in_class and names & {"property", "cached_property"}:
+        lines: List[str] = [f"{indent}.. py:property:: {node.name}"]
+        if node.returns is not None:
+            options.append(f":type: {ast.unparse(node.returns)}")
+    else:
+        static: bool = "staticmethod" in names
+        drop_first: bool = in_class and not static and bool(node.args.posonlyargs or node.args.args)
+        signature: str = _signature(node.args, drop_first=drop_first)
+        returns: str = f" -> {ast.unparse(node.returns)}" if node.returns is not None else ""
+        directive: str = "py:method" if in_class else "py:function"
+        lines: List[str] = [f"{indent}.. {directive}:: {node.name}({signature}){returns}"]
+
+        if isinstance(node, ast.AsyncFunctionDef):
+            options.append(":async:")
+        if in_class and static:
+            options.append(":staticmethod:")
+        if in_class and "classmethod" in names:
+            options.append(":classmethod:")
+
+    if "abstractmethod" in names:
+        options.append(":abstractmethod:")
+
+    lines.extend(f"{indent}   {x}" for x in options)
+    lines.append("")
+
+    doc: Union[str, None] = ast.get_docstring(node)
+    if doc:
+        lines.extend(_docstring(doc, napoleon, what="method" if in_class else "function", indent=indent + "   "))
+        lines.append("")
+    return lines
+
+
+def _render_class(node: ast.ClassDef, indent: str, napoleon: bool) -> List[str]:
+    """Helper function that renders a class and its public members.
+
+    Args:
+        node: Class definition.
+        indent: Indentation of the directive.
+        napoleon: Convert Google style docstrings to reStructured Text.
+
+    Returns:
+        Lines of reStructured Text.
+    """
+    signature: str = ""
+
+    # The class signature is that of its constructor
+    for x in node.body:
+        if isinstance(x, ast.FunctionDef) and x.name == "__init__":
+            signature: str = _signature(x.args, drop_first=True)
+            break
+
+    lines: List[str] = [f"{indent}.. py:class:: {node.name}({signature})", ""]
+    inner: str = indent + "   "
+
+    bases: List[str] = [ast.unparse(x) for x in node.bases if ast.unparse(x) != "object"]
+    if bases:
+        lines.extend([f"{inner}Bases: " + ", ".join(f"``{x}``" for x in bases), ""])
+
+    doc: Union[str, None] = ast.get_docstring(node)
+    if doc:
+        lines.extend(_docstring(doc, napoleon, what="class", indent=inner))
+        lines.append("")
+
+    lines.extend(_render_body(node.body, indent=inner, napoleon=napoleon, in_class=True))
+    return lines
+
+
+def _render_data(
+    node: Union[ast.Assign, ast.AnnAssign], name: str, indent: str, in_class: bool
+) -> List[str]:
+    """Helper function that renders module data or a class attribute.
+
+    Args:
+        node: Assignment.
+        name: Assigned name.
+        indent: Indentation of the directive.
+        in_class: Whether the assignment is in a class body.
+
+    Returns:
+        Lines of reStructured Text.
+    """
+    lines: List[str] = [f"{indent}.. py:{'attribute' if in_class else 'data'}:: {name}"]
+
+    annotation: Union[ast.expr, None] = getattr(node, "annotation", None)
+    if annotation is not None:
+        lines.append(f"{indent}   :type: {ast.unparse(annotation)}")
+
+    if node.value is not None:
+        value: str = ast.unparse(node.value)
+        if len(value) <= _MAX_VALUE_LENGTH and "\n" not in value:
+            lines.append(f"{indent}   :value: {value}")
+
+    lines.append("")
+    return lines
+
+
+def _signature(args: ast.arguments, drop_first: bool = False) -> str:
+    """Helper function that renders the parameters of a function signature.
+
+    Args:
+        args: Function arguments.
+        drop_first: Drop the first positional parameter (e.g. ``self``, ``cls``). Defaults to False.
+
+    Returns:
+        Parameters, separated by commas.
+    """
+    def _param(arg: ast.arg, default: Optional[ast.expr] = None, prefix: str = "") -> str:
+        text: str = prefix + arg.arg
+        if arg.annotation is not None:
+            text += f": {ast.unparse(arg.annotation)}"
+        if default is not None:
+            text += f" = {ast.unparse(default)}" if arg.annotation is not None else f"={ast.unparse(default)}"
+        return text
+
+    positional: List[ast.arg] = args.posonlyargs + args.args
+    defaults: List[Optional[ast.expr]] = [None] * (len(positional) - len(args.defaults)) + list(args.defaults)
+    params: List[str] = [_param(x, d) for x, d in zip(positional, defaults)]
+
+    if args.posonlyargs:
+        params.insert(len(args.posonlyargs), "/")
+
+    if drop_first and positional:
+        params.pop(0)
+        if params and params[0] == "/":
+            params.pop(0)
+
+    if args.vararg is not None:
+        params.append(_param(args.vararg, prefix="*"))
+    elif args.kwonlyargs:
+        params.append("*")
+
+    params.extend(_param(x, d) for x, d in zip(args.kwonlyargs, args.kw_defaults))
+
+    if args.kwarg is not None:
+        params.append(_param(args.kwarg, prefix="**"))
+
+    return ", ".join(params)
+
+
+def _docstring(doc: str, napoleon: bool, what: str, indent: str) -> List[str]:
+    """Helper function that renders a docstring.
+
+    Args:
+        doc: Cleaned docstring (see :func:`ast.get_docstring`).
+        napoleon: Convert Google style docstrings to reStructured Text.
+        what: Type of the documented object (e.g. "module", "class", "function").
+        indent: Indentation of the docstring.
+
+    Returns:
+        Lines of reStructured Text.
+    """
+    if napoleon:
+        converter = _napoleon()
+        if converter is not None:
+            doc: str = str(converter(doc, what))
+
+    return [f"{indent}{x}".rstrip() for x in doc.splitlines()]
+
+
+@lru_cache(maxsize=1)
+def _napoleon():
+    """Helper function that returns a Google style docstring converter, if ``sphinx.ext.napoleon`` is available.
+
+    Returns:
+        Function that converts a docstring (and object type) to reStructured Text **OR** None.
+    """
+    try:
+        from sphinx.ext.napoleon import Config
+        from sphinx.ext.napoleon.docstring import GoogleDocstring
+    except ImportError:
+        return None
+
+    config = Config(napoleon_use_param=True, napoleon_use_rtype=True)
+
+    def _convert(doc: str, what: str) -> str:
+        return str(GoogleDocstring(doc, config, what=what))
+
+    return _convert
+
+
+def _escape(text: str) -> str:
+    """Helper function that escapes reStructured Text markup characters in titles.
+
+    Args:
+        text: Title text.
+
+    Returns:
+        Escaped text.
+    """
+    return re.sub(r"([\\_*`|])", r"\\\1", text)
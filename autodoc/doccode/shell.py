@@ -1,11 +1,25 @@
 """Module for documenting shell/command line code.
 """
 import os
-from typing import Optional, Set
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple, Type, Union
 
-from commandio.fileio import File
 from commandio.workdir import WorkDir
-from autodoc.utils.docshell import document_shell_script, _auto_detect as auto_detect
+from autodoc.utils.docshell import (
+    document_shell_script,
+    is_referenced,
+    is_script_doc,
+    remove_script_doc,
+    _auto_detect as auto_detect,
+)
+from autodoc.utils.manifest import file_hash, load_manifest, manifest_path, save_manifest
+from autodoc.utils.scanindex import scan
+from autodoc.utils.trace import emit, stage
+from autodoc.utils.util import atomic_write
+from autodoc.utils.walk import is_walked, walk_files
+
+# Pages of the documentation root, which are never replaced by script documentation ("flat" layout)
+_RESERVED_PAGES: Set[str] = {"index", "modules", "conf"}
 
 
 def write_script_docs(
@@ -13,66 +27,505 @@ def write_script_docs(
     outdir: str,
     convert_tabs_to_spaces: bool = True,
     num_spaces: Optional[int] = 4,
+    workers: Optional[int] = None,
+    use_processes: bool = False,
+    include: Optional[Sequence[str]] = None,
+    exclude: Optional[Sequence[str]] = None,
+    max_file_size: Optional[int] = None,
+    reference_threshold: Optional[int] = None,
+    layout: str = "flat",
+    search: str = "full",
+    page_lines: Optional[int] = None,
+    page_bytes: Optional[int] = None,
 ) -> Set[str]:
     """Writes reStructered Text files (shell) scripts.
 
+    Script documentation is written incrementally. A manifest (``<outdir>/doc/.autodoc/manifest.json``) records the
+    content hash, rendering options, and output file of each script, so that only new or changed scripts are
+    (re-)documented. Output files of scripts that no longer exist are removed. Scripts are found using a persistent
+    scan index (``<outdir>/doc/.autodoc/scan.sqlite``).
+
+    Layouts:
+        * ``flat``: Each script is documented in ``<outdir>/doc/source/<script name>.rst``.
+        * ``tree``: Each script is documented in ``<outdir>/doc/source/scripts/<script path relative to pkg_dir>.rst``, which mirrors the package hierarchy. Each directory has an ``index.rst`` file with a toctree of its scripts and subdirectories (see :func:`write_script_indexes`), and ``scripts/index`` is the root of the script documentation.
+
     NOTE:
         * ``out_dir`` is assumed to be the main/parent directory of the repository.
-        * If any reStructered Text files of package scripts exist in the output source directory, then those files will be overwritten.
+        * Existing pages are never replaced by script documentation, unless they are recorded in the manifest or are script documentation (see :func:`_script_outfile`). Scripts are documented to ``<name>_.rst`` instead.
+        * In the ``flat`` layout, if several scripts share the same filename, only the first (in sorted order) is documented.
 
     Args:
         pkg_dir: Path to package/repository.
         outdir: Path to output directory.
         convert_tabs_to_spaces: Convert tabs to spaces. Defaults to True.
         num_spaces: Number of spaces to replace tabs with. Only applicable when ``convert_tabs_to_spaces`` is True. Defaults to 4.
+        workers: Number of scripts to hash and render concurrently. Defaults to None (the number of CPUs).
+        use_processes: Use a process pool instead of a thread pool. Defaults to False.
+        include: Glob patterns of files to include. Defaults to None (all files).
+        exclude: Glob patterns of files and directories to exclude. Defaults to None.
+        max_file_size: Maximum script file size (in bytes). Larger files are not documented. Defaults to None (no limit).
+        reference_threshold: Script file size (in bytes) from which scripts are referenced with ``literalinclude`` instead of copied (see :func:`autodoc.utils.docshell.document_shell_script`). Defaults to None (always copy).
+        layout: Output layout, "flat" or "tree". Defaults to "flat".
+        search: Search mode of script pages, "full", "summary" or "exclude" (see :func:`autodoc.utils.docshell.document_shell_script`). Defaults to "full".
+        page_lines: Maximum number of lines per page. Longer scripts are split into several pages (see :func:`autodoc.utils.docshell.document_shell_script`). Defaults to None (no limit).
+        page_bytes: Maximum number of bytes per page. Larger scripts are split into several pages. Defaults to None (no limit).
 
     Returns:
         Set of strings that corresponds to output  reStructered Text files
     """
-    scripts: Set[str] = file_search(pkg_dir=pkg_dir)
+    manifest: str = manifest_path(outdir=outdir)
+
+    # Exclude documentation state files (e.g. the manifest itself) and build output
+    with stage("scan"):
+        scripts: Set[str] = file_search(
+            pkg_dir=pkg_dir,
+            include=include,
+            exclude=exclude,
+            exclude_dirs=[os.path.dirname(manifest), os.path.join(outdir, "doc", "build")],
+            max_file_size=max_file_size,
+            index=manifest_path(outdir=outdir, name="scan.sqlite"),
+        )
     rsts: Set[str] = set()
 
+    entries: Dict[str, Dict[str, Any]] = load_manifest(manifest)
+    new_entries: Dict[str, Dict[str, Any]] = {}
+    owned: Set[str] = {x["outfile"] for x in entries.values()}
+    claimed: Dict[str, str] = {}
+    jobs: List[Tuple[str, str, Optional[Dict[str, Any]], Dict[str, Any]]] = []
+
+    options: Dict[str, Any] = {
+        "convert_tabs_to_spaces": convert_tabs_to_spaces,
+        "num_spaces": num_spaces,
+        "reference_threshold": reference_threshold,
+        "search": search,
+        "page_lines": page_lines,
+        "page_bytes": page_bytes,
+    }
+
     with WorkDir(outdir) as od:
         srcdir: str = od.join("doc", "source")
 
         with WorkDir(srcdir) as sd:
 
-            for script in scripts:
-                with File(script) as scr:
-                    _, fname, _ = scr.file_parts()
-                    outfile: str = sd.join(f"{fname}.rst")
-
-                if not os.path.exists(outfile):
-                    document_shell_script(
-                        file=script,
-                        outfile=outfile,
-                        convert_tabs_to_spaces=convert_tabs_to_spaces,
-                        num_spaces=num_spaces,
-                    )
-                else:
+            for script in sorted(os.path.abspath(x) for x in scripts):
+                fname: str = os.path.splitext(os.path.basename(script))[0]
+                outfile: str = _script_outfile(
+                    script, sd.abspath(), pkg_dir=pkg_dir, layout=layout, owned=owned
+                )
+
+                if outfile in claimed:
                     print(
-                        f"\n{fname}: Script documentation already exists. Remove {outfile} if script/code documentation needs to be updated.\n"
+                        f"\n{fname}: Script documentation for {claimed[outfile]} already written to {outfile}. Skipping {script}.\n"
                     )
+                    continue
+
+                claimed[outfile] = script
+                jobs.append((script, outfile, entries.get(script, None), options))
+
+    if workers is None:
+        workers: int = os.cpu_count() or 1
+
+    # Results are collected in submission order, so that the output is the same as that of a serial run
+    with stage("render"):
+        if workers > 1 and len(jobs) > 1:
+            pool: Type[Executor] = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+            with pool(max_workers=min(workers, len(jobs))) as executor:
+                results: List[Tuple[str, Dict[str, Any]]] = list(
+                    executor.map(_render_script, jobs, chunksize=_chunksize(len(jobs), workers))
+                )
+        else:
+            results: List[Tuple[str, Dict[str, Any]]] = [_render_script(job) for job in jobs]
+
+    for script, entry in results:
+        new_entries[script] = entry
+        rsts.add(entry["outfile"])
+
+    # Remove documentation of scripts that no longer exist (or that moved, e.g. after a layout change)
+    for script, entry in entries.items():
+        stale: str = entry.get("outfile", "")
+        if (
+            new_entries.get(script, {}).get("outfile", None) != stale
+            and stale not in claimed
+            and os.path.exists(stale)
+        ):
+            remove_script_doc(stale, pages=entry.get("pages", None))
+            print(f"\n{script}: Script documentation moved or script no longer exists. Removed {stale}.\n")
+
+    if layout == "tree":
+        write_script_indexes(srcdir, rsts)
+
+    save_manifest(manifest, new_entries)
+    return rsts
+
+
+def update_script_docs(
+    files: Iterable[str],
+    outdir: str,
+    convert_tabs_to_spaces: bool = True,
+    num_spaces: Optional[int] = 4,
+    reference_threshold: Optional[int] = None,
+    layout: str = "flat",
+    pkg_dir: Optional[str] = None,
+    search: str = "full",
+    page_lines: Optional[int] = None,
+    page_bytes: Optional[int] = None,
+    include: Optional[Sequence[str]] = None,
+    exclude: Optional[Sequence[str]] = None,
+    max_file_size: Optional[int] = None,
+    use_ignore_files: bool = True,
+) -> Set[str]:
+    """Updates the reStructered Text files of specific (e.g. changed, created or deleted) script files.
+
+    Unlike :func:`write_script_docs`, the package is not searched. Each file is (re-)documented if it is a
+    new or changed script, and its documentation is removed if it no longer exists (or is no longer a script).
+    The manifest is updated accordingly.
+
+    NOTE:
+        * ``out_dir`` is assumed to be the main/parent directory of the repository.
+        * If ``pkg_dir`` is given, files are only documented if :func:`file_search` would find them (see :func:`autodoc.utils.walk.is_walked`), e.g. files that are excluded, too large, or ignored (``.gitignore``, ``.autodocignore``) are treated as removed.
+
+    Args:
+        files: Paths of the script files to update.
+        outdir: Path to output directory.
+        convert_tabs_to_spaces: Convert tabs to spaces. Defaults to True.
+        num_spaces: Number of spaces to replace tabs with. Only applicable when ``convert_tabs_to_spaces`` is True. Defaults to 4.
+        reference_threshold: Script file size (in bytes) from which scripts are referenced with ``literalinclude`` instead of copied. Defaults to None (always copy).
+        layout: Output layout, "flat" or "tree" (see :func:`write_script_docs`). Defaults to "flat".
+        pkg_dir: Path to package/repository. Required for the "tree" layout. Defaults to None.
+        search: Search mode of script pages, "full", "summary" or "exclude". Defaults to "full".
+        page_lines: Maximum number of lines per page. Defaults to None (no limit).
+        page_bytes: Maximum number of bytes per page. Defaults to None (no limit).
+        include: Glob patterns of files to include. Defaults to None (all files).
+        exclude: Glob patterns of files and directories to exclude. Defaults to None.
+        max_file_size: Maximum script file size (in bytes). Larger files are not documented. Defaults to None (no limit).
+        use_ignore_files: Honor ``.gitignore`` and ``.autodocignore`` files. Defaults to True.
+
+    Returns:
+        Set of strings that corresponds to the reStructered Text files of the given scripts (including removed files).
+    """
+    manifest: str = manifest_path(outdir=outdir)
+    entries: Dict[str, Dict[str, Any]] = load_manifest(manifest)
+    claimed: Dict[str, str] = {x["outfile"]: script for script, x in entries.items()}
+    owned: Set[str] = set(claimed)
+    rsts: Set[str] = set()
+
+    options: Dict[str, Any] = {
+        "convert_tabs_to_spaces": convert_tabs_to_spaces,
+        "num_spaces": num_spaces,
+        "reference_threshold": reference_threshold,
+        "search": search,
+        "page_lines": page_lines,
+        "page_bytes": page_bytes,
+    }
+
+    with WorkDir(outdir) as od:
+        srcdir: str = od.join("doc", "source")
+
+    exclude_dirs: List[str] = [os.path.dirname(manifest), os.path.join(outdir, "doc", "build")]
+    scripts: List[str] = []
+
+    # Documentation is removed first, so that removed scripts do not claim output files (e.g. of moved scripts)
+    for script in sorted({os.path.abspath(x) for x in files}):
+        if (
+            os.path.isfile(script)
+            and (
+                pkg_dir is None
+                or is_walked(
+                    pkg_dir,
+                    script,
+                    include=include,
+                    exclude=exclude,
+                    exclude_dirs=exclude_dirs,
+                    max_file_size=max_file_size,
+                    use_ignore_files=use_ignore_files,
+                )
+            )
+            and auto_detect(infile=script) is not None
+        ):
+            scripts.append(script)
+            continue
+
+        entry: Union[Dict[str, Any], None] = entries.pop(script, None)
+        if entry is not None and os.path.exists(entry["outfile"]):
+            remove_script_doc(entry["outfile"], pages=entry.get("pages", None))
+            print(f"\n{script}: Script no longer exists (or is excluded). Removed {entry['outfile']}.\n")
+            rsts.add(entry["outfile"])
+
+    for script in scripts:
+        outfile: str = _script_outfile(script, srcdir, pkg_dir=pkg_dir, layout=layout, owned=owned)
+        owner: Union[str, None] = claimed.get(outfile, None)
+
+        if owner is not None and owner != script and owner in entries:
+            print(
+                f"\n{script}: Script documentation for {owner} already written to {outfile}. Skipping {script}.\n"
+            )
+            continue
+
+        _, entry = _render_script((script, outfile, entries.get(script, None), options))
+        entries[script] = entry
+        claimed[outfile] = script
+        rsts.add(outfile)
 
-                rsts.add(outfile)
+    if layout == "tree":
+        write_script_indexes(srcdir, (x["outfile"] for x in entries.values()))
+
+    save_manifest(manifest, entries)
     return rsts
 
 
-def file_search(pkg_dir: str) -> Set[str]:
+def _script_outfile(
+    script: str,
+    srcdir: str,
+    pkg_dir: Optional[str] = None,
+    layout: str = "flat",
+    owned: Optional[Set[str]] = None,
+) -> str:
+    """Helper function that returns the reStructered Text file path of a script.
+
+    Output files never replace other pages: page names that are reserved ("flat" layout: ``index``, ``modules``,
+    ``conf``, and the package name and its ``sphinx-apidoc`` module pages), or that exist but are neither in
+    ``owned`` nor script documentation (e.g. pages written by hand), are suffixed with underscores (e.g. ``index_``).
+
+    Args:
+        script: Script file path.
+        srcdir: Documentation source directory.
+        pkg_dir: Path to package/repository. Required for the "tree" layout. Defaults to None.
+        layout: Output layout, "flat" or "tree" (see :func:`write_script_docs`). Defaults to "flat".
+        owned: Output files of documented scripts (i.e. of the manifest). Defaults to None.
+
+    Raises:
+        ValueError: Exception that is raised if the layout is not known.
+
+    Returns:
+        Output reStructered Text file path.
+    """
+    owned: Set[str] = owned or set()
+
+    if layout == "flat":
+        fname: str = os.path.splitext(os.path.basename(script))[0]
+        pkg_name: str = os.path.basename(os.path.abspath(pkg_dir)) if pkg_dir is not None else ""
+
+        if fname in _RESERVED_PAGES or (
+            pkg_name and (fname == pkg_name or fname.startswith(pkg_name + "."))
+        ):
+            fname: str = fname + "_"
+
+        while _is_foreign(os.path.join(srcdir, f"{fname}.rst"), owned):
+            fname: str = fname + "_"
+        return os.path.join(srcdir, f"{fname}.rst")
+
+    if layout != "tree":
+        raise ValueError(f"Unknown script documentation layout: {layout}. Choose from: flat, tree.")
+
+    rel: str = os.path.relpath(script, pkg_dir)
+
+    # Scripts outside of the package are documented at the top of the hierarchy
+    if rel.startswith(os.pardir + os.sep):
+        rel: str = os.path.basename(script)
+
+    # Keep file extensions (e.g. ``c.yml`` and ``c.json`` do not collide), and do not replace directory indexes
+    if os.path.basename(rel) == "index":
+        rel: str = rel + "_"
+
+    while _is_foreign(os.path.join(srcdir, "scripts", f"{rel}.rst"), owned):
+        rel: str = rel + "_"
+
+    return os.path.join(srcdir, "scripts", f"{rel}.rst")
+
+
+def _is_foreign(outfile: str, owned: Set[str]) -> bool:
+    """Helper function that checks whether a page exists, but was not written for a script.
+
+    Args:
+        outfile: reStructered Text file path.
+        owned: Output files of documented scripts.
+
+    Returns:
+        True if the file exists, and is neither in ``owned`` nor script documentation (e.g. of a lost manifest), False otherwise.
+    """
+    return os.path.exists(outfile) and outfile not in owned and not is_script_doc(outfile)
+
+
+def write_script_indexes(srcdir: str, rsts: Iterable[str]) -> Set[str]:
+    """Writes the per-directory ``index.rst`` files of the "tree" script documentation layout.
+
+    Each directory under ``<srcdir>/scripts`` that (recursively) contains script documentation gets an ``index.rst``
+    file with a toctree of its subdirectory indexes and script documents, in sorted order. Index files are only
+    replaced if their contents change, and index files and directories without script documentation are removed.
+
+    Args:
+        srcdir: Documentation source directory.
+        rsts: reStructured Text files of all documented scripts.
+
+    Returns:
+        Set of the index files.
+    """
+    scriptsdir: str = os.path.join(srcdir, "scripts")
+
+    # Directory -> (subdirectories, documents)
+    tree: Dict[str, Tuple[Set[str], Set[str]]] = {}
+
+    for rst in rsts:
+        rst: str = os.path.abspath(rst)
+
+        if not rst.startswith(scriptsdir + os.sep):
+            continue
+
+        directory: str = os.path.dirname(rst)
+        tree.setdefault(directory, (set(), set()))[1].add(os.path.basename(rst)[: -len(".rst")])
+
+        while directory != scriptsdir:
+            parent: str = os.path.dirname(directory)
+            tree.setdefault(parent, (set(), set()))[0].add(os.path.basename(directory))
+            directory: str = parent
+
+    indexes: Set[str] = set()
+
+    for directory, (subdirs, docs) in tree.items():
+        if directory == scriptsdir:
+            title: str = "Scripts"
+        else:
+            title: str = os.path.relpath(directory, scriptsdir).replace(os.sep, "/")
+
+        lines: List[str] = [title, "=" * len(title), "", ".. toctree::", "   :maxdepth: 1", ""]
+        lines.extend(f"   {x}/index" for x in sorted(subdirs))
+        lines.extend(f"   {x}" for x in sorted(docs))
+
+        idx: str = os.path.join(directory, "index.rst")
+        os.makedirs(directory, exist_ok=True)
+        with atomic_write(idx) as f:
+            f.write("\n".join(lines) + "\n")
+        indexes.add(idx)
+
+    # Remove stale index files and empty directories (bottom-up)
+    if os.path.isdir(scriptsdir):
+        for dirpath, _, filenames in os.walk(scriptsdir, topdown=False):
+            idx: str = os.path.join(dirpath, "index.rst")
+
+            if "index.rst" in filenames and idx not in indexes:
+                os.remove(idx)
+
+            if not os.listdir(dirpath):
+                os.rmdir(dirpath)
+
+    return indexes
+
+
+def _render_script(
+    job: Tuple[str, str, Optional[Dict[str, Any]], Dict[str, Any]]
+) -> Tuple[str, Dict[str, Any]]:
+    """Helper function that documents a single script if it is new or has changed since it was last documented.
+
+    NOTE:
+        Scripts that are referenced (``literalinclude``) rather than copied are not hashed: their documentation
+        only depends on their size and modification time (which may change their detected type), as Sphinx reads
+        their contents at build time.
+
+    Args:
+        job: Tuple of the script path, output file path, previous manifest entry (or None), and rendering options.
+
+    Returns:
+        Tuple of the script path and its updated manifest entry (including the number of pages of its documentation).
+    """
+    script, outfile, previous, options = job
+
+    if is_referenced(script, options.get("reference_threshold", None)):
+        st: os.stat_result = os.stat(script)
+        signature: str = f"stat:{st.st_size}:{st.st_mtime_ns}"
+    else:
+        signature: str = file_hash(script)
+
+    entry: Dict[str, Any] = {
+        "hash": signature,
+        "options": options,
+        "outfile": outfile,
+    }
+
+    if previous is None:
+        previous: Dict[str, Any] = {}
+
+    if any(previous.get(k, None) != v for k, v in entry.items()) or not os.path.exists(outfile):
+        # The previous page count only applies to the same output file (new pages have none)
+        if previous.get("outfile", None) == outfile:
+            previous_pages: Optional[int] = previous.get("pages", None)
+        elif not os.path.exists(outfile):
+            previous_pages: Optional[int] = 0
+        else:
+            previous_pages: Optional[int] = None
+
+        os.makedirs(os.path.dirname(outfile), exist_ok=True)
+        entry["pages"] = document_shell_script(
+            file=script, outfile=outfile, previous_pages=previous_pages, **options
+        )
+    else:
+        entry["pages"] = previous.get("pages", None)
+
+    return script, entry
+
+
+def _chunksize(num_jobs: int, workers: int) -> int:
+    """Helper function that computes the number of jobs to submit to each worker at a time.
+
+    Args:
+        num_jobs: Number of jobs.
+        workers: Number of workers.
+
+    Returns:
+        Chunk size (at least 1).
+    """
+    return max(1, num_jobs // (workers * 4))
+
+
+def file_search(
+    pkg_dir: str,
+    include: Optional[Sequence[str]] = None,
+    exclude: Optional[Sequence[str]] = None,
+    exclude_dirs: Optional[Sequence[str]] = None,
+    max_file_size: Optional[int] = None,
+    use_ignore_files: bool = True,
+    index: Optional[str] = None,
+) -> Set[str]:
     """File search for shell/scripting files.
 
+    NOTE:
+        * See :func:`autodoc.utils.walk.walk_files` for which directories and files are skipped.
+        * If a scan ``index`` is used, only files that changed since the last scan are re-examined (see :func:`autodoc.utils.scanindex.scan`).
+
     Args:
         pkg_dir: Package path.
+        include: Glob patterns of files to include. Defaults to None (all files).
+        exclude: Glob patterns of files and directories to exclude. Defaults to None.
+        exclude_dirs: Directory paths to exclude. Defaults to None.
+        max_file_size: Maximum file size (in bytes). Larger files are skipped. Defaults to None (no limit).
+        use_ignore_files: Honor ``.gitignore`` and ``.autodocignore`` files. Defaults to True.
+        index: Scan index file path. Defaults to None (no index).
 
     Returns:
         Set of strings.
     """
     files: Set[str] = set()
 
-    for root, _, filenames in os.walk(pkg_dir, topdown=True, followlinks=True):
-        if len(filenames) > 0:
-            for file in filenames:
-                fname: str = os.path.join(root, file)
-                if auto_detect(infile=fname) is not None:
-                    files.add(fname)
+    if index is not None:
+        found: Dict[str, Union[str, None]] = scan(
+            pkg_dir,
+            index=index,
+            include=include,
+            exclude=exclude,
+            exclude_dirs=exclude_dirs,
+            max_file_size=max_file_size,
+            use_ignore_files=use_ignore_files,
+        )
+        return {fname for fname, script_type in found.items() if script_type is not None}
+
+    for fname, st in walk_files(
+        pkg_dir,
+        include=include,
+        exclude=exclude,
+        exclude_dirs=exclude_dirs,
+        max_file_size=max_file_size,
+        use_ignore_files=use_ignore_files,
+    ):
+        emit("file_scanned", path=fname, size=st.st_size)
+        if auto_detect(infile=fname) is not None:
+            files.add(fname)
     return files
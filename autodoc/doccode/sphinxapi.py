@@ -1,29 +1,220 @@
 """Wrapper for ``sphinx-apidoc`` command line tool.
 """
+import logging
 import os
-from commandio.command import Command
+import threading
+import time
+
+from typing import List, Optional, Sequence, Set
+
 from commandio.workdir import WorkDir
 
+from autodoc.utils.util import run_command
 
-def sphinx_apidoc(outdir: str, pkg_path: str) -> None:
+
+def sphinx_apidoc(
+    outdir: str,
+    pkg_path: str,
+    excludes: Optional[Sequence[str]] = None,
+    separate: bool = False,
+    implicit_namespaces: bool = False,
+    force: bool = False,
+    module_first: bool = False,
+    in_process: bool = True,
+) -> List[str]:
     """Wrapper function for ``sphinx-apidoc``.
 
+    By default, ``sphinx-apidoc`` is run in the current python process (using ``sphinx.ext.apidoc.main``),
+    which avoids the interpreter startup and Sphinx import cost of a subprocess. The ``sphinx-apidoc``
+    executable is used if ``in_process`` is False, or if Sphinx cannot be imported.
+
     NOTE:
-        ``out_dir`` is assumed to be the main/parent directory of the repository.
+        * ``out_dir`` is assumed to be the main/parent directory of the repository.
+        * Relative ``pkg_path`` and ``excludes`` paths are relative to the ``<outdir>/doc`` directory.
+        * When the ``sphinx-apidoc`` executable is used, only the files that were created or modified are returned.
+        * The working directory of the current process is not changed.
 
     Args:
         outdir: Output parent directory.
         pkg_path: Package path.
-    """
-    cwd: str = os.getcwd()
+        excludes: Paths (or ``fnmatch`` patterns) of files and/or directories to exclude. Defaults to None.
+        separate: Put documentation for each module on its own page (``--separate``). Defaults to False.
+        implicit_namespaces: Interpret module paths according to PEP-0420 implicit namespaces specification (``--implicit-namespaces``). Defaults to False.
+        force: Overwrite existing files (``--force``). Defaults to False.
+        module_first: Put module documentation before submodule documentation (``--module-first``). Defaults to False.
+        in_process: Run ``sphinx-apidoc`` in the current python process. Defaults to True.
 
+    Raises:
+        RuntimeError: Exception that is raised if ``sphinx-apidoc`` fails.
+
+    Returns:
+        List of generated reStructured Text files.
+    """
     with WorkDir(outdir) as od:
         docdir: str = od.join("doc")
+        srcdir: str = od.join("doc", "source")
+
+    args: List[str] = ["-o", srcdir, os.path.join(docdir, pkg_path)]
+    args.extend(os.path.join(docdir, x) for x in (excludes or []))
+
+    if separate:
+        args.append("--separate")
+
+    if implicit_namespaces:
+        args.append("--implicit-namespaces")
+
+    if force:
+        args.append("--force")
+
+    if module_first:
+        args.append("--module-first")
+
+    if in_process:
+        try:
+            from sphinx.ext.apidoc import main
+        except ImportError:
+            in_process: bool = False
+
+    if in_process:
+        return _apidoc_main(main, args)
+
+    start: float = time.time()
+    run_command(["sphinx-apidoc"] + args, cwd=docdir)
+
+    with os.scandir(srcdir) as it:
+        return sorted(
+            x.path
+            for x in it
+            if x.name.endswith(".rst") and x.stat().st_mtime >= int(start)
+        )
+
+
+def remove_sphinx_apidoc(outdir: str) -> List[str]:
+    """Removes the pages written by ``sphinx-apidoc``, e.g. before switching to the "ast" engine (see :func:`autodoc.doccode.astapi.ast_apidoc`).
+
+    Pages are found from the table of contents (``modules.rst``): pages that are (recursively) listed in toctrees,
+    and that document modules with ``.. automodule::``, are removed. The table of contents itself is kept.
+
+    NOTE:
+        ``out_dir`` is assumed to be the main/parent directory of the repository.
+
+    Args:
+        outdir: Output parent directory.
+
+    Returns:
+        List of removed reStructured Text files.
+    """
+    with WorkDir(outdir) as od:
+        srcdir: str = od.join("doc", "source")
+
+    removed: List[str] = []
+    seen: Set[str] = set()
+    stack: List[str] = [os.path.join(srcdir, "modules.rst")]
+
+    while stack:
+        page: str = stack.pop()
+
+        if page in seen or not os.path.isfile(page):
+            continue
+        seen.add(page)
+
+        with open(page, mode="r", encoding="utf-8", errors="replace") as f:
+            text: str = f.read()
+
+        stack.extend(os.path.join(srcdir, f"{x}.rst") for x in _toctree_entries(text))
+
+        if ".. automodule::" in text:
+            os.remove(page)
+            removed.append(page)
+
+    return removed
+
+
+def _toctree_entries(text: str) -> List[str]:
+    """Helper function that returns the document names listed in the toctrees of a page.
+
+    Args:
+        text: reStructured Text.
+
+    Returns:
+        List of document names.
+    """
+    entries: List[str] = []
+    in_toctree: bool = False
+
+    for line in text.splitlines():
+        if line.startswith(".. toctree::"):
+            in_toctree: bool = True
+        elif in_toctree and line.strip() and not line[0].isspace():
+            in_toctree: bool = False
+        elif in_toctree and line.strip() and not line.strip().startswith(":"):
+            entries.append(line.strip())
+
+    return entries
+
+
+class _ApidocFileHandler(logging.Handler):
+    """Logging handler that collects the names of files created by ``sphinx-apidoc`` in the current thread."""
+
+    def __init__(self) -> None:
+        """Initialization method for the ``_ApidocFileHandler`` class."""
+        from sphinx.locale import __
+
+        super().__init__(level=logging.INFO)
+        self.thread: int = threading.get_ident()
+        self.files: List[str] = []
+
+        # Message of created files, as translated by Sphinx (existing files that are skipped are logged differently)
+        self.message: str = str(__("Creating file %s."))
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """Records the names of files that ``sphinx-apidoc`` logs as created.
+
+        Args:
+            record: Log record.
+        """
+        if (
+            record.thread == self.thread
+            and str(record.msg) == self.message
+            and record.args
+            and len(record.args) == 1
+        ):
+            self.files.append(os.path.abspath(str(record.args[0])))
+
+
+def _apidoc_main(main, args: List[str]) -> List[str]:
+    """Helper function that runs ``sphinx.ext.apidoc.main`` and collects the files it generates.
+
+    Args:
+        main: ``sphinx.ext.apidoc.main`` function.
+        args: Command line arguments.
+
+    Raises:
+        RuntimeError: Exception that is raised if ``sphinx-apidoc`` fails.
+
+    Returns:
+        List of generated reStructured Text files.
+    """
+    # Sphinx loggers are prefixed with "sphinx."
+    logger: logging.Logger = logging.getLogger("sphinx.sphinx.ext.apidoc")
+    handler: _ApidocFileHandler = _ApidocFileHandler()
+    level: int = logger.level
+
+    logger.addHandler(handler)
+    if logger.getEffectiveLevel() > logging.INFO:
+        logger.setLevel(logging.INFO)
 
-    os.chdir(docdir)
+    try:
+        returncode: int = main(args)
+    except SystemExit as e:
+        returncode: int = e.code if isinstance(e.code, int) else 1
+    finally:
+        logger.removeHandler(handler)
+        logger.setLevel(level)
 
-    sphinx: Command = Command(f"sphinx-apidoc -o source {pkg_path}")
-    sphinx.run()
+    if returncode != 0:
+        raise RuntimeError(
+            f"\nFailed:\tsphinx-apidoc {' '.join(args)} with return code {returncode}\n"
+        )
 
-    os.chdir(cwd)
-    return None
+    return list(dict.fromkeys(handler.files))
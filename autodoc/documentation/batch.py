@@ -0,0 +1,205 @@
+"""Document several packages/repositories concurrently.
+
+Each project is initialized, written and (optionally) built in its own worker process, using a bounded
+worker pool.
+"""
+import argparse
+import os
+import sys
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+from autodoc.documentation.build import build_docs
+from autodoc.documentation.initialize import doc_init
+from autodoc.documentation.write import write
+
+
+def batch(
+    projects: Sequence[Tuple[str, str]],
+    workers: Optional[int] = None,
+    build: bool = True,
+    clean: bool = False,
+    jobs: Optional[Union[int, str]] = 1,
+) -> Dict[str, Union[str, None]]:
+    """Initializes, writes and builds documentation for several packages concurrently.
+
+    A failure in one project does not stop the others.
+
+    NOTE:
+        * Each project is processed in a separate process, as parts of Sphinx change process-wide state.
+        * Each ``outdir`` is assumed to be the main/parent directory of the corresponding repository.
+
+    Args:
+        projects: Sequence of tuples of package path and output directory.
+        workers: Maximum number of projects processed at a time. Defaults to None (the number of CPUs).
+        build: Build HTML documentation after writing it. Defaults to True.
+        clean: Remove previous build output before building. Defaults to False.
+        jobs: Number of parallel Sphinx processes per build, or "auto". Defaults to 1 (serial).
+
+    Returns:
+        Dictionary that maps each output directory to an error message **OR** None if it succeeded.
+    """
+    results: Dict[str, Union[str, None]] = {}
+
+    if not projects:
+        return results
+
+    if workers is None:
+        workers: int = os.cpu_count() or 1
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(projects))) as executor:
+        futures = [
+            executor.submit(_process_project, pkg, outdir, build, clean, jobs)
+            for pkg, outdir in projects
+        ]
+
+        for (_, outdir), future in zip(projects, futures):
+            try:
+                future.result()
+                results[outdir] = None
+            except Exception as e:
+                results[outdir] = f"{type(e).__name__}: {str(e).strip()}"
+
+    return results
+
+
+def _process_project(
+    pkg: str,
+    outdir: str,
+    build: bool = True,
+    clean: bool = False,
+    jobs: Optional[Union[int, str]] = 1,
+) -> None:
+    """Helper function that initializes, writes and builds the documentation of a single project.
+
+    Args:
+        pkg: Package path.
+        outdir: Output parent directory.
+        build: Build HTML documentation after writing it. Defaults to True.
+        clean: Remove previous build output before building. Defaults to False.
+        jobs: Number of parallel Sphinx processes, or "auto". Defaults to 1 (serial).
+    """
+    pkg: str = os.path.abspath(pkg)
+    outdir: str = os.path.abspath(outdir)
+
+    doc_init(outdir=outdir, pkg=pkg)
+
+    # Projects are already processed concurrently
+    write(outdir=outdir, pkg=pkg, workers=1)
+
+    if build:
+        build_docs(outdir=outdir, clean=clean, jobs=jobs)
+    return None
+
+
+def _read_projects(project_file: str) -> List[Tuple[str, str]]:
+    """Helper function that reads a project list file.
+
+    Each non-empty line that does not start with ``#`` holds a package path and an output directory, separated by a tab.
+
+    Args:
+        project_file: Project list file.
+
+    Raises:
+        ValueError: Exception that is raised if a line does not hold both a package path and an output directory.
+
+    Returns:
+        List of tuples of package path and output directory.
+    """
+    projects: List[Tuple[str, str]] = []
+
+    with open(project_file, mode="r", encoding="utf-8") as f:
+        for lineno, line in enumerate(f, start=1):
+            line: str = line.strip()
+            if not line or line.startswith("#"):
+                continue
+
+            fields: List[str] = [x.strip() for x in line.split("\t", 1)]
+
+            if len(fields) != 2 or not all(fields):
+                raise ValueError(
+                    f"{project_file}:{lineno}: Expected a package path and an output directory separated by a tab, got: {line!r}"
+                )
+            projects.append((fields[0], fields[1]))
+    return projects
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Command line interface for :func:`batch`.
+
+    Usage example:
+        .. code-block:: bash
+
+            python -m autodoc.documentation.batch --project pkg1 out1 --project pkg2 out2 --workers 4
+
+    Args:
+        argv: Command line arguments. Defaults to None (``sys.argv``).
+
+    Returns:
+        Exit code: 0 if all projects succeeded, 1 otherwise.
+    """
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(
+        description="Document several packages/repositories concurrently."
+    )
+    parser.add_argument(
+        "-p",
+        "--project",
+        nargs=2,
+        action="append",
+        default=[],
+        metavar=("PKG", "OUTDIR"),
+        help="Package path and output directory (repeatable).",
+    )
+    parser.add_argument(
+        "-f",
+        "--file",
+        help="File with one tab-separated package path and output directory per line.",
+    )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=None,
+        help="Maximum number of projects processed at a time (default: number of CPUs).",
+    )
+    parser.add_argument(
+        "--no-build", action="store_true", help="Do not build HTML documentation."
+    )
+    parser.add_argument(
+        "--clean", action="store_true", help="Remove previous build output first."
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        default="1",
+        help='Number of parallel Sphinx processes per build, or "auto" (default: 1).',
+    )
+    args: argparse.Namespace = parser.parse_args(argv)
+
+    projects: List[Tuple[str, str]] = [tuple(x) for x in args.project]
+    if args.file:
+        try:
+            projects.extend(_read_projects(args.file))
+        except ValueError as e:
+            parser.error(str(e))
+
+    if not projects:
+        parser.error("No projects given.")
+
+    results: Dict[str, Union[str, None]] = batch(
+        projects,
+        workers=args.workers,
+        build=not args.no_build,
+        clean=args.clean,
+        jobs=args.jobs,
+    )
+
+    for outdir, error in results.items():
+        print(f"{'FAILED' if error else 'OK'}\t{outdir}" + (f"\t{error}" if error else ""))
+
+    return 1 if any(results.values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,16 +6,30 @@ NOTE:
     Intended to be run locally.
 """
 
+from typing import Dict, Optional, Union
+
 from autodoc.build.build_docs import build_docs as build
 
 
-def build_docs(outdir: str) -> None:
+def build_docs(
+    outdir: str,
+    clean: bool = False,
+    jobs: Optional[Union[int, str]] = 1,
+    postprocess: bool = False,
+) -> Dict[str, int]:
     """Builds Sphinx HTML documentation locally.
 
     The output location of the documentation should be: ``<outdir>/doc/build``.
 
+    Builds are incremental unless ``clean`` is True.
+
     Args:
         outdir: Output parent directory.
+        clean: Remove previous build output before building. Defaults to False.
+        jobs: Number of parallel Sphinx processes, or "auto" (number of CPUs). Defaults to 1 (serial).
+        postprocess: Content-hash static assets and precompress the HTML output (for static servers) after building. Defaults to False.
+
+    Returns:
+        Dictionary with the number of documents ``added``, ``changed``, ``removed``, ``read`` and ``written``.
     """
-    build(outdir=outdir)
-    return None
+    return build(outdir=outdir, clean=clean, jobs=jobs, postprocess=postprocess)
@@ -6,7 +6,8 @@ from commandio.workdir import WorkDir
 
 from autodoc.initdocs.mkfile import setup_make_file
 from autodoc.initdocs.config import conf_setup
-from autodoc.initdocs.index import write_index
+from autodoc.initdocs.index import write_index, _init_index
+from autodoc.utils.trace import stage
 
 
 def doc_init(
@@ -17,6 +18,7 @@ def doc_init(
     author: Optional[str] = None,
     release: Optional[str] = None,
     theme: Optional[str] = None,
+    profile: str = "default",
 ) -> None:
     """Initializes documentation setup.
 
@@ -36,9 +38,53 @@ def doc_init(
         author: Author name. Defaults to None.
         release: Release/version number/ID. Defaults to None.
         theme: Sphinx theme. Defaults to None.
+        profile: ``conf.py`` configuration profile, "default" or "fast" (offline, faster builds; see :func:`autodoc.conf.write_conf._conf_info`). Defaults to "default".
     """
-    _: Tuple[str] = setup_make_file(outdir=outdir)
-    idx: str = write_index(outdir=outdir, pkg=pkg)
+    with stage("init"):
+        _: Tuple[str] = setup_make_file(outdir=outdir)
+        _: str = write_index(outdir=outdir, pkg=pkg)
+        _: str = init_conf(
+            outdir=outdir,
+            pkg=pkg,
+            project=project,
+            copyright=copyright,
+            author=author,
+            release=release,
+            theme=theme,
+            profile=profile,
+        )
+    return None
+
+
+def init_conf(
+    outdir: str,
+    pkg: str,
+    project: Optional[str] = None,
+    copyright: Optional[str] = None,
+    author: Optional[str] = None,
+    release: Optional[str] = None,
+    theme: Optional[str] = None,
+    profile: str = "default",
+) -> str:
+    """Writes the ``conf.py`` file (the configuration step of :func:`doc_init`).
+
+    NOTE:
+        The package path is written relative to the ``index.rst`` file, which does not need to exist yet.
+
+    Args:
+        outdir: Parent output directory.
+        pkg: Package path to directory.
+        project: Project name. Defaults to None.
+        copyright: Copyright information. Defaults to None.
+        author: Author name. Defaults to None.
+        release: Release/version number/ID. Defaults to None.
+        theme: Sphinx theme. Defaults to None.
+        profile: ``conf.py`` configuration profile, "default" or "fast". Defaults to "default".
+
+    Returns:
+        Path to sphinx configuration file.
+    """
+    idx: str = _init_index(outdir=outdir)
 
     with WorkDir(pkg) as pk:
         pkg_path: str = pk.relpath(idx)
@@ -51,7 +97,7 @@ def doc_init(
         "author": author,
         "release": release,
         "theme": theme,
+        "profile": profile,
     }
 
-    _: str = conf_setup(outdir=outdir, **conf_args)
-    return None
+    return conf_setup(outdir=outdir, **conf_args)
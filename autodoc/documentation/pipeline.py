@@ -0,0 +1,454 @@
+"""Dependency-aware task graph of the documentation pipeline.
+
+The pipeline (see :func:`doc_init`, :func:`write` and :func:`build_docs`) is modelled as a directed acyclic graph
+of tasks, each with declared inputs (files or directories), outputs, parameters, and dependencies:
+
+.. code-block:: text
+
+    makefiles ─────────────────────────────┐
+    index ───────────┐                     │
+    scripts ─────────┼──> toctree ──> build
+    apidoc ──────────┘                     │
+    conf ──────────────────────────────────┘
+
+Independent tasks run concurrently (in threads). A task is skipped (make-style) if it ran successfully before
+with the same parameters and inputs, its outputs exist, and none of its dependencies ran. Task stamps (parameters
+and input signatures) are stored in ``<outdir>/doc/.autodoc/tasks.json``.
+
+Usage example:
+    .. code-block:: python
+
+        >>> pipeline = doc_pipeline(outdir="path/to/repo", pkg="path/to/repo/pkg")
+        >>> print(format_plan(pipeline.plan()))  # dry run
+        >>> print(format_plan(pipeline.run()))
+
+NOTE:
+    Task signatures only cover declared inputs: files that are ignored when scripts are searched
+    (e.g. ``.gitignore``, see :func:`autodoc.utils.walk.walk_files`) do not make tasks outdated.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple, Union
+
+from autodoc.utils.manifest import load_manifest, manifest_path, save_manifest
+from autodoc.utils.trace import profiling, stage
+from autodoc.utils.walk import walk_files
+
+# Plan/result record: task name, action ("run", "skip", "ran", "skipped" or "failed"), reason, and duration
+TaskRecord = Tuple[str, str, str, float]
+
+
+class Task:
+    """Task of the documentation pipeline.
+
+    Attributes:
+        name: Task name.
+        func: Function (without arguments) that runs the task.
+        inputs: Files or directories the task reads. Directories are walked (see :func:`_signature`).
+        outputs: Files the task writes. The task is outdated if any of them is missing.
+        deps: Names of the tasks that must run first.
+        params: Parameters of the task (JSON serializable). The task is outdated if they change.
+        always: Always run the task. Defaults to False.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        func: Callable[[], Any],
+        inputs: Optional[Sequence[str]] = None,
+        outputs: Optional[Sequence[str]] = None,
+        deps: Optional[Sequence[str]] = None,
+        params: Optional[Dict[str, Any]] = None,
+        always: bool = False,
+    ) -> None:
+        """Initialization method for the ``Task`` class."""
+        self.name: str = name
+        self.func: Callable[[], Any] = func
+        self.inputs: List[str] = list(inputs or [])
+        self.outputs: List[str] = list(outputs or [])
+        self.deps: List[str] = list(deps or [])
+        self.params: Dict[str, Any] = dict(params or {})
+        self.always: bool = always
+
+
+class Pipeline:
+    """Task graph with make-style up-to-date checks, and a threaded scheduler.
+
+    Attributes:
+        tasks: Dictionary that maps task names to tasks, in insertion order.
+        stamps: Task stamps file path.
+        exclude_dirs: Directories excluded from input signatures (e.g. the documentation output directory).
+    """
+
+    def __init__(self, stamps: str, exclude_dirs: Optional[Sequence[str]] = None) -> None:
+        """Initialization method for the ``Pipeline`` class.
+
+        Args:
+            stamps: Task stamps file path.
+            exclude_dirs: Directories excluded from input signatures. Defaults to None.
+        """
+        self.tasks: Dict[str, Task] = {}
+        self.stamps: str = stamps
+        self.exclude_dirs: List[str] = list(exclude_dirs or [])
+
+    def add(self, task: Task) -> Task:
+        """Adds a task.
+
+        Args:
+            task: Task. Its dependencies must have been added first.
+
+        Raises:
+            ValueError: Exception that is raised if a task of the same name exists, or a dependency is unknown.
+
+        Returns:
+            The task.
+        """
+        if task.name in self.tasks:
+            raise ValueError(f"Duplicate task: {task.name}.")
+
+        for dep in task.deps:
+            if dep not in self.tasks:
+                raise ValueError(f"Unknown dependency of task {task.name}: {dep}.")
+
+        self.tasks[task.name] = task
+        return task
+
+    def plan(self) -> List[TaskRecord]:
+        """Returns the tasks that would run or be skipped (dry run), in dependency order.
+
+        NOTE:
+            A task is planned to run if any of its dependencies is planned to run.
+
+        Returns:
+            List of task records, with "run" or "skip" actions (and zero durations).
+        """
+        stamps: Dict[str, Dict[str, Any]] = load_manifest(self.stamps)
+        runs: Set[str] = set()
+        records: List[TaskRecord] = []
+
+        for name, task in self.tasks.items():
+            reason, _ = self._outdated(task, stamps.get(name, None), deps_ran=runs.intersection(task.deps))
+
+            if reason is None:
+                records.append((name, "skip", "up to date", 0.0))
+            else:
+                runs.add(name)
+                records.append((name, "run", reason, 0.0))
+
+        return records
+
+    def run(self, workers: Optional[int] = None) -> List[TaskRecord]:
+        """Runs the outdated tasks, running independent tasks concurrently.
+
+        Tasks that depend on a failed task are not run. Stamps of the tasks that ran successfully are saved,
+        even if other tasks failed.
+
+        Args:
+            workers: Maximum number of tasks that run at a time. Defaults to None (the number of tasks). Tasks run one at a time if stages are profiled.
+
+        Raises:
+            RuntimeError: Exception that is raised if any task failed.
+
+        Returns:
+            List of task records, with "ran", "skipped" or "failed" actions, in dependency order.
+        """
+        stamps: Dict[str, Dict[str, Any]] = load_manifest(self.stamps)
+        results: Dict[str, TaskRecord] = {}
+        ran: Set[str] = set()
+        errors: Dict[str, BaseException] = {}
+        lock: threading.Lock = threading.Lock()
+
+        def _execute(task: Task, deps_ran: Set[str]) -> None:
+            with lock:
+                previous: Union[Dict[str, Any], None] = stamps.get(task.name, None)
+
+            reason, stamp = self._outdated(task, previous, deps_ran=deps_ran)
+
+            if reason is None:
+                with lock:
+                    results[task.name] = (task.name, "skipped", "up to date", 0.0)
+                return None
+
+            start: float = time.perf_counter()
+
+            with stage(task.name):
+                task.func()
+
+            with lock:
+                stamps[task.name] = stamp
+                ran.add(task.name)
+                results[task.name] = (task.name, "ran", reason, time.perf_counter() - start)
+            return None
+
+        pending: Dict[str, Task] = dict(self.tasks)
+        running: Dict[Future, str] = {}
+
+        # Only one stage is profiled at a time (see autodoc.utils.trace.stage), so that each task is profiled
+        if profiling():
+            workers: int = 1
+
+        with ThreadPoolExecutor(max_workers=max(1, workers or len(self.tasks))) as executor:
+            while pending or running:
+                # Submit the tasks whose dependencies are done
+                for name, task in list(pending.items()):
+                    if any(dep in pending or dep in running.values() for dep in task.deps):
+                        continue
+
+                    del pending[name]
+                    failed: List[str] = [dep for dep in task.deps if results[dep][1] == "failed"]
+
+                    if failed:
+                        results[name] = (name, "failed", f"dependency failed: {', '.join(failed)}", 0.0)
+                        continue
+
+                    running[executor.submit(_execute, task, ran.intersection(task.deps))] = name
+
+                if not running:
+                    continue
+
+                done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    name: str = running.pop(future)
+                    error: Union[BaseException, None] = future.exception()
+
+                    if error is not None:
+                        errors[name] = error
+                        results[name] = (name, "failed", f"{type(error).__name__}: {str(error).strip()}", 0.0)
+
+        save_manifest(self.stamps, stamps)
+
+        records: List[TaskRecord] = [results[name] for name in self.tasks]
+
+        if errors:
+            failed: str = ", ".join(errors)
+            raise RuntimeError(f"\nFailed task(s): {failed}.\n\n{format_plan(records)}\n") from next(
+                iter(errors.values())
+            )
+
+        return records
+
+    def _outdated(
+        self, task: Task, previous: Optional[Dict[str, Any]], deps_ran: Set[str]
+    ) -> Tuple[Optional[str], Dict[str, Any]]:
+        """Helper method that checks whether a task is outdated.
+
+        Args:
+            task: Task.
+            previous: Stamp of the previous successful run of the task (**OR** None).
+            deps_ran: Dependencies of the task that ran (or would run).
+
+        Returns:
+            Tuple of the reason why the task is outdated (**OR** None if it is up to date), and its new stamp.
+        """
+        stamp: Dict[str, Any] = {
+            "params": json.loads(json.dumps(task.params, sort_keys=True, default=repr)),
+            "inputs": {x: _signature(x, exclude_dirs=self.exclude_dirs) for x in task.inputs},
+        }
+
+        if task.always:
+            reason: Union[str, None] = "always runs"
+        elif previous is None:
+            reason: Union[str, None] = "never ran"
+        elif previous.get("params", None) != stamp["params"]:
+            reason: Union[str, None] = "parameters changed"
+        elif previous.get("inputs", None) != stamp["inputs"]:
+            changed: List[str] = [
+                x for x in task.inputs if previous.get("inputs", {}).get(x, None) != stamp["inputs"][x]
+            ]
+            reason: Union[str, None] = f"inputs changed: {', '.join(changed)}"
+        elif any(not os.path.exists(x) for x in task.outputs):
+            reason: Union[str, None] = "outputs missing"
+        elif deps_ran:
+            reason: Union[str, None] = f"dependencies ran: {', '.join(sorted(deps_ran))}"
+        else:
+            reason: Union[str, None] = None
+
+        return reason, stamp
+
+
+def doc_pipeline(
+    outdir: str,
+    pkg: str,
+    init_options: Optional[Dict[str, Any]] = None,
+    write_options: Optional[Dict[str, Any]] = None,
+    build_options: Optional[Dict[str, Any]] = None,
+    build: bool = True,
+) -> Pipeline:
+    """Creates the task graph of the documentation pipeline (initialize, write, and build).
+
+    Tasks:
+        * ``makefiles``: Make and requirement files (see :func:`autodoc.initdocs.mkfile.setup_make_file`).
+        * ``index``: ``index.rst`` (see :func:`autodoc.initdocs.index.write_index`).
+        * ``conf``: ``conf.py`` (see :func:`autodoc.documentation.initialize.init_conf`).
+        * ``scripts``: Script documentation (see :func:`autodoc.doccode.shell.write_script_docs`).
+        * ``apidoc``: Python API documentation (see :func:`autodoc.documentation.write.write_api_docs`).
+        * ``toctree``: Root toctree of ``index.rst`` (see :func:`autodoc.initdocs.index.update_index`).
+        * ``build``: HTML documentation (see :func:`autodoc.documentation.build.build_docs`), if ``build`` is True.
+
+    NOTE:
+        * ``outdir`` and ``pkg`` are made absolute.
+        * ``scripts`` and ``apidoc`` are incremental themselves: when they run, only changed files are re-documented.
+        * ``scripts`` and ``apidoc`` run after ``index``, as they write to the same directory.
+        * ``conf`` only runs if ``conf.py`` is missing, as existing ``conf.py`` files are never overwritten (``init_options`` only apply to new files).
+
+    Args:
+        outdir: Parent output directory.
+        pkg: Path to package/repository.
+        init_options: Keyword arguments of :func:`autodoc.documentation.initialize.doc_init` (e.g. ``project``, ``theme``, ``profile``). Defaults to None.
+        write_options: Keyword arguments of :func:`autodoc.documentation.write.write` (e.g. ``layout``, ``api_engine``). Defaults to None.
+        build_options: Keyword arguments of :func:`autodoc.documentation.build.build_docs` (e.g. ``clean``, ``jobs``). Defaults to None.
+        build: Build HTML documentation. Defaults to True.
+
+    Returns:
+        Documentation pipeline.
+    """
+    from autodoc import _MISCDIR
+    from autodoc.doccode.shell import write_script_docs
+    from autodoc.documentation.build import build_docs
+    from autodoc.documentation.initialize import init_conf
+    from autodoc.documentation.write import _index_entries, write_api_docs
+    from autodoc.initdocs.index import update_index, write_index
+    from autodoc.initdocs.mkfile import setup_make_file
+
+    outdir: str = os.path.abspath(outdir)
+    pkg: str = os.path.abspath(pkg)
+    init_options: Dict[str, Any] = dict(init_options or {})
+    write_options: Dict[str, Any] = dict(write_options or {})
+    build_options: Dict[str, Any] = dict(build_options or {})
+
+    docdir: str = os.path.join(outdir, "doc")
+    srcdir: str = os.path.join(docdir, "source")
+    manifest: str = manifest_path(outdir=outdir)
+
+    api_options: Dict[str, Any] = {
+        "api_engine": write_options.pop("api_engine", "apidoc"),
+        "workers": write_options.get("workers", None),
+    }
+
+    pipeline: Pipeline = Pipeline(
+        stamps=manifest_path(outdir=outdir, name="tasks.json"),
+        exclude_dirs=[docdir],
+    )
+
+    pipeline.add(
+        Task(
+            "makefiles",
+            lambda: setup_make_file(outdir=outdir),
+            inputs=[_MISCDIR],
+            outputs=[os.path.join(docdir, "Makefile"), os.path.join(docdir, "make.bat")],
+        )
+    )
+    pipeline.add(
+        Task(
+            "index",
+            lambda: write_index(outdir=outdir, pkg=pkg),
+            outputs=[os.path.join(srcdir, "index.rst")],
+        )
+    )
+    pipeline.add(
+        Task(
+            "conf",
+            lambda: init_conf(outdir=outdir, pkg=pkg, **init_options),
+            # Not params=init_options: existing conf.py files are not overwritten (see autodoc.conf.write_conf.write_conf)
+            outputs=[os.path.join(srcdir, "conf.py")],
+        )
+    )
+    pipeline.add(
+        Task(
+            "scripts",
+            lambda: write_script_docs(outdir=outdir, pkg_dir=pkg, **write_options),
+            inputs=[pkg],
+            outputs=[manifest],
+            # Pages of scripts and modules must not replace index.rst, so they are named after it is written
+            deps=["index"],
+            params=write_options,
+        )
+    )
+    pipeline.add(
+        Task(
+            "apidoc",
+            lambda: write_api_docs(outdir=outdir, pkg=pkg, **api_options),
+            inputs=[pkg],
+            outputs=[os.path.join(srcdir, "modules.rst")],
+            deps=["index"],
+            params=api_options,
+        )
+    )
+    pipeline.add(
+        Task(
+            "toctree",
+            lambda: update_index(
+                outdir=outdir,
+                entries=_index_entries(
+                    outdir=outdir, rsts=[x["outfile"] for x in load_manifest(manifest).values()]
+                ),
+            ),
+            deps=["index", "scripts", "apidoc"],
+        )
+    )
+
+    if build:
+        pipeline.add(
+            Task(
+                "build",
+                lambda: build_docs(outdir=outdir, **build_options),
+                # Modules are imported by sphinx.ext.autodoc, and large scripts are read by literalinclude
+                inputs=[srcdir, pkg],
+                outputs=[os.path.join(docdir, "build", "html", "index.html")],
+                deps=["makefiles", "conf", "toctree"],
+                params=build_options,
+                always=bool(build_options.get("clean", False)),
+            )
+        )
+
+    return pipeline
+
+
+def format_plan(records: Sequence[TaskRecord]) -> str:
+    """Formats task records (see :meth:`Pipeline.plan` and :meth:`Pipeline.run`) as a table.
+
+    Args:
+        records: Task records.
+
+    Returns:
+        Table of the task records.
+    """
+    width: int = max([len(x[0]) for x in records] + [4])
+    lines: List[str] = [f"{'task'.ljust(width)}  action   time     reason"]
+
+    for name, action, reason, duration in records:
+        elapsed: str = f"{duration:.2f}s" if action == "ran" else "-"
+        lines.append(f"{name.ljust(width)}  {action.ljust(7)}  {elapsed.ljust(7)}  {reason}")
+
+    return "\n".join(lines)
+
+
+def _signature(path: str, exclude_dirs: Optional[Sequence[str]] = None) -> str:
+    """Helper function that computes the signature of a task input.
+
+    Args:
+        path: File or directory path.
+        exclude_dirs: Directories that are not walked. Defaults to None.
+
+    Returns:
+        Signature of the size and modification time of the file, or of every file of the directory (**OR** "missing").
+    """
+    if os.path.isfile(path):
+        st: os.stat_result = os.stat(path)
+        return f"{st.st_size}:{st.st_mtime_ns}"
+
+    if not os.path.isdir(path):
+        return "missing"
+
+    h = hashlib.sha256()
+
+    for file, st in walk_files(path, exclude_dirs=exclude_dirs):
+        h.update(f"{os.path.relpath(file, path)}\0{st.st_size}\0{st.st_mtime_ns}\n".encode("utf-8", "surrogateescape"))
+
+    return h.hexdigest()
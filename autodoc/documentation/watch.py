@@ -0,0 +1,537 @@
+"""Watch a package/repository and regenerate (and rebuild) its documentation as files change.
+
+File system events are received with ``inotify`` on Linux, and by periodically scanning the package
+otherwise. Bursts of events are debounced, and then only the documentation of the scripts and modules
+that changed is regenerated, before an incremental Sphinx build.
+"""
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple, Union
+
+from autodoc.doccode.shell import update_script_docs
+from autodoc.doccode.astapi import ast_apidoc
+from autodoc.doccode.sphinxapi import sphinx_apidoc
+from autodoc.documentation.build import build_docs
+from autodoc.documentation.write import _index_entries, write
+from autodoc.initdocs.index import update_index
+from autodoc.utils.manifest import load_manifest, manifest_path
+from autodoc.utils.walk import _IGNORE_FILES, _PRUNE_DIRS, is_walked, walk_files
+
+# inotify event masks (see ``man 7 inotify``)
+_IN_ATTRIB: int = 0x00000004
+_IN_CLOSE_WRITE: int = 0x00000008
+_IN_MOVED_FROM: int = 0x00000040
+_IN_MOVED_TO: int = 0x00000080
+_IN_CREATE: int = 0x00000100
+_IN_DELETE: int = 0x00000200
+_IN_Q_OVERFLOW: int = 0x00004000
+_IN_ISDIR: int = 0x40000000
+
+_IN_MASK: int = (
+    _IN_ATTRIB
+    | _IN_CLOSE_WRITE
+    | _IN_MOVED_FROM
+    | _IN_MOVED_TO
+    | _IN_CREATE
+    | _IN_DELETE
+)
+
+# inotify event header: wd, mask, cookie, len
+_IN_EVENT: struct.Struct = struct.Struct("iIII")
+
+
+def watch(
+    outdir: str,
+    pkg: str,
+    debounce: float = 0.2,
+    poll_interval: float = 1.0,
+    build: bool = True,
+    jobs: Optional[Union[int, str]] = 1,
+    convert_tabs_to_spaces: bool = True,
+    num_spaces: Optional[int] = 4,
+    use_inotify: bool = True,
+    reference_threshold: Optional[int] = None,
+    layout: str = "flat",
+    api_engine: str = "apidoc",
+    search: str = "full",
+    page_lines: Optional[int] = None,
+    page_bytes: Optional[int] = None,
+    include: Optional[Sequence[str]] = None,
+    exclude: Optional[Sequence[str]] = None,
+    max_file_size: Optional[int] = None,
+) -> None:
+    """Watches a package/repository, and regenerates and rebuilds its documentation when files change.
+
+    The documentation is first brought up to date (see :func:`autodoc.documentation.write.write`). Then, after
+    each burst of file changes:
+        * The reStructured Text files of changed, created or deleted scripts are updated (including the scripts of deleted or moved directories). Scripts are filtered as by :func:`autodoc.documentation.write.write` (``include``, ``exclude``, ``max_file_size``, ignore files).
+        * The package is searched again if an ignore file (``.gitignore``, ``.autodocignore``) changed.
+        * ``sphinx-apidoc`` is re-run if python modules were created or deleted (changes to existing modules are picked up by Sphinx itself).
+        * The HTML documentation is built incrementally (if ``build`` is True).
+
+    Watching stops on ``KeyboardInterrupt`` (Ctrl+C).
+
+    NOTE:
+        ``outdir`` is assumed to be the same as used in :py:func: autodoc.documentation.initialize.doc_init
+
+    Args:
+        outdir: Path to output directory.
+        pkg: Path to package/repository.
+        debounce: Seconds without further changes to wait before regenerating. Defaults to 0.2.
+        poll_interval: Seconds between scans when ``inotify`` is not available. Defaults to 1.0.
+        build: Build HTML documentation after regenerating. Defaults to True.
+        jobs: Number of parallel Sphinx processes, or "auto". Defaults to 1 (serial).
+        convert_tabs_to_spaces: Convert tabs to spaces. Defaults to True.
+        num_spaces: Number of spaces to replace tabs with. Only applicable when ``convert_tabs_to_spaces`` is True. Defaults to 4.
+        use_inotify: Use ``inotify`` if available (Linux). Defaults to True.
+        reference_threshold: Script file size (in bytes) from which scripts are referenced with ``literalinclude`` instead of copied. Defaults to None (always copy).
+        layout: Script documentation layout, "flat" or "tree" (see :func:`autodoc.documentation.write.write`). Defaults to "flat".
+        api_engine: Python API documentation engine, "apidoc" or "ast" (see :func:`autodoc.documentation.write.write`). Defaults to "apidoc".
+        search: Search mode of script pages, "full", "summary" or "exclude" (see :func:`autodoc.documentation.write.write`). Defaults to "full".
+        page_lines: Maximum number of lines per script page (see :func:`autodoc.documentation.write.write`). Defaults to None (no limit).
+        page_bytes: Maximum number of bytes per script page. Defaults to None (no limit).
+        include: Glob patterns of script files to include. Defaults to None (all files).
+        exclude: Glob patterns of script files and directories to exclude. Defaults to None.
+        max_file_size: Maximum script file size (in bytes). Larger files are not documented. Defaults to None (no limit).
+    """
+    pkg: str = os.path.abspath(pkg)
+    outdir: str = os.path.abspath(outdir)
+    ignored: List[str] = [os.path.join(outdir, "doc")]
+
+    write(
+        outdir=outdir,
+        pkg=pkg,
+        convert_tabs_to_spaces=convert_tabs_to_spaces,
+        num_spaces=num_spaces,
+        reference_threshold=reference_threshold,
+        layout=layout,
+        api_engine=api_engine,
+        search=search,
+        page_lines=page_lines,
+        page_bytes=page_bytes,
+        include=include,
+        exclude=exclude,
+        max_file_size=max_file_size,
+    )
+    if build:
+        build_docs(outdir=outdir, jobs=jobs)
+
+    modules: Set[str] = _modules(pkg=pkg, outdir=outdir)
+
+    watcher: Union[_InotifyWatcher, _PollingWatcher, None] = None
+
+    if use_inotify and sys.platform.startswith("linux"):
+        try:
+            watcher = _InotifyWatcher(pkg, ignored=ignored)
+        except OSError:
+            watcher = None
+
+    if watcher is None:
+        watcher = _PollingWatcher(pkg, ignored=ignored, interval=poll_interval)
+
+    print(f"\nWatching {pkg} for changes ({type(watcher).__name__}). Press Ctrl+C to stop.\n")
+
+    pending: Set[str] = set()
+
+    try:
+        while True:
+            changes: Set[str] = watcher.changes(timeout=debounce if pending else None)
+
+            if changes:
+                # Skip files ignored by ignore files (e.g. build output), as does the package search
+                pending |= {x for x in changes if is_walked(pkg, x, exclude_dirs=ignored)}
+                continue
+
+            if pending:
+                start: float = time.time()
+                modules: Set[str] = _regenerate(
+                    outdir=outdir,
+                    pkg=pkg,
+                    changed=pending,
+                    modules=modules,
+                    build=build,
+                    jobs=jobs,
+                    convert_tabs_to_spaces=convert_tabs_to_spaces,
+                    num_spaces=num_spaces,
+                    reference_threshold=reference_threshold,
+                    layout=layout,
+                    api_engine=api_engine,
+                    search=search,
+                    page_lines=page_lines,
+                    page_bytes=page_bytes,
+                    include=include,
+                    exclude=exclude,
+                    max_file_size=max_file_size,
+                )
+                print(
+                    f"\nUpdated documentation for {len(pending)} changed file(s) in {time.time() - start:.2f}s.\n"
+                )
+                pending: Set[str] = set()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
+    return None
+
+
+def _regenerate(
+    outdir: str,
+    pkg: str,
+    changed: Set[str],
+    modules: Set[str],
+    build: bool = True,
+    jobs: Optional[Union[int, str]] = 1,
+    convert_tabs_to_spaces: bool = True,
+    num_spaces: Optional[int] = 4,
+    reference_threshold: Optional[int] = None,
+    layout: str = "flat",
+    api_engine: str = "apidoc",
+    search: str = "full",
+    page_lines: Optional[int] = None,
+    page_bytes: Optional[int] = None,
+    include: Optional[Sequence[str]] = None,
+    exclude: Optional[Sequence[str]] = None,
+    max_file_size: Optional[int] = None,
+) -> Set[str]:
+    """Helper function that regenerates the documentation of changed files.
+
+    Args:
+        outdir: Path to output directory.
+        pkg: Path to package/repository.
+        changed: Paths of changed, created or deleted files.
+        modules: Paths of the known python modules.
+        build: Build HTML documentation after regenerating. Defaults to True.
+        jobs: Number of parallel Sphinx processes, or "auto". Defaults to 1 (serial).
+        convert_tabs_to_spaces: Convert tabs to spaces. Defaults to True.
+        num_spaces: Number of spaces to replace tabs with. Defaults to 4.
+        reference_threshold: Script file size (in bytes) from which scripts are referenced instead of copied. Defaults to None (always copy).
+        layout: Script documentation layout, "flat" or "tree". Defaults to "flat".
+        api_engine: Python API documentation engine, "apidoc" or "ast". Defaults to "apidoc".
+        search: Search mode of script pages, "full", "summary" or "exclude". Defaults to "full".
+        page_lines: Maximum number of lines per script page. Defaults to None (no limit).
+        page_bytes: Maximum number of bytes per script page. Defaults to None (no limit).
+        include: Glob patterns of script files to include. Defaults to None (all files).
+        exclude: Glob patterns of script files and directories to exclude. Defaults to None.
+        max_file_size: Maximum script file size (in bytes). Defaults to None (no limit).
+
+    Returns:
+        Updated set of paths of the known python modules.
+    """
+    if any(os.path.basename(x) in _IGNORE_FILES for x in changed):
+        # Ignore rules changed: search the package again
+        write(
+            outdir=outdir,
+            pkg=pkg,
+            convert_tabs_to_spaces=convert_tabs_to_spaces,
+            num_spaces=num_spaces,
+            include=include,
+            exclude=exclude,
+            max_file_size=max_file_size,
+            reference_threshold=reference_threshold,
+            layout=layout,
+            api_engine=api_engine,
+            search=search,
+            page_lines=page_lines,
+            page_bytes=page_bytes,
+        )
+        if build:
+            build_docs(outdir=outdir, jobs=jobs)
+        return _modules(pkg=pkg, outdir=outdir)
+
+    # Documented scripts and known modules of deleted or moved directories
+    known: Set[str] = set(load_manifest(manifest_path(outdir=outdir))) | modules
+    changed: Set[str] = _expand_removed_dirs(changed, known=known)
+
+    scripts: List[str] = [x for x in changed if not x.endswith(".py")]
+    pyfiles: Set[str] = {x for x in changed if x.endswith(".py")}
+
+    if scripts:
+        update_script_docs(
+            scripts,
+            outdir=outdir,
+            convert_tabs_to_spaces=convert_tabs_to_spaces,
+            num_spaces=num_spaces,
+            reference_threshold=reference_threshold,
+            layout=layout,
+            pkg_dir=pkg,
+            search=search,
+            page_lines=page_lines,
+            page_bytes=page_bytes,
+            include=include,
+            exclude=exclude,
+            max_file_size=max_file_size,
+        )
+
+    existing: Set[str] = {x for x in pyfiles if os.path.isfile(x)}
+    created: Set[str] = existing - modules
+    deleted: Set[str] = (pyfiles - existing) & modules
+
+    if api_engine == "ast":
+        # API pages hold the documentation itself: regenerate those of changed modules (unchanged modules are cached)
+        if pyfiles:
+            ast_apidoc(outdir=outdir, pkg_path=pkg)
+    elif created or deleted:
+        # New or deleted modules change the set of API pages
+        sphinx_apidoc(outdir=outdir, pkg_path=pkg)
+
+    # Only rewritten if scripts were created or deleted
+    update_index(
+        outdir=outdir,
+        entries=_index_entries(
+            outdir=outdir,
+            rsts=[x["outfile"] for x in load_manifest(manifest_path(outdir=outdir)).values()],
+        ),
+    )
+
+    if build:
+        build_docs(outdir=outdir, jobs=jobs)
+
+    return (modules - deleted) | created
+
+
+def _modules(pkg: str, outdir: str) -> Set[str]:
+    """Helper function that returns the python modules of a package/repository.
+
+    Args:
+        pkg: Path to package/repository.
+        outdir: Path to output directory (its documentation directory is skipped).
+
+    Returns:
+        Set of python module paths.
+    """
+    return {
+        x
+        for x, _ in walk_files(
+            pkg, include=["*.py"], exclude_dirs=[os.path.join(outdir, "doc")]
+        )
+    }
+
+
+def _expand_removed_dirs(changed: Iterable[str], known: Iterable[str]) -> Set[str]:
+    """Helper function that replaces removed (deleted or moved) directories by the known files within them.
+
+    NOTE:
+        Directory events do not report the files within the directory.
+
+    Args:
+        changed: Changed paths.
+        known: Paths of the known (documented) files.
+
+    Returns:
+        Set of changed paths, with removed directories replaced by the known files within them.
+    """
+    known: List[str] = list(known)
+    expanded: Set[str] = set()
+
+    for path in changed:
+        within: Set[str] = set()
+
+        if not os.path.exists(path):
+            within: Set[str] = {x for x in known if x.startswith(path + os.sep)}
+
+        expanded |= within or {path}
+    return expanded
+
+
+def _is_watched(path: str, ignored: Iterable[str]) -> bool:
+    """Helper function that checks whether changes to some path should be acted upon.
+
+    Args:
+        path: File or directory path.
+        ignored: Ignored directories.
+
+    Returns:
+        True if the path is not under an ignored or pruned directory, False otherwise.
+    """
+    for directory in ignored:
+        if path == directory or path.startswith(directory + os.sep):
+            return False
+
+    parts: List[str] = path.split(os.sep)
+    if any(x in _PRUNE_DIRS for x in parts):
+        return False
+
+    # Editor swap/backup and temporary files
+    name: str = parts[-1]
+    return not (name.endswith(("~", ".swp", ".tmp")) or name.startswith(".#"))
+
+
+class _InotifyWatcher:
+    """File system watcher that uses Linux ``inotify`` (through ``ctypes``)."""
+
+    def __init__(self, root: str, ignored: Iterable[str]) -> None:
+        """Initialization method for the ``_InotifyWatcher`` class.
+
+        Args:
+            root: Root directory to watch (recursively).
+            ignored: Ignored directories.
+
+        Raises:
+            OSError: Exception that is raised if ``inotify`` is not available.
+        """
+        libc_name: Union[str, None] = ctypes.util.find_library("c")
+        self.libc = ctypes.CDLL(libc_name, use_errno=True)
+
+        if not hasattr(self.libc, "inotify_init1"):
+            raise OSError("inotify is not available.")
+
+        self.fd: int = self.libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed.")
+
+        self.root: str = root
+        self.ignored: List[str] = list(ignored)
+        self.dirs: Dict[int, str] = {}
+        self._add_tree(root)
+
+    def _add_tree(self, root: str) -> Set[str]:
+        """Adds watches to a directory and all of its (non-ignored) subdirectories.
+
+        Args:
+            root: Directory path.
+
+        Returns:
+            Set of the paths of the files within the directory tree.
+        """
+        files: Set[str] = set()
+
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames[:] = [
+                x for x in dirnames if _is_watched(os.path.join(dirpath, x), self.ignored)
+            ]
+            wd: int = self.libc.inotify_add_watch(
+                self.fd, os.fsencode(dirpath), ctypes.c_uint32(_IN_MASK)
+            )
+            if wd >= 0:
+                self.dirs[wd] = dirpath
+            files.update(os.path.join(dirpath, x) for x in filenames)
+        return files
+
+    def _remove_tree(self, root: str) -> None:
+        """Removes the watches of a (deleted or moved) directory and all of its subdirectories.
+
+        Args:
+            root: Directory path.
+        """
+        for wd, dirpath in list(self.dirs.items()):
+            if dirpath == root or dirpath.startswith(root + os.sep):
+                # Watches of deleted directories are already removed by the kernel
+                self.libc.inotify_rm_watch(self.fd, wd)
+                del self.dirs[wd]
+        return None
+
+    def changes(self, timeout: Optional[float] = None) -> Set[str]:
+        """Waits for file system events.
+
+        Args:
+            timeout: Seconds to wait. Defaults to None (wait indefinitely).
+
+        Returns:
+            Set of changed paths (empty if the timeout expired).
+        """
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+
+        if not readable:
+            return set()
+
+        changed: Set[str] = set()
+
+        try:
+            data: bytes = os.read(self.fd, 1 << 16)
+        except BlockingIOError:
+            return changed
+
+        offset: int = 0
+
+        while offset + _IN_EVENT.size <= len(data):
+            wd, mask, _, length = _IN_EVENT.unpack_from(data, offset)
+            offset += _IN_EVENT.size
+            name: str = os.fsdecode(data[offset : offset + length].rstrip(b"\0"))
+            offset += length
+
+            if mask & _IN_Q_OVERFLOW:
+                # Events were lost: rescan everything
+                changed |= self._add_tree(self.root)
+                continue
+
+            directory: Union[str, None] = self.dirs.get(wd, None)
+            if directory is None or not name:
+                continue
+
+            path: str = os.path.join(directory, name)
+            if not _is_watched(path, self.ignored):
+                continue
+
+            if mask & _IN_ISDIR:
+                if mask & (_IN_CREATE | _IN_MOVED_TO):
+                    changed |= self._add_tree(path)
+                elif mask & (_IN_DELETE | _IN_MOVED_FROM):
+                    # Expanded to the documented files within the directory (see _expand_removed_dirs)
+                    self._remove_tree(path)
+                    changed.add(path)
+            else:
+                changed.add(path)
+        return changed
+
+    def close(self) -> None:
+        """Closes the ``inotify`` file descriptor."""
+        os.close(self.fd)
+
+
+class _PollingWatcher:
+    """File system watcher that periodically scans a directory tree for changes."""
+
+    def __init__(self, root: str, ignored: Iterable[str], interval: float = 1.0) -> None:
+        """Initialization method for the ``_PollingWatcher`` class.
+
+        Args:
+            root: Root directory to watch (recursively).
+            ignored: Ignored directories.
+            interval: Seconds between scans. Defaults to 1.0.
+        """
+        self.root: str = root
+        self.ignored: List[str] = list(ignored)
+        self.interval: float = interval
+        self.snapshot: Dict[str, Tuple[int, int]] = self._scan()
+
+    def _scan(self) -> Dict[str, Tuple[int, int]]:
+        """Scans the directory tree.
+
+        Returns:
+            Dictionary that maps file paths to their modification time (ns) and size.
+        """
+        return {
+            path: (st.st_mtime_ns, st.st_size)
+            for path, st in walk_files(self.root, exclude_dirs=self.ignored)
+        }
+
+    def changes(self, timeout: Optional[float] = None) -> Set[str]:
+        """Waits for the next scan and reports changes.
+
+        Args:
+            timeout: Maximum number of seconds to wait. Defaults to None (the polling interval).
+
+        Returns:
+            Set of changed paths (empty if nothing changed).
+        """
+        time.sleep(self.interval if timeout is None else min(timeout, self.interval))
+
+        snapshot: Dict[str, Tuple[int, int]] = self._scan()
+        changed: Set[str] = {
+            path
+            for path in snapshot.keys() | self.snapshot.keys()
+            if snapshot.get(path, None) != self.snapshot.get(path, None)
+        }
+        self.snapshot: Dict[str, Tuple[int, int]] = snapshot
+        return changed
+
+    def close(self) -> None:
+        """Stops watching (nothing to release)."""
+        return None
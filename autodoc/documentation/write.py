@@ -1,9 +1,13 @@
 """Write reStructured Text files to write Sphinx documentation.
 """
+import os
 
-from typing import Optional, Set
-from autodoc.doccode.sphinxapi import sphinx_apidoc
+from typing import Iterable, List, Optional, Sequence, Set
+from autodoc.doccode.astapi import ast_apidoc, remove_ast_apidoc
+from autodoc.doccode.sphinxapi import remove_sphinx_apidoc, sphinx_apidoc
 from autodoc.doccode.shell import write_script_docs
+from autodoc.initdocs.index import update_index
+from autodoc.utils.trace import stage
 
 
 def write(
@@ -11,9 +15,21 @@ def write(
     pkg: str,
     convert_tabs_to_spaces: bool = True,
     num_spaces: Optional[int] = 4,
+    workers: Optional[int] = None,
+    include: Optional[Sequence[str]] = None,
+    exclude: Optional[Sequence[str]] = None,
+    max_file_size: Optional[int] = None,
+    reference_threshold: Optional[int] = None,
+    layout: str = "flat",
+    api_engine: str = "apidoc",
+    search: str = "full",
+    page_lines: Optional[int] = None,
+    page_bytes: Optional[int] = None,
 ) -> None:
     """Write reStructured Text (.rst) files for python packages/modules, and script libraries.
 
+    The root toctree of ``index.rst`` is updated to list the script and module documentation (see :func:`autodoc.initdocs.index.update_index`).
+
     NOTE:
         ``outdir`` is assumed to be the same as used in :py:func: autodoc.documentation.initialize.doc_init
 
@@ -22,12 +38,91 @@ def write(
         pkg: Path to package/repository.
         convert_tabs_to_spaces: Convert tabs to spaces. Defaults to True.
         num_spaces: Number of spaces to replace tabs with. Only applicable when ``convert_tabs_to_spaces`` is True. Defaults to 4.
+        workers: Number of scripts to document concurrently. Defaults to None (the number of CPUs).
+        include: Glob patterns of script files to include. Defaults to None (all files).
+        exclude: Glob patterns of script files and directories to exclude. Defaults to None.
+        max_file_size: Maximum script file size (in bytes). Larger files are not documented. Defaults to None (no limit).
+        reference_threshold: Script file size (in bytes) from which scripts are referenced with ``literalinclude`` instead of copied into the documentation. Defaults to None (always copy).
+        layout: Script documentation layout: "flat" (``doc/source/<name>.rst``) or "tree" (``doc/source/scripts/<path>.rst``, mirroring the package hierarchy). Defaults to "flat".
+        api_engine: Python API documentation engine: "apidoc" (``sphinx-apidoc``, modules are imported by ``sphinx.ext.autodoc`` at build time) or "ast" (modules are parsed statically and never imported, see :func:`autodoc.doccode.astapi.ast_apidoc`). Defaults to "apidoc".
+        search: Search mode of script pages: "full" (the complete code is indexed), "summary" (only the title, preamble, and header comments are indexed) or "exclude" (not indexed). Defaults to "full".
+        page_lines: Maximum number of lines per script page. Longer scripts are split into numbered pages (see :func:`autodoc.utils.docshell.document_shell_script`). Defaults to None (no limit).
+        page_bytes: Maximum number of bytes per script page. Larger scripts are split into numbered pages. Defaults to None (no limit).
     """
-    _: Set[str] = write_script_docs(
-        outdir=outdir,
-        pkg_dir=pkg,
-        convert_tabs_to_spaces=convert_tabs_to_spaces,
-        num_spaces=num_spaces,
-    )
-    sphinx_apidoc(outdir=outdir, pkg_path=pkg)
+    outdir: str = os.path.abspath(outdir)
+
+    with stage("write"):
+        with stage("scripts"):
+            rsts: Set[str] = write_script_docs(
+                outdir=outdir,
+                pkg_dir=pkg,
+                convert_tabs_to_spaces=convert_tabs_to_spaces,
+                num_spaces=num_spaces,
+                workers=workers,
+                include=include,
+                exclude=exclude,
+                max_file_size=max_file_size,
+                reference_threshold=reference_threshold,
+                layout=layout,
+                search=search,
+                page_lines=page_lines,
+                page_bytes=page_bytes,
+            )
+
+        with stage("apidoc"):
+            write_api_docs(outdir=outdir, pkg=pkg, api_engine=api_engine, workers=workers)
+
+        update_index(outdir=outdir, entries=_index_entries(outdir=outdir, rsts=rsts))
     return None
+
+
+def write_api_docs(
+    outdir: str, pkg: str, api_engine: str = "apidoc", workers: Optional[int] = None
+) -> List[str]:
+    """Writes reStructured Text (.rst) files for the python packages/modules of a package/repository.
+
+    Args:
+        outdir: Path to output directory.
+        pkg: Path to package/repository.
+        api_engine: Python API documentation engine, "apidoc" or "ast" (see :func:`write`). Defaults to "apidoc".
+        workers: Number of modules to parse concurrently ("ast" engine only). Defaults to None (the number of CPUs).
+
+    Returns:
+        List of generated reStructured Text files.
+    """
+    if api_engine == "ast":
+        # Pages of sphinx-apidoc would otherwise take the names of the "ast" engine pages
+        remove_sphinx_apidoc(outdir=outdir)
+        return ast_apidoc(outdir=outdir, pkg_path=pkg, workers=workers)
+
+    # Pages of the "ast" engine would not be overwritten by sphinx-apidoc
+    remove_ast_apidoc(outdir=outdir)
+    return sphinx_apidoc(outdir=outdir, pkg_path=pkg)
+
+
+def _index_entries(outdir: str, rsts: Iterable[str]) -> Set[str]:
+    """Helper function that returns the documents to list in the root toctree.
+
+    Args:
+        outdir: Path to output directory.
+        rsts: reStructured Text files of scripts.
+
+    Returns:
+        Set of reStructured Text files: those of scripts (**OR** the root script index of the "tree" layout), and the ``sphinx-apidoc`` table of contents (if it exists).
+    """
+    # Document names are computed from absolute paths (see :func:`autodoc.initdocs.index.update_index`)
+    srcdir: str = os.path.join(os.path.abspath(outdir), "doc", "source")
+    scriptsdir: str = os.path.join(srcdir, "scripts")
+    entries: Set[str] = set()
+
+    for x in (os.path.abspath(x) for x in rsts):
+        if x.startswith(scriptsdir + os.sep):
+            entries.add(os.path.join(scriptsdir, "index.rst"))
+        elif os.path.exists(x):
+            entries.add(x)
+
+    modules: str = os.path.join(srcdir, "modules.rst")
+
+    if os.path.exists(modules):
+        entries.add(modules)
+    return entries
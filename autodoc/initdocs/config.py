@@ -14,6 +14,7 @@ def conf_setup(
     author: Optional[str] = None,
     release: Optional[str] = None,
     theme: Optional[str] = None,
+    profile: str = "default",
 ) -> str:
     """Sets up source directory structure and writes sphinx configuration file.
 
@@ -28,6 +29,7 @@ def conf_setup(
         author: Author name. Defaults to None.
         release: Release/version number/ID. Defaults to None.
         theme: Sphinx theme. Defaults to None.
+        profile: ``conf.py`` configuration profile, "default" or "fast" (offline, faster builds; see :func:`autodoc.conf.write_conf._conf_info`). Defaults to "default".
 
     Returns:
         Path to sphinx configuration file.
@@ -40,6 +42,7 @@ def conf_setup(
         "author": author,
         "release": release,
         "theme": theme,
+        "profile": profile,
     }
 
     _doc_dir_setup(outdir=outdir)
@@ -1,14 +1,29 @@
 """Creates index.rst files for sphinx documentation.
 """
 import os
+import re
+
+from typing import Iterable, List, Pattern
 
 from commandio.workdir import WorkDir
 from autodoc.utils.util import write_file
 
 
+# Markers around the automatically maintained root toctree
+_TOCTREE_BEGIN: str = ".. autodoc-toctree-begin"
+_TOCTREE_END: str = ".. autodoc-toctree-end"
+
+# Root toctree of index.rst files written before the toctree was maintained automatically
+_LEGACY_TOCTREE_RE: Pattern = re.compile(
+    r"^\.\. toctree::\n(?:[ ]+:[\w-]+:.*\n)*\n[ ]+\.\. # ADD RST FILES HERE\n", re.MULTILINE
+)
+
+
 def write_index(outdir: str, pkg: str) -> str:
     """Creates index.rst file for sphinx.
 
+    The root toctree is placed between marker comments, and is maintained by :func:`update_index`.
+
     NOTE:
         ``out_dir`` is assumed to be the main/parent directory of the repository.
 
@@ -19,17 +34,16 @@ def write_index(outdir: str, pkg: str) -> str:
     Returns:
         Index.rst absolute file path.
     """
-    _IDX_TEXT: str = f""".. {pkg} documentation main file.
-You can adapt this file completely to your liking, but it should at least
-contain the root `toctree` directive.
+    title: str = f"Welcome to {pkg}'s documentation!"
 
-Welcome to {pkg}'s documentation!
-==================================
+    _IDX_TEXT: str = f""".. {pkg} documentation main file.
+   You can adapt this file completely to your liking, but it should at least
+   contain the root `toctree` directive.
 
-.. toctree::
-   :maxdepth: 3
+{title}
+{"=" * len(title)}
 
-    .. # ADD RST FILES HERE
+{_toctree([])}
 
 Indices and tables
 ==================
@@ -37,18 +51,106 @@ Indices and tables
 * :ref:`genindex`
 * :ref:`modindex`
 * :ref:`search`
-    """
+"""
 
     idx: str = _init_index(outdir=outdir)
 
     if not os.path.exists(idx):
-        write_file(idx, text=_IDX_TEXT, num_spaces=4, mode="a")
+        write_file(idx, text=_IDX_TEXT, num_spaces=4, mode="w", atomic=True)
     else:
         print(f"\n{idx}: Already exists in output directory.\n")
 
     return idx
 
 
+def update_index(outdir: str, entries: Iterable[str]) -> bool:
+    """Updates the root toctree of the index.rst file.
+
+    The toctree lists the documents of ``entries`` in sorted order. The index.rst file is only rewritten if
+    the set of documents changes, as any change to the root toctree makes Sphinx rebuild the navigation
+    of every page.
+
+    NOTE:
+        * ``out_dir`` is assumed to be the main/parent directory of the repository.
+        * Only the text between the ``.. autodoc-toctree-begin`` and ``.. autodoc-toctree-end`` comments is changed. The placeholder toctree of older index.rst files is replaced with these comments. Otherwise, the index.rst file is left untouched.
+
+    Args:
+        outdir: Output parent directory.
+        entries: reStructured Text files (paths, or document names relative to the source directory) to list.
+
+    Returns:
+        True if the index.rst file was updated, False otherwise.
+    """
+    idx: str = _init_index(outdir=outdir)
+    srcdir: str = os.path.dirname(idx)
+
+    if not os.path.exists(idx):
+        return False
+
+    with open(idx, mode="r", encoding="utf-8") as f:
+        text: str = f.read()
+
+    docnames: List[str] = sorted(
+        {_docname(x, srcdir) for x in entries} - {"index"}
+    )
+    toctree: str = _toctree(docnames)
+
+    begin: int = text.find(_TOCTREE_BEGIN)
+    end: int = text.find(_TOCTREE_END, begin)
+
+    if begin >= 0 and end >= 0:
+        new_text: str = text[:begin] + toctree + text[end + len(_TOCTREE_END) :]
+    elif _LEGACY_TOCTREE_RE.search(text):
+        new_text: str = _LEGACY_TOCTREE_RE.sub(lambda _: toctree + "\n", text, count=1)
+    else:
+        print(f"\n{idx}: No autodoc toctree markers found. Not updating the toctree.\n")
+        return False
+
+    if new_text == text:
+        return False
+
+    write_file(idx, text=new_text, mode="w", atomic=True)
+    return True
+
+
+def _toctree(docnames: List[str]) -> str:
+    """Helper function that renders the (marked) root toctree.
+
+    Args:
+        docnames: Document names.
+
+    Returns:
+        reStructured Text of the toctree.
+    """
+    lines: List[str] = [_TOCTREE_BEGIN, "", ".. toctree::", "   :maxdepth: 3", ""]
+    lines.extend(f"   {x}" for x in docnames)
+
+    if docnames:
+        lines.append("")
+
+    lines.append(_TOCTREE_END)
+    return "\n".join(lines)
+
+
+def _docname(entry: str, srcdir: str) -> str:
+    """Helper function that converts a reStructured Text file path to a Sphinx document name.
+
+    Args:
+        entry: reStructured Text file path (absolute, or relative to ``srcdir``), or document name.
+        srcdir: Documentation source directory.
+
+    Returns:
+        Document name (relative to ``srcdir``, ``/`` separated, without file extension).
+    """
+    if os.path.isabs(entry):
+        entry: str = os.path.relpath(entry, srcdir)
+
+    if entry.endswith(".rst"):
+        entry: str = entry[: -len(".rst")]
+
+    return entry.replace(os.sep, "/")
+
+
 def _init_index(outdir: str) -> str:
     """Helper function that creates index.rst file for sphinx.
 
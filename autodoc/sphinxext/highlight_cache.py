@@ -0,0 +1,237 @@
+"""Sphinx extension that caches highlighted code blocks on disk.
+
+Highlighting large code blocks (e.g. script documentation, see :func:`autodoc.utils.docshell.document_shell_script`)
+with Pygments dominates the time Sphinx spends writing HTML. This extension caches the highlighted HTML of each
+code block, keyed by its content, lexer, options, Pygments version and style, so unchanged code blocks are not
+highlighted again, even after a clean build.
+
+The cache is stored in ``<outdir>/doc/.autodoc/highlight`` by default (outside of the build directory), and the
+least recently used entries are evicted once it exceeds its size bound.
+
+Configuration values (``conf.py``):
+    * ``highlight_cache_dir``: Cache directory. Defaults to None (``../.autodoc/highlight``, relative to ``conf.py``).
+    * ``highlight_cache_max_bytes``: Maximum total size of the cache (in bytes). Defaults to 256 MiB.
+
+Usage example (``conf.py``):
+    .. code-block:: python
+
+        extensions = ["autodoc.sphinxext.highlight_cache"]
+"""
+import hashlib
+import json
+import os
+import threading
+
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Version of the cached entry format: bump to invalidate cached entries
+_CACHE_VERSION: str = "1"
+
+# Default maximum total size of the cache (in bytes)
+_MAX_BYTES: int = 256 << 20
+
+
+def setup(app) -> Dict[str, Any]:
+    """Sets up the extension.
+
+    Args:
+        app: Sphinx application.
+
+    Returns:
+        Extension metadata.
+    """
+    app.add_config_value("highlight_cache_dir", None, "")
+    app.add_config_value("highlight_cache_max_bytes", _MAX_BYTES, "")
+    app.connect("builder-inited", _install)
+    app.connect("build-finished", _evict)
+
+    return {
+        "version": _CACHE_VERSION,
+        "parallel_read_safe": True,
+        "parallel_write_safe": True,
+    }
+
+
+def cache_dir(app) -> str:
+    """Returns the cache directory of a Sphinx application.
+
+    Args:
+        app: Sphinx application.
+
+    Returns:
+        Cache directory absolute path.
+    """
+    if app.config.highlight_cache_dir:
+        return os.path.abspath(os.path.join(app.confdir, app.config.highlight_cache_dir))
+    return os.path.abspath(os.path.join(app.confdir, os.pardir, ".autodoc", "highlight"))
+
+
+def _install(app) -> None:
+    """Helper function that wraps the highlighters of the builder with the cache (``builder-inited`` event).
+
+    Args:
+        app: Sphinx application.
+    """
+    cachedir: str = cache_dir(app)
+
+    for attr in ("highlighter", "dark_highlighter"):
+        bridge = getattr(app.builder, attr, None)
+
+        if bridge is not None and bridge.dest == "html":
+            bridge.highlight_block = _cached(bridge.highlight_block, cachedir, _bridge_key(bridge))
+    return None
+
+
+def _bridge_key(bridge) -> Tuple[str, ...]:
+    """Helper function that returns the parts of the cache key that depend on the highlighter.
+
+    Args:
+        bridge: ``sphinx.highlighting.PygmentsBridge`` instance.
+
+    Returns:
+        Tuple of the Pygments version, style, and formatter.
+    """
+    import pygments
+
+    style = bridge.formatter_args.get("style", None)
+    style_name: str = f"{getattr(style, '__module__', '')}.{getattr(style, '__name__', style)}"
+    formatter: str = f"{bridge.formatter.__module__}.{bridge.formatter.__name__}"
+
+    return (_CACHE_VERSION, pygments.__version__, style_name, formatter, bridge.dest)
+
+
+def _cached(original: Callable[..., str], cachedir: str, bridge_key: Tuple[str, ...]) -> Callable[..., str]:
+    """Helper function that wraps ``PygmentsBridge.highlight_block`` with the cache.
+
+    Args:
+        original: Bound ``highlight_block`` method.
+        cachedir: Cache directory.
+        bridge_key: Highlighter dependent parts of the cache key (see :func:`_bridge_key`).
+
+    Returns:
+        Wrapped method.
+    """
+
+    def highlight_block(
+        source: str,
+        lang: str,
+        opts: Optional[Dict[str, Any]] = None,
+        force: bool = False,
+        location: Any = None,
+        **kwargs: Any,
+    ) -> str:
+        if not isinstance(source, str):
+            source: str = source.decode()
+
+        key: str = _cache_key(source, lang, opts, force, kwargs, bridge_key)
+        entry: str = os.path.join(cachedir, key[:2], f"{key}.html")
+
+        try:
+            with open(entry, mode="r", encoding="utf-8") as f:
+                highlighted: str = f.read()
+        except OSError:
+            pass
+        else:
+            # Update the access (modification) time, for least recently used eviction
+            try:
+                os.utime(entry)
+            except OSError:
+                pass
+            return highlighted
+
+        highlighted: str = original(source, lang, opts=opts, force=force, location=location, **kwargs)
+        _store(entry, highlighted)
+        return highlighted
+
+    return highlight_block
+
+
+def _cache_key(
+    source: str,
+    lang: str,
+    opts: Optional[Dict[str, Any]],
+    force: bool,
+    kwargs: Dict[str, Any],
+    bridge_key: Tuple[str, ...],
+) -> str:
+    """Helper function that computes the cache key of a code block.
+
+    Args:
+        source: Code.
+        lang: Language (lexer name).
+        opts: Lexer options.
+        force: Whether highlighting errors are ignored.
+        kwargs: Formatter options (e.g. ``linenos``, ``hl_lines``).
+        bridge_key: Highlighter dependent parts of the cache key (see :func:`_bridge_key`).
+
+    Returns:
+        Cache key (hexadecimal digest).
+    """
+    params: str = json.dumps(
+        [lang, opts or {}, force, kwargs, bridge_key], sort_keys=True, default=repr
+    )
+
+    h = hashlib.sha256()
+    h.update(params.encode("utf-8"))
+    h.update(b"\0")
+    h.update(source.encode("utf-8", errors="surrogatepass"))
+    return h.hexdigest()
+
+
+def _store(entry: str, highlighted: str) -> None:
+    """Helper function that writes a cache entry atomically (parallel builds write from several processes).
+
+    Args:
+        entry: Cache entry file path.
+        highlighted: Highlighted HTML.
+    """
+    tmp: str = f"{entry}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+    try:
+        os.makedirs(os.path.dirname(entry), exist_ok=True)
+        with open(tmp, mode="w", encoding="utf-8") as f:
+            f.write(highlighted)
+        os.replace(tmp, entry)
+    except OSError:
+        # The cache is an optimization: never fail the build
+        if os.path.exists(tmp):
+            os.remove(tmp)
+    return None
+
+
+def _evict(app, exception: Optional[Exception]) -> None:
+    """Helper function that evicts least recently used cache entries beyond the size bound (``build-finished`` event).
+
+    Args:
+        app: Sphinx application.
+        exception: Exception raised by the build, if any.
+    """
+    cachedir: str = cache_dir(app)
+    max_bytes: int = int(app.config.highlight_cache_max_bytes)
+
+    if not os.path.isdir(cachedir):
+        return None
+
+    entries: List[Tuple[float, int, str]] = []
+
+    for dirpath, _, filenames in os.walk(cachedir):
+        for fname in filenames:
+            path: str = os.path.join(dirpath, fname)
+            try:
+                st: os.stat_result = os.stat(path)
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+
+    total: int = sum(x[1] for x in entries)
+
+    # Oldest (least recently used) first
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total -= size
+    return None
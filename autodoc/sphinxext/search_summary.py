@@ -0,0 +1,139 @@
+"""Sphinx extension that summarizes script documentation pages in the search index.
+
+Script documentation pages (see :func:`autodoc.utils.docshell.document_shell_script`) contain the complete code of
+each script, so every token of every script ends up in ``searchindex.js``. Pages with the ``:autodoc-search: summary``
+file-wide field are indexed with their code blocks reduced to their header comments (the comment lines at the top of
+each script), so that their title, preamble, and description remain searchable. The rendered pages are unchanged.
+
+In incremental builds, Sphinx keeps the words of re-indexed pages in the search index (with no pages), so the index
+never shrinks: these empty entries are removed when the previous index is loaded.
+
+NOTE:
+    Pages with the ``:nosearch:`` file-wide field are excluded from the search index by Sphinx itself.
+
+Usage example (``conf.py``):
+    .. code-block:: python
+
+        extensions = ["autodoc.sphinxext.search_summary"]
+"""
+import re
+
+from typing import Any, Dict, List, Pattern
+
+# File-wide metadata field (and value) of summarized pages
+SEARCH_FIELD: str = "autodoc-search"
+SEARCH_SUMMARY: str = "summary"
+
+# Line comment markers of common scripting languages (e.g. bash, python, perl, ruby, R, matlab, lua, SQL, lisp)
+_COMMENT_RE: Pattern = re.compile(r"^\s*(#|//|--|%|;|!|rem\b|REM\b)")
+
+
+def setup(app) -> Dict[str, Any]:
+    """Sets up the extension.
+
+    Args:
+        app: Sphinx application.
+
+    Returns:
+        Extension metadata.
+    """
+    app.connect("builder-inited", _install)
+
+    return {
+        "version": "1",
+        "parallel_read_safe": True,
+        "parallel_write_safe": True,
+    }
+
+
+def header_comments(code: str) -> str:
+    """Returns the header comments of a script: the comment lines at the top of the code.
+
+    NOTE:
+        The shebang line and leading blank lines are skipped. The header ends at the first line that is neither
+        a comment nor blank.
+
+    Args:
+        code: Script code.
+
+    Returns:
+        Header comment lines, **OR** an empty string if the script has no header comments.
+    """
+    lines: List[str] = code.splitlines()
+
+    if lines and lines[0].startswith("#!"):
+        lines: List[str] = lines[1:]
+
+    header: List[str] = []
+
+    for line in lines:
+        if _COMMENT_RE.match(line):
+            header.append(line)
+        elif line.strip() and header:
+            break
+        elif line.strip():
+            return ""
+
+    return "\n".join(header)
+
+
+def _install(app) -> None:
+    """Helper function that wraps ``index_page`` and ``load_indexer`` of the builder (``builder-inited`` event).
+
+    Args:
+        app: Sphinx application.
+    """
+    builder = app.builder
+    index_page = getattr(builder, "index_page", None)
+    load_indexer = getattr(builder, "load_indexer", None)
+
+    if index_page is None or load_indexer is None:
+        return None
+
+    def summarized_index_page(pagename: str, doctree, title: str) -> None:
+        metadata: Dict[str, Any] = app.env.metadata.get(pagename, {})
+
+        if metadata.get(SEARCH_FIELD, None) == SEARCH_SUMMARY:
+            doctree = _summarize(doctree)
+        return index_page(pagename, doctree, title)
+
+    def compact_load_indexer(docnames) -> None:
+        load_indexer(docnames)
+        _prune_empty(builder.indexer)
+        return None
+
+    builder.index_page = summarized_index_page
+    builder.load_indexer = compact_load_indexer
+    return None
+
+
+def _prune_empty(indexer) -> None:
+    """Helper function that removes words that no longer refer to any page from a search index.
+
+    Args:
+        indexer: ``sphinx.search.IndexBuilder`` instance.
+    """
+    for attr in ("_mapping", "_title_mapping"):
+        mapping: Dict[str, Any] = getattr(indexer, attr, None) or {}
+
+        for word in [k for k, v in mapping.items() if not v]:
+            del mapping[word]
+    return None
+
+
+def _summarize(doctree):
+    """Helper function that returns a copy of a doctree with its code blocks reduced to their header comments.
+
+    Args:
+        doctree: Docutils document.
+
+    Returns:
+        Summarized copy of the document.
+    """
+    from docutils import nodes
+
+    doctree = doctree.deepcopy()
+
+    for node in list(doctree.findall(nodes.literal_block)):
+        node[:] = [nodes.Text(header_comments(node.astext()))]
+    return doctree
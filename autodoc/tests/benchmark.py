@@ -0,0 +1,436 @@
+"""Benchmark suite for the documentation pipeline.
+
+A synthetic package/repository of configurable size is generated, and each pipeline stage
+(``doc_init``, ``file_search``, ``write_script_docs``, ``sphinx_apidoc`` and ``build_docs``) is timed
+separately, cold (no previous state) and then warm (repeated with state from the previous run).
+Each measurement runs in a fresh process, so that peak memory use (RSS) is reported per stage.
+
+Results are written to a JSON file, and can be compared against a stored baseline.
+
+Usage example:
+    .. code-block:: bash
+
+        python autodoc/tests/benchmark.py --scripts 2000 --modules 100 --output results.json
+        python autodoc/tests/benchmark.py --scripts 2000 --modules 100 --baseline results.json --threshold 0.25
+"""
+import argparse
+import json
+import os
+import pathlib
+import platform
+import random
+import resource
+import shutil
+import sys
+import tempfile
+import time
+
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+_pkg_path: str = os.path.join(str(pathlib.Path(os.path.abspath(__file__)).parents[2]))
+if _pkg_path not in sys.path:
+    sys.path.append(_pkg_path)
+
+# Pipeline stages, in the order they are run
+STAGES: Tuple[str, ...] = (
+    "doc_init",
+    "file_search",
+    "write_script_docs",
+    "sphinx_apidoc",
+    "build_docs",
+)
+
+# Script types to file extension and line template
+_SCRIPT_TYPES: Dict[str, Tuple[str, str]] = {
+    "bash": (".sh", 'echo "line {i}"\tvalue=$(( {i} * 2 ))\n'),
+    "perl": (".pl", 'print "line {i}\\n";\n'),
+    "ruby": (".rb", 'puts "line {i}"\n'),
+    "yaml": (".yml", "key_{i}: value_{i}\n"),
+    "shebang": ("", 'echo "line {i}"\n'),
+}
+
+
+def make_synthetic_package(
+    root: str,
+    scripts: int = 500,
+    modules: int = 50,
+    binaries: int = 50,
+    depth: int = 4,
+    script_lines: Sequence[int] = (10, 100, 1000),
+    binary_size: int = 1 << 16,
+    seed: int = 0,
+) -> Dict[str, int]:
+    """Generates a synthetic package/repository.
+
+    The package contains:
+        * shell, perl, ruby and yaml scripts (with and without file extensions) of various sizes,
+        * binary noise files,
+        * a python package with ``modules`` modules,
+        * a deep directory tree, and
+        * symbolic links (to files, and a cycle to a parent directory).
+
+    NOTE:
+        An existing package directory is removed first, so that runs with the same directory generate the same package.
+
+    Args:
+        root: Package directory (created, **OR** replaced if it exists).
+        scripts: Number of scripts. Defaults to 500.
+        modules: Number of python modules. Defaults to 50.
+        binaries: Number of binary noise files. Defaults to 50.
+        depth: Depth of the directory tree. Defaults to 4.
+        script_lines: Script sizes (in lines), used in turn. Defaults to (10, 100, 1000).
+        binary_size: Size of each binary noise file (in bytes). Defaults to 64 KiB.
+        seed: Random seed. Defaults to 0.
+
+    Returns:
+        Dictionary with the number of ``scripts``, ``modules`` and ``binaries``, and the total ``script_bytes`` and ``module_bytes``.
+    """
+    rng: random.Random = random.Random(seed)
+    root: str = os.path.abspath(root)
+
+    if os.path.lexists(root):
+        shutil.rmtree(root)
+
+    dirs: List[str] = [root]
+    for i in range(max(1, depth)):
+        dirs.append(os.path.join(dirs[-1], f"level{i}"))
+        dirs.append(os.path.join(dirs[-2], f"branch{i}"))
+
+    for d in dirs:
+        os.makedirs(d, exist_ok=True)
+
+    types: List[str] = list(_SCRIPT_TYPES)
+    script_bytes: int = 0
+
+    for i in range(scripts):
+        script_type: str = types[i % len(types)]
+        ext, template = _SCRIPT_TYPES[script_type]
+        path: str = os.path.join(rng.choice(dirs), f"script_{i}{ext}")
+        n: int = script_lines[i % len(script_lines)]
+
+        with open(path, mode="w", encoding="utf-8") as f:
+            if ext in ("", ".sh"):
+                f.write("#!/usr/bin/env bash\n")
+            for j in range(n):
+                f.write(template.format(i=j))
+
+        script_bytes += os.path.getsize(path)
+
+    for i in range(binaries):
+        ext: str = "" if i % 2 else ".bin"
+        path: str = os.path.join(rng.choice(dirs), f"blob_{i}{ext}")
+        with open(path, mode="wb") as f:
+            f.write(rng.randbytes(binary_size))
+
+    pydir: str = os.path.join(root, "synthpkg")
+    os.makedirs(pydir, exist_ok=True)
+    module_bytes: int = 0
+
+    with open(os.path.join(pydir, "__init__.py"), mode="w", encoding="utf-8") as f:
+        f.write('"""Synthetic package."""\n')
+
+    for i in range(modules):
+        path: str = os.path.join(pydir, f"module_{i}.py")
+        with open(path, mode="w", encoding="utf-8") as f:
+            f.write(f'"""Synthetic module {i}."""\n\n')
+            for j in range(10):
+                f.write(
+                    f"def func_{j}(x: int, y: str = 'a') -> int:\n"
+                    f'    """Function {j}.\n\n    Args:\n        x: Value.\n        y: Name.\n\n'
+                    f'    Returns:\n        Result.\n    """\n    return x + {j}\n\n\n'
+                )
+        module_bytes += os.path.getsize(path)
+
+    # Symbolic links: duplicate file, and a cycle back to the root
+    if scripts > 0:
+        target: str = next(
+            os.path.join(d, x) for d in dirs for x in sorted(os.listdir(d)) if x.startswith("script_")
+        )
+        os.symlink(target, os.path.join(root, "linked_script.sh"))
+    os.symlink(root, os.path.join(dirs[-1], "cycle"))
+
+    return {
+        "scripts": scripts,
+        "modules": modules,
+        "binaries": binaries,
+        "script_bytes": script_bytes,
+        "module_bytes": module_bytes,
+    }
+
+
+def _stage_doc_init(pkg: str, outdir: str, clean: bool) -> None:
+    """Runs ``doc_init``."""
+    from autodoc.documentation.initialize import doc_init
+
+    doc_init(outdir=outdir, pkg=pkg, theme="alabaster")
+
+
+def _stage_file_search(pkg: str, outdir: str, clean: bool) -> None:
+    """Runs ``file_search`` with the scan index."""
+    from autodoc.doccode.shell import file_search
+    from autodoc.utils.manifest import manifest_path
+
+    file_search(
+        pkg_dir=pkg,
+        exclude_dirs=[os.path.join(outdir, "doc")],
+        index=manifest_path(outdir=outdir, name="scan.sqlite"),
+    )
+
+
+def _stage_write_script_docs(pkg: str, outdir: str, clean: bool) -> None:
+    """Runs ``write_script_docs``."""
+    from autodoc.doccode.shell import write_script_docs
+
+    write_script_docs(pkg_dir=pkg, outdir=outdir)
+
+
+def _stage_sphinx_apidoc(pkg: str, outdir: str, clean: bool) -> None:
+    """Runs ``sphinx_apidoc``."""
+    from autodoc.doccode.sphinxapi import sphinx_apidoc
+
+    sphinx_apidoc(outdir=outdir, pkg_path=os.path.join(pkg, "synthpkg"))
+
+
+def _stage_build_docs(pkg: str, outdir: str, clean: bool) -> None:
+    """Runs ``build_docs``."""
+    from autodoc.build.build_docs import build_docs
+
+    build_docs(outdir=outdir, clean=clean)
+
+
+_STAGE_FUNCS: Dict[str, Callable[[str, str, bool], None]] = {
+    "doc_init": _stage_doc_init,
+    "file_search": _stage_file_search,
+    "write_script_docs": _stage_write_script_docs,
+    "sphinx_apidoc": _stage_sphinx_apidoc,
+    "build_docs": _stage_build_docs,
+}
+
+
+def _measure(stage: str, pkg: str, outdir: str, clean: bool) -> Tuple[float, float]:
+    """Helper function that times a single stage (run in a fresh process).
+
+    Args:
+        stage: Stage name.
+        pkg: Package path.
+        outdir: Output parent directory.
+        clean: Cold run (only used by ``build_docs``).
+
+    Returns:
+        Tuple of wall time (seconds) and peak RSS (MiB) of this process and its children.
+    """
+    devnull = open(os.devnull, mode="w")
+    stdout = sys.stdout
+    sys.stdout = devnull
+
+    try:
+        start: float = time.perf_counter()
+        _STAGE_FUNCS[stage](pkg, outdir, clean)
+        seconds: float = time.perf_counter() - start
+    finally:
+        sys.stdout = stdout
+        devnull.close()
+
+    rss: int = max(
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+    )
+
+    # ru_maxrss is in bytes on macOS, and in KiB elsewhere
+    scale: int = 1 << 20 if sys.platform == "darwin" else 1 << 10
+    return seconds, rss / scale
+
+
+def run_benchmarks(
+    workdir: str,
+    scripts: int = 500,
+    modules: int = 50,
+    binaries: int = 50,
+    depth: int = 4,
+    stages: Sequence[str] = STAGES,
+) -> Dict[str, Any]:
+    """Generates a synthetic package and times each pipeline stage, cold and warm.
+
+    NOTE:
+        Documentation state (``<workdir>/out/doc/.autodoc``, e.g. the manifest and scan index) is removed before each cold run, and the documentation of previous benchmark runs is removed first.
+
+    Args:
+        workdir: Working directory (the synthetic package and documentation are written here).
+        scripts: Number of scripts. Defaults to 500.
+        modules: Number of python modules. Defaults to 50.
+        binaries: Number of binary noise files. Defaults to 50.
+        depth: Depth of the directory tree. Defaults to 4.
+        stages: Stages to run. Defaults to all stages.
+
+    Returns:
+        Dictionary of benchmark metadata (``meta``) and results (``results``) per stage and run (``cold``/``warm``).
+    """
+    pkg: str = os.path.join(workdir, "pkg")
+    outdir: str = os.path.join(workdir, "out")
+    # Not autodoc.utils.manifest.manifest_path, which creates the directory
+    statedir: str = os.path.join(outdir, "doc", ".autodoc")
+
+    shutil.rmtree(outdir, ignore_errors=True)
+    sizes: Dict[str, int] = make_synthetic_package(
+        pkg, scripts=scripts, modules=modules, binaries=binaries, depth=depth
+    )
+
+    # Input size of each stage: (number of files, bytes)
+    inputs: Dict[str, Tuple[int, int]] = {
+        "doc_init": (1, 0),
+        "file_search": (sizes["scripts"] + sizes["binaries"], sizes["script_bytes"]),
+        "write_script_docs": (sizes["scripts"], sizes["script_bytes"]),
+        "sphinx_apidoc": (sizes["modules"], sizes["module_bytes"]),
+        "build_docs": (sizes["scripts"] + sizes["modules"], sizes["script_bytes"] + sizes["module_bytes"]),
+    }
+
+    results: Dict[str, Dict[str, Dict[str, float]]] = {}
+    ctx = get_context("spawn")
+
+    for stage in stages:
+        if stage == "build_docs" and shutil.which("sphinx-build") is None:
+            print(f"{stage}: skipped (sphinx-build not found)")
+            continue
+
+        results[stage] = {}
+
+        for run in ("cold", "warm"):
+            if run == "cold":
+                shutil.rmtree(statedir, ignore_errors=True)
+
+            with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as executor:
+                seconds, rss = executor.submit(
+                    _measure, stage, pkg, outdir, run == "cold"
+                ).result()
+
+            nfiles, nbytes = inputs[stage]
+            results[stage][run] = {
+                "seconds": seconds,
+                "files_per_s": nfiles / seconds if seconds > 0 else 0.0,
+                "mb_per_s": nbytes / (1 << 20) / seconds if seconds > 0 else 0.0,
+                "peak_rss_mb": rss,
+            }
+
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "params": {
+                "scripts": scripts,
+                "modules": modules,
+                "binaries": binaries,
+                "depth": depth,
+            },
+        },
+        "results": results,
+    }
+
+
+def compare(
+    results: Dict[str, Any], baseline: Dict[str, Any], threshold: float = 0.2
+) -> List[str]:
+    """Compares benchmark results against a baseline.
+
+    Args:
+        results: Benchmark results (see :func:`run_benchmarks`).
+        baseline: Baseline benchmark results.
+        threshold: Maximum allowed relative slowdown (e.g. 0.2 for 20%). Defaults to 0.2.
+
+    Returns:
+        List of regression descriptions (empty if there are none).
+    """
+    regressions: List[str] = []
+
+    for stage, runs in results["results"].items():
+        for run, metrics in runs.items():
+            base: Optional[Dict[str, float]] = (
+                baseline.get("results", {}).get(stage, {}).get(run, None)
+            )
+            if base is None or base["seconds"] <= 0:
+                continue
+
+            change: float = metrics["seconds"] / base["seconds"] - 1
+            if change > threshold:
+                regressions.append(
+                    f"{stage} ({run}): {base['seconds']:.3f}s -> {metrics['seconds']:.3f}s (+{change:.0%})"
+                )
+    return regressions
+
+
+def _print_table(results: Dict[str, Any]) -> None:
+    """Helper function that prints benchmark results as a table."""
+    print(f"\n{'stage':<20}{'run':<6}{'seconds':>10}{'files/s':>12}{'MB/s':>10}{'RSS MB':>10}")
+    for stage, runs in results["results"].items():
+        for run, m in runs.items():
+            print(
+                f"{stage:<20}{run:<6}{m['seconds']:>10.3f}{m['files_per_s']:>12.1f}{m['mb_per_s']:>10.2f}{m['peak_rss_mb']:>10.1f}"
+            )
+    print("")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Command line interface for the benchmark suite.
+
+    Args:
+        argv: Command line arguments. Defaults to None (``sys.argv``).
+
+    Returns:
+        Exit code: 1 if a regression against the baseline was found, 0 otherwise.
+    """
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(
+        description="Benchmark the documentation pipeline on a synthetic package."
+    )
+    parser.add_argument("--scripts", type=int, default=500, help="Number of scripts.")
+    parser.add_argument("--modules", type=int, default=50, help="Number of python modules.")
+    parser.add_argument("--binaries", type=int, default=50, help="Number of binary noise files.")
+    parser.add_argument("--depth", type=int, default=4, help="Directory tree depth.")
+    parser.add_argument(
+        "--stages", nargs="+", choices=STAGES, default=list(STAGES), help="Stages to run."
+    )
+    parser.add_argument("--workdir", default=None, help="Working directory (default: temporary).")
+    parser.add_argument("-o", "--output", default=None, help="Output JSON results file.")
+    parser.add_argument("-b", "--baseline", default=None, help="Baseline JSON results file.")
+    parser.add_argument(
+        "-t", "--threshold", type=float, default=0.2, help="Allowed relative slowdown (default: 0.2)."
+    )
+    args: argparse.Namespace = parser.parse_args(argv)
+
+    workdir: str = args.workdir or tempfile.mkdtemp(prefix="autodoc-bench-")
+    try:
+        results: Dict[str, Any] = run_benchmarks(
+            workdir,
+            scripts=args.scripts,
+            modules=args.modules,
+            binaries=args.binaries,
+            depth=args.depth,
+            stages=args.stages,
+        )
+    finally:
+        if args.workdir is None:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    _print_table(results)
+
+    if args.output:
+        with open(args.output, mode="w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, mode="r", encoding="utf-8") as f:
+            baseline: Dict[str, Any] = json.load(f)
+
+        regressions: List[str] = compare(results, baseline, threshold=args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION: {regression}")
+        if regressions:
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
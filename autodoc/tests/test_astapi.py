@@ -0,0 +1,66 @@
+"""Tests of the static (``ast``) python API documentation engine.
+"""
+import os
+import pathlib
+import sys
+
+_pkg_path: str = os.path.join(str(pathlib.Path(os.path.abspath(__file__)).parents[2]))
+sys.path.append(_pkg_path)
+
+from autodoc.doccode.astapi import ast_apidoc
+
+
+def _write(path: str, text: str) -> None:
+    """Helper function that writes a text file, creating its directory."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, mode="w", encoding="utf-8") as f:
+        f.write(text)
+
+
+def test_module_pages_do_not_overwrite_reserved_pages(tmp_path):
+    outdir: str = str(tmp_path / "out")
+    pkg: str = str(tmp_path / "src")
+    srcdir: str = os.path.join(outdir, "doc", "source")
+
+    _write(os.path.join(pkg, "index.py"), '"""Index module."""\n')
+    _write(os.path.join(pkg, "conf.py"), '"""Conf module."""\n')
+    _write(os.path.join(pkg, "run.py"), '"""Run module."""\n')
+    _write(os.path.join(srcdir, "index.rst"), "Root page\n")
+    _write(os.path.join(srcdir, "run.rst"), "Script page\n")
+
+    pages = ast_apidoc(outdir=outdir, pkg_path=pkg, workers=1, napoleon=False)
+
+    with open(os.path.join(srcdir, "index.rst"), encoding="utf-8") as f:
+        assert f.read() == "Root page\n"
+    with open(os.path.join(srcdir, "run.rst"), encoding="utf-8") as f:
+        assert f.read() == "Script page\n"
+
+    for docname in ("index_", "conf_", "run_"):
+        assert os.path.join(srcdir, f"{docname}.rst") in pages
+
+    with open(os.path.join(srcdir, "modules.rst"), encoding="utf-8") as f:
+        toc: str = f.read()
+    assert "   index_\n" in toc and "   conf_\n" in toc and "   run_\n" in toc
+
+    # Page names are stable across runs
+    assert ast_apidoc(outdir=outdir, pkg_path=pkg, workers=1, napoleon=False) == pages
+
+
+def test_switching_from_sphinx_apidoc_replaces_its_pages(tmp_path):
+    from autodoc.documentation.write import write_api_docs
+
+    outdir: str = str(tmp_path / "out")
+    pkg: str = str(tmp_path / "mypkg")
+    srcdir: str = os.path.join(outdir, "doc", "source")
+
+    _write(os.path.join(pkg, "__init__.py"), '"""Package."""\n')
+    _write(os.path.join(srcdir, "modules.rst"), "mypkg\n=====\n\n.. toctree::\n   :maxdepth: 4\n\n   mypkg\n")
+    _write(os.path.join(srcdir, "mypkg.rst"), "mypkg package\n=============\n\n.. automodule:: mypkg\n")
+    _write(os.path.join(srcdir, "run.rst"), "Script page\n")
+
+    pages = write_api_docs(outdir=outdir, pkg=pkg, api_engine="ast", workers=1)
+
+    assert os.path.join(srcdir, "mypkg.rst") in pages
+    with open(os.path.join(srcdir, "mypkg.rst"), encoding="utf-8") as f:
+        assert ".. py:module:: mypkg" in f.read()
+    assert os.path.exists(os.path.join(srcdir, "run.rst"))
@@ -0,0 +1,69 @@
+"""Import time benchmark of the command line interface.
+
+The ``autodoc`` command is run from pre-commit hooks and CI steps, where its startup time dominates. Importing
+the command line interface must not import any subsystem (e.g. Sphinx, ``commandio``), and must stay within a
+time budget.
+"""
+import os
+import pathlib
+import re
+import subprocess
+import sys
+
+from typing import Dict, Set
+
+_pkg_path: str = os.path.join(str(pathlib.Path(os.path.abspath(__file__)).parents[2]))
+
+# Cumulative import time budget of ``autodoc.cli`` (microseconds)
+_BUDGET_US: int = 50_000
+
+# Modules that must not be imported at startup
+_LAZY_MODULES: Set[str] = {"commandio", "sphinx", "docutils", "pygments", "sqlite3", "concurrent"}
+
+# ``-X importtime`` line: "import time: <self us> | <cumulative us> | <indented module name>"
+_IMPORTTIME_RE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|(\s+)(\S+)$", re.MULTILINE)
+
+
+def _import_times(module: str) -> Dict[str, int]:
+    """Helper function that imports a module in a fresh interpreter, and returns the cumulative import time of each module.
+
+    Args:
+        module: Module name.
+
+    Returns:
+        Dictionary that maps module names to their cumulative import times (microseconds).
+    """
+    p: subprocess.CompletedProcess = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=_pkg_path,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return {name: int(cumulative) for _, cumulative, _, name in _IMPORTTIME_RE.findall(p.stderr)}
+
+
+def test_cli_imports_lazily():
+    times: Dict[str, int] = _import_times("autodoc.cli")
+    imported: Set[str] = {x.split(".")[0] for x in times}
+
+    assert "autodoc.cli" in times
+    assert not imported & _LAZY_MODULES, sorted(imported & _LAZY_MODULES)
+
+
+def test_cli_import_time_budget():
+    # Best of several runs, to reduce noise
+    best: int = min(_import_times("autodoc.cli")["autodoc.cli"] for _ in range(5))
+    assert best < _BUDGET_US, f"autodoc.cli took {best} us to import (budget: {_BUDGET_US} us)"
+
+
+def test_version_is_read_on_demand():
+    p: subprocess.CompletedProcess = subprocess.run(
+        [sys.executable, "-m", "autodoc", "--version"],
+        cwd=_pkg_path,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    with open(os.path.join(_pkg_path, "autodoc", "misc", "version.txt")) as f:
+        assert p.stdout.split() == ["autodoc", f.read().strip()]
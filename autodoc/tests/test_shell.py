@@ -0,0 +1,80 @@
+"""Tests of script documentation.
+"""
+import os
+import pathlib
+import sys
+
+_pkg_path: str = os.path.join(str(pathlib.Path(os.path.abspath(__file__)).parents[2]))
+sys.path.append(_pkg_path)
+
+from autodoc.doccode.shell import write_script_docs
+
+
+def _write(path: str, text: str) -> None:
+    """Helper function that writes a text file, creating its directory."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, mode="w", encoding="utf-8") as f:
+        f.write(text)
+
+
+def test_script_pages_do_not_replace_other_pages(tmp_path):
+    outdir: str = str(tmp_path / "out")
+    pkg: str = str(tmp_path / "mypkg")
+    srcdir: str = os.path.join(outdir, "doc", "source")
+
+    for name in ("index.sh", "mypkg.sh", "hand.sh", "run.sh"):
+        _write(os.path.join(pkg, name), "#!/bin/bash\necho\n")
+    _write(os.path.join(srcdir, "index.rst"), "Root page\n")
+    _write(os.path.join(srcdir, "hand.rst"), "Hand written\n")
+
+    rsts = write_script_docs(pkg_dir=pkg, outdir=outdir, workers=1)
+
+    assert rsts == {
+        os.path.join(srcdir, f"{x}.rst") for x in ("index_", "mypkg_", "hand_", "run")
+    }
+
+    # Pages of removed scripts are removed, other pages are kept
+    os.remove(os.path.join(pkg, "index.sh"))
+    os.remove(os.path.join(pkg, "hand.sh"))
+    write_script_docs(pkg_dir=pkg, outdir=outdir, workers=1)
+
+    with open(os.path.join(srcdir, "index.rst"), encoding="utf-8") as f:
+        assert f.read() == "Root page\n"
+    with open(os.path.join(srcdir, "hand.rst"), encoding="utf-8") as f:
+        assert f.read() == "Hand written\n"
+    assert not os.path.exists(os.path.join(srcdir, "index_.rst"))
+    assert os.path.exists(os.path.join(srcdir, "run.rst"))
+
+
+def test_script_pages_are_only_searched_for_paginated_scripts(tmp_path, monkeypatch):
+    import autodoc.utils.docshell as docshell
+
+    outdir: str = str(tmp_path / "out")
+    pkg: str = str(tmp_path / "mypkg")
+    srcdir: str = os.path.join(outdir, "doc", "source")
+
+    _write(os.path.join(pkg, "long.sh"), "#!/bin/bash\n" + "echo\n" * 9)
+    _write(os.path.join(pkg, "short.sh"), "#!/bin/bash\necho\n")
+
+    searched = []
+    script_doc_parts = docshell.script_doc_parts
+    monkeypatch.setattr(
+        docshell, "script_doc_parts", lambda x: searched.append(os.path.basename(x)) or script_doc_parts(x)
+    )
+
+    write_script_docs(pkg_dir=pkg, outdir=outdir, workers=1, page_lines=4)
+    assert searched == ["long.rst"]
+    assert os.path.exists(os.path.join(srcdir, "long.part003.rst"))
+
+    # Pages of a previous (longer) version are removed
+    _write(os.path.join(pkg, "long.sh"), "#!/bin/bash\necho\n")
+    searched.clear()
+    write_script_docs(pkg_dir=pkg, outdir=outdir, workers=1, page_lines=4)
+    assert searched == ["long.rst"]
+    assert not os.path.exists(os.path.join(srcdir, "long.part001.rst"))
+
+    # Neither paginated now nor before
+    _write(os.path.join(pkg, "long.sh"), "#!/bin/bash\necho 1\n")
+    searched.clear()
+    write_script_docs(pkg_dir=pkg, outdir=outdir, workers=1, page_lines=4)
+    assert searched == []
@@ -0,0 +1,51 @@
+"""Tests of the directory walker.
+"""
+import os
+import pathlib
+import sys
+
+_pkg_path: str = os.path.join(str(pathlib.Path(os.path.abspath(__file__)).parents[2]))
+sys.path.append(_pkg_path)
+
+from autodoc.utils.walk import is_walked, walk_files
+
+
+def _write(path: str, text: str) -> None:
+    """Helper function that writes a text file, creating its directory."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, mode="w", encoding="utf-8") as f:
+        f.write(text)
+
+
+def test_is_walked_matches_walk_files(tmp_path):
+    root: str = str(tmp_path)
+    files = [
+        "run.sh",
+        "big.sh",
+        "skip.sh",
+        "build/gen.sh",
+        "src/keep.sh",
+        "src/tmp/x.sh",
+        "src/.autodocignore",
+        "excluded/y.sh",
+        ".git/hooks/pre-commit",
+        "venv/bin/activate",
+        "venv/pyvenv.cfg",
+    ]
+    for x in files:
+        _write(os.path.join(root, x), "#" * (300 if x == "big.sh" else 10) + "\n")
+
+    _write(os.path.join(root, ".gitignore"), "build/\n")
+    _write(os.path.join(root, "src", ".autodocignore"), "tmp/\n")
+
+    kwargs = {"exclude": ["skip*", "excluded"], "max_file_size": 200}
+    walked = {x for x, _ in walk_files(root, **kwargs)}
+
+    for x in files + [".gitignore"]:
+        path: str = os.path.join(root, x)
+        assert is_walked(root, path, **kwargs) == (path in walked), x
+
+    # Deleted files are checked against the path rules only
+    assert is_walked(root, os.path.join(root, "src", "gone.sh"), **kwargs)
+    assert not is_walked(root, os.path.join(root, "build", "gone.sh"), **kwargs)
+    assert not is_walked(root, os.path.join(os.path.dirname(root), "outside.sh"))
@@ -0,0 +1,213 @@
+"""File type detection for shell/scripting files.
+
+Files are identified by their extension when possible. Otherwise, only a small header is read to reject binary
+content and to parse the shebang (interpreter directive) line.
+"""
+import os
+import re
+import time
+
+from functools import lru_cache
+from typing import Dict, List, Optional, Pattern, Union
+
+from autodoc.utils.trace import emit, enabled
+
+# Number of bytes read from a file to detect its type
+_HEADER_SIZE: int = 1024
+
+# Maximum number of (path, mtime, size) keys kept in the detection cache
+_CACHE_SIZE: int = 1 << 16
+
+# File extensions (lower case, without the leading '.') to file types
+_EXT_TABLE: Dict[str, str] = {
+    "sh": "bash",
+    "bash": "bash",
+    "zsh": "zsh",
+    "ruby": "ruby",
+    "rb": "ruby",
+    "perl": "perl",
+    "pl": "perl",
+    "yml": "yaml",
+    "yaml": "yaml",
+    "json": "json",
+}
+
+# Shebang interpreter names (without version suffix) to file types
+_INTERPRETER_TABLE: Dict[str, str] = {
+    "sh": "bash",
+    "bash": "bash",
+    "zsh": "zsh",
+    "ruby": "ruby",
+    "perl": "perl",
+}
+
+# Splits versioned interpreter names, e.g. perl5.36 -> perl, ruby-3.2 -> ruby
+_VERSIONED_RE: Pattern = re.compile(r"^(?P<name>.*?[A-Za-z])(?:[-_]?\d+(?:\.\d+)*)?$")
+
+# ``env`` options that take a separate argument
+_ENV_ARG_OPTIONS: List[str] = ["-u", "--unset", "-C", "--chdir", "-P"]
+
+
+def detect_script_type(
+    infile: str, encoding: Optional[str] = "utf-8"
+) -> Union[str, None]:
+    """Detects the shell/file type of some input file (e.g. bash/shell, ruby, perl script).
+
+    The file type is inferred from the file extension. If the file extension is not known, then at most
+    the first kilobyte of the file is read: binary files are rejected, and the file type is inferred from the
+    shebang line. Results are cached by ``(path, mtime, size)``.
+
+    Args:
+        infile: Input file.
+        encoding: Encoding standard. Defaults to "utf-8".
+
+    Returns:
+        File type as a string **OR** None if the file type cannot be inferred.
+    """
+    infile: str = os.path.abspath(infile)
+
+    if not enabled():
+        return _detect(infile, encoding)
+
+    start: float = time.perf_counter()
+    script_type: Union[str, None] = _detect(infile, encoding)
+    emit(
+        "file_detected",
+        path=infile,
+        script_type=script_type,
+        duration=time.perf_counter() - start,
+    )
+    return script_type
+
+
+def _detect(infile: str, encoding: Optional[str] = "utf-8") -> Union[str, None]:
+    """Helper function that detects the shell/file type of some (absolute) input file path.
+
+    Args:
+        infile: Absolute input file path.
+        encoding: Encoding standard. Defaults to "utf-8".
+
+    Returns:
+        File type as a string **OR** None if the file type cannot be inferred.
+    """
+    ext: str = os.path.splitext(infile)[1][1:].lower()
+
+    # Check file extension to infer file/script type
+    if ext in _EXT_TABLE:
+        return _EXT_TABLE[ext]
+
+    try:
+        st: os.stat_result = os.stat(infile)
+    except OSError:
+        return None
+
+    return _sniff(infile, st.st_mtime_ns, st.st_size, encoding)
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def _sniff(
+    infile: str, mtime: int, size: int, encoding: Optional[str] = "utf-8"
+) -> Union[str, None]:
+    """Helper function that infers the file type from a file header.
+
+    NOTE:
+        ``mtime`` and ``size`` are not used directly, but are part of the cache key.
+
+    Args:
+        infile: Input file.
+        mtime: Modification time (ns) of the input file.
+        size: Size (bytes) of the input file.
+        encoding: Encoding standard. Defaults to "utf-8".
+
+    Returns:
+        File type as a string **OR** None if the file type cannot be inferred.
+    """
+    if size < 2:
+        return None
+
+    try:
+        with open(infile, mode="rb") as f:
+            header: bytes = f.read(_HEADER_SIZE)
+    except OSError:
+        return None
+
+    # Shebang must start the file, and binary content is rejected
+    if not header.startswith(b"#!") or b"\x00" in header:
+        return None
+
+    try:
+        line: str = header.split(b"\n", 1)[0].decode(encoding)
+    except (UnicodeDecodeError, LookupError):
+        return None
+
+    interpreter: Union[str, None] = parse_shebang(line)
+
+    if interpreter is None:
+        return None
+
+    return _INTERPRETER_TABLE.get(interpreter, None)
+
+
+def parse_shebang(line: str) -> Union[str, None]:
+    """Parses a shebang line and returns the name of the interpreter without any version suffix.
+
+    Usage example:
+        >>> parse_shebang("#!/usr/bin/env -S perl5.36 -w")
+        'perl'
+        >>> parse_shebang("#!/bin/bash -e")
+        'bash'
+
+    Args:
+        line: First line of a file.
+
+    Returns:
+        Interpreter name **OR** None if the line is not a shebang line.
+    """
+    if not line.startswith("#!"):
+        return None
+
+    tokens: List[str] = line[2:].strip().split()
+
+    if not tokens:
+        return None
+
+    program: str = os.path.basename(tokens[0])
+
+    if program == "env":
+        program: Union[str, None] = _env_program(tokens[1:])
+        if program is None:
+            return None
+        program: str = os.path.basename(program)
+
+    match = _VERSIONED_RE.match(program)
+
+    if match is None:
+        return None
+
+    return match.group("name").lower()
+
+
+def _env_program(args: List[str]) -> Union[str, None]:
+    """Helper function that finds the program invoked by ``env`` from its arguments.
+
+    Args:
+        args: Arguments passed to ``env``.
+
+    Returns:
+        Program name **OR** None if no program is invoked.
+    """
+    skip: bool = False
+
+    for arg in args:
+        if skip:
+            skip: bool = False
+        elif arg in _ENV_ARG_OPTIONS:
+            skip: bool = True
+        elif arg.startswith("-S") and len(arg) > 2:
+            # -S with the program attached (e.g. -Sperl)
+            return arg[2:]
+        elif arg.startswith("-") or "=" in arg:
+            continue
+        else:
+            return arg
+    return None
@@ -1,11 +1,26 @@
 """Automatically document shell script code.
 """
 import os
+import re
+import time
 
-from typing import Dict, List, Optional, Set, Union
+from itertools import chain, islice
+from typing import Dict, Iterable, Iterator, List, Optional, Pattern, Tuple, Union
 
 from commandio.fileio import File
-from autodoc.utils.util import read_file, write_file
+from autodoc.utils.detect import detect_script_type
+from autodoc.utils.trace import emit, enabled
+from autodoc.utils.util import iter_file, iter_tabs2spaces, write_file
+
+# File-wide metadata fields (written before the title) of each search mode
+_SEARCH_FIELDS: Dict[str, str] = {
+    "full": "",
+    "summary": ":autodoc-search: summary\n\n",
+    "exclude": ":nosearch:\n\n",
+}
+
+# Page files of paginated script documentation
+_PART_RE: Pattern = re.compile(r"^(.+)\.part(\d{3,})\.rst$")
 
 
 def document_shell_script(
@@ -14,15 +29,36 @@ def document_shell_script(
     encoding: Optional[str] = "utf-8",
     convert_tabs_to_spaces: bool = True,
     num_spaces: Optional[int] = 4,
-) -> None:
+    reference_threshold: Optional[int] = None,
+    search: str = "full",
+    page_lines: Optional[int] = None,
+    page_bytes: Optional[int] = None,
+    previous_pages: Optional[int] = None,
+) -> int:
     """Documents shell scripts by writing their code to Restructured text code block.
 
+    Files at least ``reference_threshold`` bytes large are not copied: a ``.. literalinclude::`` directive that
+    points at the original file (relative to ``outfile``) is written instead, and Sphinx reads the file at build time.
+
+    Search modes (how the page is indexed by the Sphinx HTML search):
+        * ``full``: The page, including the complete code, is indexed.
+        * ``summary``: Only the title, preamble, and header comments of the script are indexed (``:autodoc-search: summary`` field, see :mod:`autodoc.sphinxext.search_summary`).
+        * ``exclude``: The page is not indexed (``:nosearch:`` field).
+
+    Scripts with more than ``page_lines`` lines or ``page_bytes`` bytes are split into numbered pages
+    (``<outfile stem>.partNNN.rst``, next to ``outfile``), each of at most ``page_lines`` lines and ``page_bytes``
+    bytes (unless a single line is larger). ``outfile`` then holds a toctree of the pages, which are linked to each
+    other, and line numbers continue from one page to the next (``:lineno-start:``). Pages of previous versions of
+    the script that are no longer needed are removed. The output directory is only searched for pages (see
+    :func:`script_doc_parts`) if the script is paginated, or if ``previous_pages`` is not known.
+
     NOTE:
         * Input files may also include other types files that can be run from the command line e.g.:
             * ruby
             * perl
             * zsh, etc.
         * ``outfile`` should be a **.rst** file.
+        * ``outfile`` is only replaced if its contents change (see :func:`autodoc.utils.util.atomic_write`).
 
     Args:
         file: Input script/file path.
@@ -30,64 +66,356 @@ def document_shell_script(
         encoding: Encoding standard. Defaults to "utf-8".
         convert_tabs_to_spaces: Convert tabs to spaces. Defaults to True.
         num_spaces: Number of spaces to replace tabs with. Only applicable when ``convert_tabs_to_spaces`` is True. Defaults to 4.
+        reference_threshold: File size (in bytes) from which files are referenced (``literalinclude``) instead of copied. Defaults to None (always copy).
+        search: Search mode, "full", "summary" or "exclude". Defaults to "full".
+        page_lines: Maximum number of lines per page. Defaults to None (no limit).
+        page_bytes: Maximum number of bytes (of code) per page. Defaults to None (no limit).
+        previous_pages: Number of pages of the previous version of ``outfile`` (0 if it was not paginated). Defaults to None (unknown).
+
+    Raises:
+        ValueError: Exception that is raised if the search mode is not known.
+
+    Returns:
+        Number of pages (0 if the script is not paginated).
     """
+    if search not in _SEARCH_FIELDS:
+        raise ValueError(f"Unknown search mode: {search}. Choose from: {', '.join(_SEARCH_FIELDS)}.")
+
     file: str = os.path.abspath(file)
+    start: float = time.perf_counter()
     script_type: str = _auto_detect(infile=file, encoding=encoding)
 
     with File(src=file, assert_exists=True) as f:
         _, fname, ext = f.file_parts()
 
-    title: str = f"""{fname}\n~~~~~~~~~~~~~~~~~~~~~~~\n\n"""
+    title: str = _SEARCH_FIELDS[search] + f"""{fname}\n~~~~~~~~~~~~~~~~~~~~~~~\n\n"""
     preamble: str = f"""Documentation/code for ``{fname}`` {script_type}{ext} script shown below: \n\n"""
 
-    text: List[str] = read_file(file, encoding=encoding)
-    block: str = f""".. code-block:: {script_type}\n\n"""
+    referenced: bool = is_referenced(file, reference_threshold)
+    pages: List[Tuple[int, int]] = _paginate(file, encoding=encoding, page_lines=page_lines, page_bytes=page_bytes)
+
+    if referenced:
+        # Reference the original file instead of copying its code
+        code: Iterator[str] = iter(())
+    else:
+        # Stream script code/information through tab conversion and code block indentation
+        code: Iterator[str] = iter_file(file, encoding=encoding, errors="replace")
+
+        if convert_tabs_to_spaces:
+            code: Iterator[str] = iter_tabs2spaces(code, replacement_spaces=int(num_spaces))
+
+    if pages:
+        _write_pages(
+            file,
+            outfile,
+            pages=pages,
+            code=code,
+            name=fname,
+            search=search,
+            script_type=script_type,
+            referenced=referenced,
+            encoding=encoding,
+            convert_tabs_to_spaces=convert_tabs_to_spaces,
+            num_spaces=num_spaces,
+        )
+        stem: str = os.path.splitext(os.path.basename(outfile))[0]
+        toctree: str = f"""The code is split into {len(pages)} parts:\n\n.. toctree::\n   :maxdepth: 1\n\n"""
+        toctree += "".join(f"""   {stem}.part{i:03d}\n""" for i in range(1, len(pages) + 1))
+        text: Iterable[str] = (title, preamble, toctree)
+    else:
+        block: str = _code_directive(
+            file,
+            outfile,
+            script_type=script_type,
+            referenced=referenced,
+            encoding=encoding,
+            convert_tabs_to_spaces=convert_tabs_to_spaces,
+            num_spaces=num_spaces,
+        )
+
+        # Write title, preamble/brief statement, code block, then the code itself in a single pass
+        text: Iterable[str] = chain((title, preamble, block), ("\t" + x for x in code))
 
-    # Write title
     write_file(
         outfile,
-        text=title,
+        text=text,
         prepend_char=None,
-        convert_tabs_to_spaces=convert_tabs_to_spaces,
-        num_spaces=num_spaces,
+        convert_tabs_to_spaces=False,
         mode="w",
+        atomic=True,
     )
 
-    # Write preamble/brief statement
-    write_file(
-        outfile,
-        text=preamble,
-        prepend_char=None,
-        convert_tabs_to_spaces=convert_tabs_to_spaces,
-        num_spaces=num_spaces,
-        mode="a",
-    )
+    # Remove pages of previous (longer) versions of the script
+    if pages or previous_pages != 0:
+        for part in script_doc_parts(outfile)[len(pages):]:
+            os.remove(part)
 
-    # Start code block.
-    write_file(
-        outfile,
-        text=block,
-        prepend_char=None,
-        convert_tabs_to_spaces=convert_tabs_to_spaces,
-        num_spaces=num_spaces,
-        mode="a",
-    )
+    if enabled():
+        emit(
+            "file_rendered",
+            path=file,
+            outfile=os.path.abspath(outfile),
+            bytes_read=0 if referenced else os.path.getsize(file),
+            bytes_written=os.path.getsize(outfile),
+            duration=time.perf_counter() - start,
+        )
+    return len(pages)
 
-    # Write script code/information to file
-    write_file(
-        outfile,
-        text=text,
-        prepend_char="\t",
-        convert_tabs_to_spaces=convert_tabs_to_spaces,
-        num_spaces=num_spaces,
-        mode="a",
-    )
+
+def is_referenced(file: str, reference_threshold: Optional[int] = None) -> bool:
+    """Checks whether a file is documented by reference (``literalinclude``) rather than copied.
+
+    Args:
+        file: Input script/file path.
+        reference_threshold: File size (in bytes) from which files are referenced. Defaults to None (never).
+
+    Returns:
+        True if the file is at least ``reference_threshold`` bytes large, False otherwise.
+    """
+    if reference_threshold is None:
+        return False
+    return os.path.getsize(file) >= reference_threshold
+
+
+def script_doc_parts(outfile: str) -> List[str]:
+    """Returns the page files of paginated script documentation (see :func:`document_shell_script`).
+
+    Args:
+        outfile: Script documentation file path (``.rst``).
+
+    Returns:
+        List of page file paths (``<outfile stem>.partNNN.rst``), in page order.
+    """
+    outdir: str = os.path.dirname(os.path.abspath(outfile))
+    stem: str = os.path.splitext(os.path.basename(outfile))[0]
+    parts: List[Tuple[int, str]] = []
+
+    try:
+        fnames: List[str] = os.listdir(outdir)
+    except OSError:
+        return []
+
+    for fname in fnames:
+        match = _PART_RE.match(fname)
+
+        if match is not None and match.group(1) == stem:
+            parts.append((int(match.group(2)), os.path.join(outdir, fname)))
+
+    return [x for _, x in sorted(parts)]
+
+
+def is_script_doc(outfile: str) -> bool:
+    """Checks whether a file is script documentation (see :func:`document_shell_script`), e.g. of a previous run.
+
+    Args:
+        outfile: reStructured Text file path.
+
+    Returns:
+        True if the file has the preamble of script documentation, False otherwise.
+    """
+    try:
+        with open(outfile, mode="r", encoding="utf-8", errors="replace") as f:
+            head: List[str] = [f.readline() for _ in range(8)]
+    except OSError:
+        return False
+    return any(x.startswith("Documentation/code for ``") for x in head)
+
+
+def remove_script_doc(outfile: str, pages: Optional[int] = None) -> None:
+    """Removes script documentation, including its pages if it is paginated.
+
+    Args:
+        outfile: Script documentation file path (``.rst``).
+        pages: Number of pages of the documentation (0 if it is not paginated, see :func:`document_shell_script`). Defaults to None (unknown).
+    """
+    if pages != 0:
+        for part in script_doc_parts(outfile):
+            os.remove(part)
+
+    if os.path.exists(outfile):
+        os.remove(outfile)
+    return None
+
+
+def _paginate(
+    file: str,
+    encoding: Optional[str] = "utf-8",
+    page_lines: Optional[int] = None,
+    page_bytes: Optional[int] = None,
+) -> List[Tuple[int, int]]:
+    """Helper function that splits a file into pages of at most ``page_lines`` lines and ``page_bytes`` bytes.
+
+    Args:
+        file: Input script/file path.
+        encoding: Encoding standard. Defaults to "utf-8".
+        page_lines: Maximum number of lines per page. Defaults to None (no limit).
+        page_bytes: Maximum number of bytes per page. Defaults to None (no limit).
+
+    Returns:
+        List of the (0-based, end exclusive) line ranges of each page, **OR** an empty list if the file fits in a single page.
+    """
+    if page_lines is None and page_bytes is None:
+        return []
+
+    if page_lines is None and os.path.getsize(file) <= page_bytes:
+        return []
+
+    pages: List[Tuple[int, int]] = []
+    first: int = 0
+    num_lines: int = 0
+    num_bytes: int = 0
+
+    for i, line in enumerate(iter_file(file, encoding=encoding, errors="replace")):
+        size: int = len(line.encode("utf-8"))
+
+        if num_lines and (
+            (page_lines is not None and num_lines >= page_lines)
+            or (page_bytes is not None and num_bytes + size > page_bytes)
+        ):
+            pages.append((first, i))
+            first, num_lines, num_bytes = i, 0, 0
+
+        num_lines += 1
+        num_bytes += size
+
+    if num_lines:
+        pages.append((first, first + num_lines))
+
+    return pages if len(pages) > 1 else []
+
+
+def _code_directive(
+    file: str,
+    outfile: str,
+    script_type: str,
+    referenced: bool = False,
+    encoding: Optional[str] = "utf-8",
+    convert_tabs_to_spaces: bool = True,
+    num_spaces: Optional[int] = 4,
+    lines: Optional[Tuple[int, int]] = None,
+) -> str:
+    """Helper function that returns the code block directive (``code-block`` or ``literalinclude``) of a script.
+
+    Args:
+        file: Input script/file path.
+        outfile: Output file path.
+        script_type: Script type (language).
+        referenced: Reference the file (``literalinclude``) instead of copying its code. Defaults to False.
+        encoding: Encoding standard. Defaults to "utf-8".
+        convert_tabs_to_spaces: Convert tabs to spaces. Defaults to True.
+        num_spaces: Number of spaces to replace tabs with. Defaults to 4.
+        lines: (0-based, end exclusive) line range of a page. Defaults to None (the whole file).
+
+    Returns:
+        Directive (and options). The code of ``code-block`` directives follows, indented with a tab.
+    """
+    if referenced:
+        path: str = os.path.relpath(file, os.path.dirname(os.path.abspath(outfile)))
+        block: str = f""".. literalinclude:: {path.replace(os.sep, "/")}\n"""
+        block += f"""   :language: {script_type}\n"""
+
+        if lines is not None:
+            block += f"""   :lines: {lines[0] + 1}-{lines[1]}\n"""
+            block += f"""   :lineno-start: {lines[0] + 1}\n"""
+
+        if convert_tabs_to_spaces:
+            block += f"""   :tab-width: {int(num_spaces)}\n"""
+
+        if encoding is not None and encoding.lower().replace("-", "") != "utf8":
+            block += f"""   :encoding: {encoding}\n"""
+
+        return block
+
+    block: str = f""".. code-block:: {script_type}\n"""
+
+    # Options are indented like the code (with a tab), as the directive content is dedented as a whole
+    if lines is not None:
+        block += f"""\t:lineno-start: {lines[0] + 1}\n"""
+
+    return block + "\n"
+
+
+def _write_pages(
+    file: str,
+    outfile: str,
+    pages: List[Tuple[int, int]],
+    code: Iterator[str],
+    name: str,
+    search: str = "full",
+    script_type: str = "",
+    referenced: bool = False,
+    encoding: Optional[str] = "utf-8",
+    convert_tabs_to_spaces: bool = True,
+    num_spaces: Optional[int] = 4,
+) -> None:
+    """Helper function that writes the pages of paginated script documentation.
+
+    Args:
+        file: Input script/file path.
+        outfile: Script documentation file path, which links to the pages.
+        pages: (0-based, end exclusive) line ranges of each page (see :func:`_paginate`).
+        code: Iterator of the (tab converted) code lines. Each page consumes its lines. Empty if ``referenced``.
+        name: Script name (page title).
+        search: Search mode, "full", "summary" or "exclude". Defaults to "full".
+        script_type: Script type (language).
+        referenced: Reference the file (``literalinclude``) instead of copying its code. Defaults to False.
+        encoding: Encoding standard. Defaults to "utf-8".
+        convert_tabs_to_spaces: Convert tabs to spaces. Defaults to True.
+        num_spaces: Number of spaces to replace tabs with. Defaults to 4.
+    """
+    outdir: str = os.path.dirname(os.path.abspath(outfile))
+    stem: str = os.path.splitext(os.path.basename(outfile))[0]
+    for i, lines in enumerate(pages, start=1):
+        title: str = f"{name} (part {i} of {len(pages)})"
+        header: str = _SEARCH_FIELDS[search] + f"""{title}\n{"~" * len(title)}\n\n"""
+
+        links: List[str] = []
+        if i > 1:
+            links.append(f""":doc:`« Previous <{stem}.part{i - 1:03d}>`""")
+        links.append(f""":doc:`{name} <{stem}>`""")
+        if i < len(pages):
+            links.append(f""":doc:`Next » <{stem}.part{i + 1:03d}>`""")
+        nav: str = " | ".join(links) + "\n\n"
+
+        page: List[str] = list(islice(code, lines[1] - lines[0]))
+
+        # Leading blank lines of directive content are dropped by docutils, so the numbering starts after them
+        blank: int = 0
+        while blank < len(page) and not page[blank].strip():
+            blank += 1
+
+        block: str = _code_directive(
+            file,
+            outfile,
+            script_type=script_type,
+            referenced=referenced,
+            encoding=encoding,
+            convert_tabs_to_spaces=convert_tabs_to_spaces,
+            num_spaces=num_spaces,
+            lines=(lines[0] + blank, lines[1]) if blank < len(page) else lines,
+        )
+
+        write_file(
+            os.path.join(outdir, f"{stem}.part{i:03d}.rst"),
+            text=chain(
+                (header, nav, block),
+                ("\t" + x for x in page),
+                ("\n\n" + nav,),
+            ),
+            prepend_char=None,
+            convert_tabs_to_spaces=False,
+            mode="w",
+            atomic=True,
+        )
     return None
 
 
 def _auto_detect(infile: str, encoding: Optional[str] = "utf-8") -> Union[str, None]:
     """Helper function that auto-detects input file type (e.g. bash/shell, ruby, perl script) and returns the shell/file type.
 
+    NOTE:
+        See :func:`autodoc.utils.detect.detect_script_type`.
+
     Args:
         infile: Input file.
         encoding: Encoding standard. Defaults to "utf-8".
@@ -95,42 +423,4 @@ def _auto_detect(infile: str, encoding: Optional[str] = "utf-8") -> Union[str, N
     Returns:
         File type as a string **OR** None if the file type cannot be inferred.
     """
-    infile: str = os.path.abspath(infile)
-
-    with File(src=infile, assert_exists=True) as f:
-        _, _, _ext = f.file_parts()
-
-    # Dictionary of common shebangs
-    shell_dict: Dict[str, str] = {
-        "sh": "bash",
-        "bash": "bash",
-        "zsh": "zsh",
-        "ruby": "ruby",
-        "rb": "ruby",
-        "perl": "perl",
-        "pl": "perl",
-        "yml": "yaml",
-        "yaml": "yaml",
-        "json": "json",
-    }
-
-    ext: str = _ext[1:].lower()
-
-    # Check file extension to infer file/script type
-    if shell_dict.get(ext, None) is not None:
-        return shell_dict.get(ext)
-
-    # If file extension is not available - assume
-    #   file/script is an executable, check
-    #   shebang.
-    text: List[str] = read_file(infile, encoding=encoding)
-
-    _shebangs: Set[str] = {"bash", "zsh", "ruby", "perl"}
-
-    for shebang in _shebangs:
-        try:
-            if shebang in text[0]:
-                return shebang
-        except IndexError:
-            return None
-    return None
+    return detect_script_type(infile=infile, encoding=encoding)
@@ -0,0 +1,103 @@
+"""Persistent manifest of generated documentation files.
+
+The manifest records, for each documented source file, a content hash, the
+options used to render it, and the path of the rendered output. This allows
+documentation to be regenerated incrementally.
+"""
+import hashlib
+import json
+import os
+
+from typing import Any, Dict, Optional
+
+from commandio.workdir import WorkDir
+
+from autodoc.utils.util import atomic_write
+
+# Bump when the manifest layout changes, forcing a full regeneration.
+_MANIFEST_VERSION: int = 1
+
+
+def manifest_path(outdir: str, name: str = "manifest.json") -> str:
+    """Returns the path of a manifest file in the documentation state directory.
+
+    The state directory is ``<outdir>/doc/.autodoc``, and is created if it does not exist.
+
+    NOTE:
+        ``out_dir`` is assumed to be the main/parent directory of the repository.
+
+    Args:
+        outdir: Output parent directory.
+        name: Manifest file name. Defaults to "manifest.json".
+
+    Returns:
+        Manifest absolute file path.
+    """
+    with WorkDir(outdir) as od:
+        statedir: str = od.join("doc", ".autodoc")
+        with WorkDir(statedir) as sd:
+            manifest: str = sd.join(name)
+    return manifest
+
+
+def load_manifest(manifest: str) -> Dict[str, Dict[str, Any]]:
+    """Loads manifest entries from file.
+
+    NOTE:
+        An empty dictionary is returned if the manifest does not exist, cannot be parsed, or was written by an incompatible version.
+
+    Args:
+        manifest: Manifest file path.
+
+    Returns:
+        Dictionary that maps source file paths to their manifest entries.
+    """
+    if not os.path.exists(manifest):
+        return {}
+
+    try:
+        with open(manifest, mode="r", encoding="utf-8") as f:
+            data: Dict[str, Any] = json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+    if data.get("version", None) != _MANIFEST_VERSION:
+        return {}
+
+    return data.get("entries", {})
+
+
+def save_manifest(manifest: str, entries: Dict[str, Dict[str, Any]]) -> str:
+    """Writes manifest entries to file.
+
+    Args:
+        manifest: Manifest file path.
+        entries: Dictionary that maps source file paths to their manifest entries.
+
+    Returns:
+        Manifest file path.
+    """
+    data: Dict[str, Any] = {"version": _MANIFEST_VERSION, "entries": entries}
+
+    with atomic_write(manifest) as f:
+        json.dump(data, f, indent=1, sort_keys=True)
+    return manifest
+
+
+def file_hash(infile: str, /, chunk_size: Optional[int] = 1 << 20) -> str:
+    """Computes the SHA-256 hash of a file's contents.
+
+    Args:
+        infile: Argument only input file.
+        chunk_size: Number of bytes to read at a time. Defaults to 1 MiB.
+
+    Returns:
+        Hexadecimal digest string.
+    """
+    digest = hashlib.sha256()
+
+    with open(infile, mode="rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+
+    return digest.hexdigest()
@@ -0,0 +1,184 @@
+"""Persistent (SQLite) index of scanned files and their detected script types.
+
+The index records the path, device, inode, size, modification time and detected script type of every file
+found while scanning a package. Later scans only re-examine files whose stat data changed.
+"""
+import os
+import sqlite3
+
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+from autodoc.utils.detect import detect_script_type
+from autodoc.utils.trace import emit
+from autodoc.utils.walk import walk_files
+
+# Bump when the index schema or detection rules change, forcing a full re-scan.
+_INDEX_VERSION: str = "1"
+
+_SCHEMA: str = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    dev INTEGER,
+    inode INTEGER,
+    size INTEGER,
+    mtime INTEGER,
+    script_type TEXT
+);
+CREATE INDEX IF NOT EXISTS files_script_type ON files (script_type);
+"""
+
+# Stat signature: (device, inode, size, mtime)
+_Signature = Tuple[int, int, int, int]
+
+
+def open_scan_index(index: str) -> sqlite3.Connection:
+    """Opens (and creates, if needed) a scan index.
+
+    NOTE:
+        Indexes written by an incompatible version are emptied.
+
+    Args:
+        index: Scan index file path.
+
+    Returns:
+        SQLite database connection.
+    """
+    conn: sqlite3.Connection = sqlite3.connect(index)
+    conn.executescript(_SCHEMA)
+
+    row: Union[Tuple[str], None] = conn.execute(
+        "SELECT value FROM meta WHERE key = 'version'"
+    ).fetchone()
+
+    if row is None or row[0] != _INDEX_VERSION:
+        with conn:
+            conn.execute("DELETE FROM files")
+            conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('version', ?)",
+                (_INDEX_VERSION,),
+            )
+    return conn
+
+
+def scan(
+    root: str,
+    index: str,
+    include: Optional[Sequence[str]] = None,
+    exclude: Optional[Sequence[str]] = None,
+    exclude_dirs: Optional[Sequence[str]] = None,
+    max_file_size: Optional[int] = None,
+    use_ignore_files: bool = True,
+) -> Dict[str, Union[str, None]]:
+    """Scans a directory tree for shell/scripting files using a persistent scan index.
+
+    Files whose device, inode, size and modification time match their index entry are not re-examined. Index
+    entries of files under ``root`` that are no longer found are removed.
+
+    NOTE:
+        See :func:`autodoc.utils.walk.walk_files` for which directories and files are skipped.
+
+    Args:
+        root: Root directory.
+        index: Scan index file path.
+        include: Glob patterns of files to include. Defaults to None (all files).
+        exclude: Glob patterns of files and directories to exclude. Defaults to None.
+        exclude_dirs: Directory paths to exclude. Defaults to None.
+        max_file_size: Maximum file size (in bytes). Larger files are skipped. Defaults to None (no limit).
+        use_ignore_files: Honor ``.gitignore`` and ``.autodocignore`` files. Defaults to True.
+
+    Returns:
+        Dictionary that maps the path of each scanned file to its script type (**OR** None if it is not a script).
+    """
+    root: str = os.path.abspath(root)
+    conn: sqlite3.Connection = open_scan_index(index)
+
+    try:
+        known: Dict[str, Tuple[_Signature, Union[str, None]]] = {
+            path: ((dev, inode, size, mtime), script_type)
+            for path, dev, inode, size, mtime, script_type in conn.execute(
+                "SELECT path, dev, inode, size, mtime, script_type FROM files WHERE path = ? OR substr(path, 1, ?) = ?",
+                (root, len(root) + 1, root + os.sep),
+            )
+        }
+
+        found: Dict[str, Union[str, None]] = {}
+        updates: List[Tuple[str, int, int, int, int, Union[str, None]]] = []
+
+        for path, st in walk_files(
+            root,
+            include=include,
+            exclude=exclude,
+            exclude_dirs=exclude_dirs,
+            max_file_size=max_file_size,
+            use_ignore_files=use_ignore_files,
+        ):
+            emit("file_scanned", path=path, size=st.st_size)
+            signature: _Signature = (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns)
+            previous: Union[Tuple[_Signature, Union[str, None]], None] = known.get(
+                path, None
+            )
+
+            if previous is not None and previous[0] == signature:
+                found[path] = previous[1]
+                continue
+
+            script_type: Union[str, None] = detect_script_type(infile=path)
+            found[path] = script_type
+            updates.append((path, *signature, script_type))
+
+        stale: List[Tuple[str]] = [(x,) for x in known if x not in found]
+
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO files (path, dev, inode, size, mtime, script_type) VALUES (?, ?, ?, ?, ?, ?)",
+                updates,
+            )
+            conn.executemany("DELETE FROM files WHERE path = ?", stale)
+    finally:
+        conn.close()
+
+    return found
+
+
+def query_scan_index(
+    index: str, script_type: Optional[str] = None, root: Optional[str] = None
+) -> List[Tuple[str, str]]:
+    """Queries a scan index for shell/scripting files.
+
+    Usage example:
+        >>> query_scan_index("doc/.autodoc/scan.sqlite", script_type="perl")
+        [('/path/to/pkg/bin/tool', 'perl')]
+
+    Args:
+        index: Scan index file path.
+        script_type: Only return files of this script type. Defaults to None (all script types).
+        root: Only return files under this directory. Defaults to None (all files).
+
+    Returns:
+        Sorted list of tuples of file path and script type.
+    """
+    query: str = "SELECT path, script_type FROM files WHERE script_type IS NOT NULL"
+    params: List[Union[str, int]] = []
+
+    if script_type is not None:
+        query += " AND script_type = ?"
+        params.append(script_type)
+
+    if root is not None:
+        root: str = os.path.abspath(root)
+        query += " AND substr(path, 1, ?) = ?"
+        params.extend([len(root) + 1, root + os.sep])
+
+    conn: sqlite3.Connection = open_scan_index(index)
+    try:
+        rows: List[Tuple[str, str]] = conn.execute(
+            query + " ORDER BY path", params
+        ).fetchall()
+    finally:
+        conn.close()
+
+    return rows
@@ -0,0 +1,341 @@
+"""Instrumentation of the documentation pipeline.
+
+Pipeline stages and per-file operations emit events to subscribed callbacks. Nothing is recorded
+unless a callback is subscribed, e.g. a :class:`TraceRecorder`:
+
+    >>> with TraceRecorder(profile_dir="profiles") as rec:
+    ...     doc_init(outdir=outdir, pkg=pkg)
+    ...     write(outdir=outdir, pkg=pkg)
+    ...     build_docs(outdir=outdir)
+    ...
+    >>> rec.export_chrome_trace("trace.json")  # Open with chrome://tracing or https://ui.perfetto.dev
+    >>> print(rec.summary(top=10))
+
+Events are dictionaries with the keys ``event`` (event name), ``time`` (``time.perf_counter`` seconds),
+``pid`` and ``tid``, plus event specific data:
+    * ``stage_start``: ``stage``.
+    * ``stage_end``: ``stage``, ``duration`` (seconds), ``max_rss`` (peak RSS of the process, in bytes).
+    * ``file_scanned``: ``path``, ``size`` (files found by the script search, see :func:`autodoc.doccode.shell.file_search`).
+    * ``file_detected``: ``path``, ``script_type``, ``duration``.
+    * ``file_rendered``: ``path``, ``outfile``, ``bytes_read``, ``bytes_written``, ``duration``.
+    * ``subprocess_launched``: ``command``, ``cwd``.
+    * ``subprocess_finished``: ``command``, ``cwd``, ``returncode``, ``duration``.
+
+NOTE:
+    Events emitted in worker processes (e.g. ``use_processes=True``) are not delivered to callbacks of the parent process.
+"""
+import cProfile
+import json
+import os
+import resource
+import sys
+import threading
+import time
+
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+# Subscribed event callbacks
+_SUBSCRIBERS: List[Callable[[Dict[str, Any]], None]] = []
+
+# Directory to write per-stage cProfile statistics to (None disables profiling)
+_PROFILE_DIR: Optional[str] = None
+
+# Held by the profiled stage: cProfile profilers cannot run concurrently (e.g. on Python 3.12+)
+_PROFILE_LOCK: threading.Lock = threading.Lock()
+
+
+def subscribe(callback: Callable[[Dict[str, Any]], None]) -> None:
+    """Subscribes a callback to pipeline events.
+
+    Args:
+        callback: Function called with each event (dictionary).
+    """
+    _SUBSCRIBERS.append(callback)
+    return None
+
+
+def unsubscribe(callback: Callable[[Dict[str, Any]], None]) -> None:
+    """Unsubscribes a callback from pipeline events.
+
+    Args:
+        callback: Previously subscribed function.
+    """
+    if callback in _SUBSCRIBERS:
+        _SUBSCRIBERS.remove(callback)
+    return None
+
+
+def enabled() -> bool:
+    """Checks whether any callback is subscribed to pipeline events.
+
+    Returns:
+        True if events are being recorded, False otherwise.
+    """
+    return bool(_SUBSCRIBERS)
+
+
+def profiling() -> bool:
+    """Checks whether stages are profiled (see :class:`TraceRecorder`).
+
+    Returns:
+        True if stages are profiled, False otherwise.
+    """
+    return bool(_SUBSCRIBERS) and _PROFILE_DIR is not None
+
+
+def emit(event: str, **data: Any) -> None:
+    """Emits a pipeline event to all subscribed callbacks.
+
+    Args:
+        event: Event name.
+        data: Event specific data.
+    """
+    if not _SUBSCRIBERS:
+        return None
+
+    payload: Dict[str, Any] = {
+        "event": event,
+        "time": time.perf_counter(),
+        "pid": os.getpid(),
+        "tid": threading.get_ident(),
+        **data,
+    }
+
+    for callback in list(_SUBSCRIBERS):
+        callback(payload)
+    return None
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Context manager that emits ``stage_start`` and ``stage_end`` events around a pipeline stage.
+
+    If profiling is enabled (see :class:`TraceRecorder`), the outermost stage is profiled with ``cProfile``,
+    and its statistics are written to ``<profile_dir>/<stage>.prof``.
+
+    NOTE:
+        Only one stage is profiled at a time: stages that start while another stage is profiled (nested stages,
+        or stages of other threads) are not profiled themselves.
+
+    Args:
+        name: Stage name.
+    """
+    if not _SUBSCRIBERS:
+        yield
+        return
+
+    profiler: Optional[cProfile.Profile] = None
+
+    if _PROFILE_DIR is not None and _PROFILE_LOCK.acquire(blocking=False):
+        profiler = cProfile.Profile()
+        profiler.enable()
+
+    emit("stage_start", stage=name)
+    start: float = time.perf_counter()
+
+    try:
+        yield
+    finally:
+        duration: float = time.perf_counter() - start
+
+        if profiler is not None:
+            profiler.disable()
+            _PROFILE_LOCK.release()
+            os.makedirs(_PROFILE_DIR, exist_ok=True)
+            profiler.dump_stats(os.path.join(_PROFILE_DIR, f"{name}.prof"))
+
+        emit("stage_end", stage=name, duration=duration, max_rss=_max_rss())
+
+
+def _max_rss() -> int:
+    """Helper function that returns the peak resident set size (RSS) of the current process.
+
+    Returns:
+        Peak RSS in bytes.
+    """
+    rss: int = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss if sys.platform == "darwin" else rss * 1024
+
+
+class TraceRecorder:
+    """Records pipeline events, and exports them as a Chrome trace (Perfetto) or a summary table.
+
+    Usage example:
+        >>> with TraceRecorder() as rec:
+        ...     write(outdir=outdir, pkg=pkg)
+        ...
+        >>> rec.export_chrome_trace("trace.json")
+
+    Args:
+        profile_dir: Directory to write per-stage ``cProfile`` statistics to. Defaults to None (no profiling).
+    """
+
+    def __init__(self, profile_dir: Optional[str] = None) -> None:
+        """Initialization method for the ``TraceRecorder`` class.
+
+        Args:
+            profile_dir: Directory to write per-stage ``cProfile`` statistics to. Defaults to None (no profiling).
+        """
+        self.events: List[Dict[str, Any]] = []
+        self.profile_dir: Optional[str] = profile_dir
+        self._lock: threading.Lock = threading.Lock()
+
+    def __call__(self, event: Dict[str, Any]) -> None:
+        """Records an event.
+
+        Args:
+            event: Event (dictionary).
+        """
+        with self._lock:
+            self.events.append(event)
+
+    def __enter__(self):
+        """Context manager entrance method: subscribes to pipeline events."""
+        global _PROFILE_DIR
+
+        subscribe(self)
+        if self.profile_dir is not None:
+            _PROFILE_DIR = os.path.abspath(self.profile_dir)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        """Context manager exit method: unsubscribes from pipeline events."""
+        global _PROFILE_DIR
+
+        unsubscribe(self)
+        if self.profile_dir is not None:
+            _PROFILE_DIR = None
+        return None
+
+    def chrome_trace(self) -> Dict[str, Any]:
+        """Converts the recorded events to the Chrome trace event format.
+
+        Returns:
+            Chrome trace (dictionary with a ``traceEvents`` list).
+        """
+        trace: List[Dict[str, Any]] = []
+        open_events: Dict[Tuple[int, int, str], List[Dict[str, Any]]] = {}
+
+        if self.events:
+            t0: float = min(x["time"] for x in self.events)
+        else:
+            t0: float = 0.0
+
+        def _us(t: float) -> float:
+            return (t - t0) * 1e6
+
+        for x in self.events:
+            args: Dict[str, Any] = {
+                k: v for k, v in x.items() if k not in ("event", "time", "pid", "tid")
+            }
+            common: Dict[str, Any] = {"pid": x["pid"], "tid": x["tid"], "args": args}
+
+            if x["event"] in ("stage_start", "subprocess_launched"):
+                key: str = x.get("stage", None) or x.get("command", "")
+                open_events.setdefault((x["pid"], x["tid"], key), []).append(x)
+            elif x["event"] in ("stage_end", "subprocess_finished"):
+                key: str = x.get("stage", None) or x.get("command", "")
+                starts: List[Dict[str, Any]] = open_events.get((x["pid"], x["tid"], key), [])
+                start: float = starts.pop()["time"] if starts else x["time"] - x["duration"]
+                trace.append(
+                    {
+                        "name": key,
+                        "cat": "stage" if x["event"] == "stage_end" else "subprocess",
+                        "ph": "X",
+                        "ts": _us(start),
+                        "dur": (x["time"] - start) * 1e6,
+                        **common,
+                    }
+                )
+            elif "duration" in x:
+                trace.append(
+                    {
+                        "name": os.path.basename(x.get("path", x["event"])),
+                        "cat": x["event"],
+                        "ph": "X",
+                        "ts": _us(x["time"] - x["duration"]),
+                        "dur": x["duration"] * 1e6,
+                        **common,
+                    }
+                )
+            else:
+                trace.append(
+                    {
+                        "name": os.path.basename(x.get("path", x["event"])),
+                        "cat": x["event"],
+                        "ph": "i",
+                        "s": "t",
+                        "ts": _us(x["time"]),
+                        **common,
+                    }
+                )
+
+        return {"traceEvents": trace, "displayTimeUnit": "ms"}
+
+    def export_chrome_trace(self, outfile: str) -> str:
+        """Writes the recorded events as a Chrome trace (JSON), which can be opened with ``chrome://tracing`` or Perfetto.
+
+        Args:
+            outfile: Output JSON file path.
+
+        Returns:
+            Output file path.
+        """
+        with open(outfile, mode="w", encoding="utf-8") as f:
+            json.dump(self.chrome_trace(), f)
+        return outfile
+
+    def summary(self, top: int = 10) -> str:
+        """Summarizes the recorded events: time per stage, bytes read/written, peak memory, and the slowest files.
+
+        Args:
+            top: Number of slowest files to list. Defaults to 10.
+
+        Returns:
+            Summary table text.
+        """
+        stages: List[Tuple[str, float]] = [
+            (x["stage"], x["duration"]) for x in self.events if x["event"] == "stage_end"
+        ]
+        rendered: List[Dict[str, Any]] = [
+            x for x in self.events if x["event"] == "file_rendered"
+        ]
+        subprocesses: List[Dict[str, Any]] = [
+            x for x in self.events if x["event"] == "subprocess_finished"
+        ]
+        max_rss: int = max(
+            [x["max_rss"] for x in self.events if x["event"] == "stage_end"] or [0]
+        )
+
+        # Total time per file over detection and rendering
+        per_file: Dict[str, float] = {}
+        for x in self.events:
+            if x["event"] in ("file_detected", "file_rendered"):
+                per_file[x["path"]] = per_file.get(x["path"], 0.0) + x["duration"]
+
+        lines: List[str] = ["Stages", "------"]
+        lines.extend(f"{duration:>10.3f}s  {name}" for name, duration in stages)
+
+        lines.extend(["", "Subprocesses", "------------"])
+        lines.extend(f"{x['duration']:>10.3f}s  {x['command']}" for x in subprocesses)
+
+        lines.extend(
+            [
+                "",
+                f"Files scanned:   {sum(1 for x in self.events if x['event'] == 'file_scanned')}",
+                f"Files rendered:  {len(rendered)}",
+                f"Bytes read:      {sum(x['bytes_read'] for x in rendered)}",
+                f"Bytes written:   {sum(x['bytes_written'] for x in rendered)}",
+                f"Peak RSS (MiB):  {max_rss / (1 << 20):.1f}",
+                "",
+                f"Slowest files (top {top})",
+                "-" * len(f"Slowest files (top {top})"),
+            ]
+        )
+        slowest: List[Tuple[str, float]] = sorted(
+            per_file.items(), key=lambda x: x[1], reverse=True
+        )[:top]
+        lines.extend(f"{duration:>10.3f}s  {path}" for path, duration in slowest)
+
+        return "\n".join(lines)
@@ -1,9 +1,20 @@
 """Utility functions.
 """
+import hashlib
 import os
 import re
+import shlex
+import subprocess
+import threading
+import time
 
-from typing import List, Optional, Tuple, Union
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, TextIO, Tuple, Union
+
+from autodoc.utils.trace import emit
+
+# Number of output lines of failed commands that are included in exceptions (see :func:`run_command`)
+_OUTPUT_LINES: int = 20
 
 
 def read_file(infile: str, /, encoding: Optional[str] = "utf-8") -> List[str]:
@@ -27,28 +38,61 @@ def read_file(infile: str, /, encoding: Optional[str] = "utf-8") -> List[str]:
     return contents
 
 
+def iter_file(
+    infile: str, /, encoding: Optional[str] = "utf-8", errors: Optional[str] = None
+) -> Iterator[str]:
+    """Lazily reads input file one line at a time.
+
+    Iterator-based counterpart of :func:`read_file`, which keeps memory use constant regardless of file size.
+
+    NOTE:
+        Iteration stops at the first line that cannot be decoded, unless ``errors`` is set (e.g. "replace").
+
+    Args:
+        infile: Argument only input file (of text).
+        encoding: Encoding standard. Defaults to "utf-8".
+        errors: Decoding error handling scheme - arguments are the same as python's built-in ``open`` function. Defaults to None (strict).
+
+    Yields:
+        Lines of text (including line endings).
+    """
+    infile: str = os.path.abspath(infile)
+
+    with open(infile, mode="r", encoding=encoding, errors=errors) as f:
+        try:
+            for line in f:
+                yield line
+        except UnicodeDecodeError:
+            return
+
+
 def write_file(
     outfile: str,
     /,
-    text: Union[str, List[str]],
+    text: Union[str, Iterable[str]],
     encoding: Optional[str] = "utf-8",
     prepend_char: Optional[str] = None,
     append_char: Optional[str] = None,
     convert_tabs_to_spaces: bool = False,
     num_spaces: Optional[int] = 4,
     mode: str = "a",
+    atomic: bool = False,
 ) -> None:
     """Writes text to some output file.
 
+    NOTE:
+        ``text`` may be any iterable of strings (e.g. a generator), which is written to file as it is consumed.
+
     Args:
         outfile: Argument only output file name.
-        text: Text to be written to file.
+        text: Text (string or iterable of strings) to be written to file.
         encoding: Encoding standard. Defaults to "utf-8".
         prepend_char: Characters to be prepended to text. Defaults to None.
         append_char: Characters to be appended to text. Defaults to None.
         convert_tabs_to_spaces: Convert tabs to spaces. Defaults to False.
         num_spaces: Number of spaces to replace tabs with. Only applicable when ``convert_tabs_to_spaces`` is True. Defaults to 4.
         mode: Opening mode option - arguments are the same as python's built-in ``open`` function. Defaults to "a" (append).
+        atomic: Write the file with :func:`atomic_write`, i.e. replace it only if its contents change. Only applicable when ``mode`` is "w". Defaults to False.
     """
     if prepend_char is None:
         prepend_char: str = ""
@@ -64,13 +108,88 @@ def write_file(
         text: List[str] = [text]
 
     if convert_tabs_to_spaces:
-        text: List[str] = tabs2spaces(text, replacement_spaces=int(num_spaces))
+        text: Iterator[str] = iter_tabs2spaces(text, replacement_spaces=int(num_spaces))
 
-    with open(outfile, mode=mode, encoding=encoding) as f:
-        f.writelines([prepend_char + x + append_char for x in text])
+    if atomic and mode == "w":
+        opener = atomic_write(outfile, encoding=encoding)
+    else:
+        opener = open(outfile, mode=mode, encoding=encoding)
+
+    with opener as f:
+        for x in text:
+            f.write(prepend_char + x + append_char)
     return None
 
 
+@contextmanager
+def atomic_write(outfile: str, /, encoding: Optional[str] = "utf-8") -> Iterator[TextIO]:
+    """Context manager that writes a file atomically, leaving it untouched if its contents do not change.
+
+    Text is written to a temporary file in the same directory as ``outfile``. On exit, the temporary file is
+    compared to ``outfile`` by hash: if they differ, ``outfile`` is replaced (renamed over) by the temporary file,
+    otherwise the temporary file is removed so that the modification time of ``outfile`` is preserved. If an
+    exception is raised, ``outfile`` is left as is.
+
+    Usage example:
+        >>> with atomic_write("index.rst") as f:
+        ...     f.write("Some text")
+
+    Args:
+        outfile: Argument only output file name.
+        encoding: Encoding standard. Defaults to "utf-8".
+
+    Yields:
+        Writable text file object.
+    """
+    outfile: str = os.path.abspath(outfile)
+    dirname, basename = os.path.split(outfile)
+    tmp: str = os.path.join(
+        dirname, f".{basename}.{os.getpid()}.{threading.get_ident()}.tmp"
+    )
+
+    try:
+        with open(tmp, mode="w", encoding=encoding) as f:
+            yield f
+
+        if _same_contents(tmp, outfile):
+            os.remove(tmp)
+        else:
+            os.replace(tmp, outfile)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def _same_contents(file1: str, file2: str, chunk_size: int = 1 << 20) -> bool:
+    """Helper function that compares the contents of two files by size and SHA-256 hash.
+
+    Args:
+        file1: First file.
+        file2: Second file (which need not exist).
+        chunk_size: Number of bytes to read at a time. Defaults to 1 MiB.
+
+    Returns:
+        True if both files exist and have the same contents, False otherwise.
+    """
+    try:
+        if os.path.getsize(file1) != os.path.getsize(file2):
+            return False
+    except OSError:
+        return False
+
+    digests: List[str] = []
+
+    for file in (file1, file2):
+        digest = hashlib.sha256()
+        with open(file, mode="rb") as f:
+            for chunk in iter(lambda: f.read(chunk_size), b""):
+                digest.update(chunk)
+        digests.append(digest.hexdigest())
+
+    return digests[0] == digests[1]
+
+
 def tabs2spaces(
     text: Union[str, List[str]], /, replacement_spaces: Optional[Union[int, str]] = None
 ) -> List[str]:
@@ -112,6 +231,37 @@ def tabs2spaces(
     return text
 
 
+def iter_tabs2spaces(
+    text: Iterable[str], /, replacement_spaces: Optional[Union[int, str]] = None
+) -> Iterator[str]:
+    """Lazily converts tabs to spaces.
+
+    Iterator-based counterpart of :func:`tabs2spaces`. The input is **NOT** modified in place.
+
+    Args:
+        text: Argument only iterable of strings that correpond to text.
+        replacement_spaces: String **OR** number of replacement spaces to replace tabs. Defaults to None.
+
+    Raises:
+        TypeError: Exception that is raised if ``replacement_spaces`` is not an ``int`` or ``str``.
+
+    Yields:
+        Strings with tabs replaced with spaces.
+    """
+    if replacement_spaces is None:
+        replacement_spaces: str = ""
+    elif isinstance(replacement_spaces, int):
+        replacement_spaces: str = " " * replacement_spaces
+    elif isinstance(replacement_spaces, str):
+        pass
+    else:
+        raise TypeError(
+            f"Input replacement_spaces: {replacement_spaces} is not an integer or string."
+        )
+
+    return (x.replace("\t", replacement_spaces) for x in text)
+
+
 def spaces2tabs(
     text: Union[str, List[str]], /, num_spaces: Optional[Union[int, str]] = None
 ) -> List[str]:
@@ -149,3 +299,81 @@ def spaces2tabs(
     for i, alpha_numerics in enumerate(text):
         text[i] = re.sub(pattern=num_spaces, repl="\t", string=alpha_numerics)
     return text
+
+
+def run_command(
+    command: Union[str, Sequence[str]],
+    /,
+    cwd: Optional[str] = None,
+    log: Optional[str] = None,
+    raise_exc: bool = True,
+    env: Optional[Dict[str, str]] = None,
+) -> int:
+    """Runs a command line program in some working directory, without changing the working directory of the current process.
+
+    NOTE:
+        Standard output and error are both written to ``log`` (overwriting it), or captured if ``log`` is None.
+        If the command fails, the exception includes the last lines of its output (or the path of ``log``).
+
+    Usage example:
+        >>> run_command("make html", cwd="/path/to/doc", log="/path/to/build.log")
+        0
+
+    Args:
+        command: Argument only command, as a string (split using shell-like syntax) or a sequence of arguments.
+        cwd: Working directory of the command. Defaults to None (current working directory).
+        log: Output file for the standard output and error of the command. Defaults to None.
+        raise_exc: If true, raises ``RuntimeError`` exception if the return code of the command is not 0. Defaults to True.
+        env: Environment variables of the command, in addition to those of the current process. Defaults to None.
+
+    Raises:
+        RuntimeError: Exception that is raised if the return code of the command is not 0 and ``raise_exc`` is True.
+
+    Returns:
+        Return code of the command.
+    """
+    if isinstance(command, str):
+        args: List[str] = shlex.split(command)
+    else:
+        args: List[str] = list(command)
+
+    if env is not None:
+        env: Dict[str, str] = {**os.environ, **env}
+
+    emit("subprocess_launched", command=shlex.join(args), cwd=cwd)
+    start: float = time.perf_counter()
+
+    if log is not None:
+        with open(log, mode="w", encoding="utf-8") as f:
+            p: subprocess.CompletedProcess = subprocess.run(
+                args, cwd=cwd, env=env, stdout=f, stderr=subprocess.STDOUT
+            )
+    else:
+        p: subprocess.CompletedProcess = subprocess.run(
+            args,
+            cwd=cwd,
+            env=env,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            encoding="utf-8",
+            errors="replace",
+        )
+
+    emit(
+        "subprocess_finished",
+        command=shlex.join(args),
+        cwd=cwd,
+        returncode=p.returncode,
+        duration=time.perf_counter() - start,
+    )
+
+    if p.returncode != 0 and raise_exc:
+        if log is not None:
+            details: str = f"See {log} for its output."
+        else:
+            details: str = "\n".join(p.stdout.rstrip().splitlines()[-_OUTPUT_LINES:])
+        raise RuntimeError(
+            f"\nFailed:\t{shlex.join(args)} with return code {p.returncode}\n{details}\n"
+        )
+
+    return p.returncode
@@ -0,0 +1,400 @@
+"""Directory walker that honors ignore files and prunes directories before descending into them.
+"""
+import os
+import re
+
+from fnmatch import fnmatch
+from typing import Iterator, List, Optional, Pattern, Sequence, Set, Tuple
+
+# Directory names that are never descended into
+_PRUNE_DIRS: Set[str] = {
+    ".autodoc",
+    ".eggs",
+    ".git",
+    ".hg",
+    ".mypy_cache",
+    ".nox",
+    ".pytest_cache",
+    ".svn",
+    ".tox",
+    ".venv",
+    "__pycache__",
+    "node_modules",
+}
+
+# Ignore files (gitignore syntax) that are read in every directory
+_IGNORE_FILES: Tuple[str, ...] = (".gitignore", ".autodocignore")
+
+# Ignore rule: (base directory, compiled pattern, negated, directories only)
+IgnoreRule = Tuple[str, Pattern, bool, bool]
+
+
+def walk_files(
+    root: str,
+    include: Optional[Sequence[str]] = None,
+    exclude: Optional[Sequence[str]] = None,
+    exclude_dirs: Optional[Sequence[str]] = None,
+    max_file_size: Optional[int] = None,
+    use_ignore_files: bool = True,
+) -> Iterator[Tuple[str, os.stat_result]]:
+    """Walks a directory tree and yields the files within it.
+
+    Directories are pruned before they are descended into when:
+        * Their name is a version control, cache, or ``node_modules`` directory.
+        * They are virtual environments (contain a ``pyvenv.cfg`` file).
+        * They are listed in ``exclude_dirs``, or match an ``exclude`` glob.
+        * They are ignored by a ``.gitignore`` or ``.autodocignore`` file.
+
+    Symbolic links are followed. Each directory and file is visited at most once (by device and inode), so that
+    symbolic link cycles terminate and files reachable through several links are only yielded once.
+
+    NOTE:
+        * Glob patterns are matched against both the path relative to ``root`` (using ``/`` separators) and the file/directory name.
+        * Files and directories are visited in sorted order.
+
+    Args:
+        root: Root directory.
+        include: Glob patterns of files to include. Defaults to None (all files).
+        exclude: Glob patterns of files and directories to exclude. Defaults to None.
+        exclude_dirs: Directory paths to exclude. Defaults to None.
+        max_file_size: Maximum file size (in bytes). Larger files are skipped. Defaults to None (no limit).
+        use_ignore_files: Honor ``.gitignore`` and ``.autodocignore`` files. Defaults to True.
+
+    Yields:
+        Tuple of file path and its ``os.stat_result``.
+    """
+    root: str = os.path.abspath(root)
+    pruned: Set[str] = {os.path.realpath(x) for x in (exclude_dirs or [])}
+
+    try:
+        root_stat: os.stat_result = os.stat(root)
+    except OSError:
+        return
+
+    seen_dirs: Set[Tuple[int, int]] = {(root_stat.st_dev, root_stat.st_ino)}
+    seen_files: Set[Tuple[int, int]] = set()
+
+    stack: List[Tuple[str, List[IgnoreRule]]] = [(root, [])]
+
+    while stack:
+        dirpath, rules = stack.pop()
+
+        try:
+            with os.scandir(dirpath) as it:
+                entries: List[os.DirEntry] = sorted(it, key=lambda x: x.name)
+        except OSError:
+            continue
+
+        names: Set[str] = {x.name for x in entries}
+
+        # Do not descend into virtual environments
+        if "pyvenv.cfg" in names and dirpath != root:
+            continue
+
+        if use_ignore_files:
+            rules: List[IgnoreRule] = rules + _read_ignore_rules(dirpath, names)
+
+        subdirs: List[Tuple[str, List[IgnoreRule]]] = []
+
+        for entry in entries:
+            path: str = entry.path
+            rel: str = os.path.relpath(path, root).replace(os.sep, "/")
+
+            try:
+                is_dir: bool = entry.is_dir()
+            except OSError:
+                continue
+
+            if is_dir:
+                if (
+                    entry.name in _PRUNE_DIRS
+                    or _glob_match(rel, entry.name, exclude)
+                    or _is_ignored(path, True, rules)
+                ):
+                    continue
+
+                try:
+                    st: os.stat_result = entry.stat()
+                except OSError:
+                    continue
+
+                key: Tuple[int, int] = (st.st_dev, st.st_ino)
+
+                if key in seen_dirs or os.path.realpath(path) in pruned:
+                    continue
+
+                seen_dirs.add(key)
+                subdirs.append((path, rules))
+                continue
+
+            if (
+                (include and not _glob_match(rel, entry.name, include))
+                or _glob_match(rel, entry.name, exclude)
+                or _is_ignored(path, False, rules)
+            ):
+                continue
+
+            try:
+                st: os.stat_result = entry.stat()
+            except OSError:
+                # Broken symbolic link
+                continue
+
+            key: Tuple[int, int] = (st.st_dev, st.st_ino)
+
+            if key in seen_files:
+                continue
+
+            seen_files.add(key)
+
+            if max_file_size is not None and st.st_size > max_file_size:
+                continue
+
+            yield path, st
+
+        # Reversed, so that subdirectories are popped in sorted order
+        stack.extend(reversed(subdirs))
+
+
+def is_walked(
+    root: str,
+    path: str,
+    include: Optional[Sequence[str]] = None,
+    exclude: Optional[Sequence[str]] = None,
+    exclude_dirs: Optional[Sequence[str]] = None,
+    max_file_size: Optional[int] = None,
+    use_ignore_files: bool = True,
+) -> bool:
+    """Checks whether a single file would be yielded by :func:`walk_files`, without walking the directory tree.
+
+    NOTE:
+        * Paths that do not exist (e.g. deleted files) are checked against the directory and file rules only (not ``max_file_size``).
+        * Unlike :func:`walk_files`, files reachable through several symbolic links are not deduplicated.
+
+    Args:
+        root: Root directory.
+        path: File path.
+        include: Glob patterns of files to include. Defaults to None (all files).
+        exclude: Glob patterns of files and directories to exclude. Defaults to None.
+        exclude_dirs: Directory paths to exclude. Defaults to None.
+        max_file_size: Maximum file size (in bytes). Defaults to None (no limit).
+        use_ignore_files: Honor ``.gitignore`` and ``.autodocignore`` files. Defaults to True.
+
+    Returns:
+        True if the file is within ``root`` and is not skipped by any rule of :func:`walk_files`, False otherwise.
+    """
+    root: str = os.path.abspath(root)
+    path: str = os.path.abspath(path)
+    pruned: Set[str] = {os.path.realpath(x) for x in (exclude_dirs or [])}
+
+    if not path.startswith(root + os.sep):
+        return False
+
+    parts: List[str] = os.path.relpath(path, root).split(os.sep)
+    rules: List[IgnoreRule] = []
+    dirpath: str = root
+
+    # Apply the directory rules from the root down to the parent directory of the file
+    for i, name in enumerate(parts):
+        try:
+            names: Set[str] = set(os.listdir(dirpath))
+        except OSError:
+            names: Set[str] = set()
+
+        if "pyvenv.cfg" in names and dirpath != root:
+            return False
+
+        if use_ignore_files:
+            rules: List[IgnoreRule] = rules + _read_ignore_rules(dirpath, names)
+
+        child: str = os.path.join(dirpath, name)
+        rel: str = "/".join(parts[: i + 1])
+
+        if i == len(parts) - 1:
+            break
+
+        if (
+            name in _PRUNE_DIRS
+            or _glob_match(rel, name, exclude)
+            or _is_ignored(child, True, rules)
+            or os.path.realpath(child) in pruned
+        ):
+            return False
+
+        dirpath: str = child
+
+    if (
+        (include and not _glob_match(rel, name, include))
+        or _glob_match(rel, name, exclude)
+        or _is_ignored(path, False, rules)
+    ):
+        return False
+
+    if max_file_size is not None:
+        try:
+            return os.stat(path).st_size <= max_file_size
+        except OSError:
+            pass
+    return True
+
+
+def _glob_match(rel: str, name: str, patterns: Optional[Sequence[str]]) -> bool:
+    """Helper function that matches a path against glob patterns.
+
+    Args:
+        rel: Path relative to the walk root (using ``/`` separators).
+        name: File or directory name.
+        patterns: Glob patterns.
+
+    Returns:
+        True if any pattern matches either the relative path or the name, False otherwise.
+    """
+    if not patterns:
+        return False
+
+    for pattern in patterns:
+        if fnmatch(rel, pattern) or fnmatch(name, pattern):
+            return True
+    return False
+
+
+def _is_ignored(path: str, is_dir: bool, rules: List[IgnoreRule]) -> bool:
+    """Helper function that evaluates ignore rules for some path.
+
+    NOTE:
+        As with ``git``, the last matching rule takes precedence.
+
+    Args:
+        path: File or directory path.
+        is_dir: Whether ``path`` is a directory.
+        rules: Ignore rules, in order of precedence (lowest first).
+
+    Returns:
+        True if the path is ignored, False otherwise.
+    """
+    ignored: bool = False
+
+    for base, regex, negate, dir_only in rules:
+        if dir_only and not is_dir:
+            continue
+        rel: str = os.path.relpath(path, base).replace(os.sep, "/")
+        if regex.match(rel):
+            ignored: bool = not negate
+    return ignored
+
+
+def _read_ignore_rules(dirpath: str, names: Set[str]) -> List[IgnoreRule]:
+    """Helper function that reads the ignore rules defined in some directory.
+
+    Args:
+        dirpath: Directory path.
+        names: Names of the files in the directory.
+
+    Returns:
+        List of ignore rules.
+    """
+    rules: List[IgnoreRule] = []
+
+    for ignore_file in _IGNORE_FILES:
+        if ignore_file not in names:
+            continue
+
+        try:
+            with open(
+                os.path.join(dirpath, ignore_file), mode="r", encoding="utf-8"
+            ) as f:
+                lines: List[str] = f.read().splitlines()
+        except (OSError, UnicodeDecodeError):
+            continue
+
+        for line in lines:
+            rule: Optional[IgnoreRule] = _compile_ignore_pattern(dirpath, line)
+            if rule is not None:
+                rules.append(rule)
+    return rules
+
+
+def _compile_ignore_pattern(base: str, line: str) -> Optional[IgnoreRule]:
+    """Helper function that compiles a single ``.gitignore`` pattern.
+
+    Args:
+        base: Directory that contains the ignore file.
+        line: Line of the ignore file.
+
+    Returns:
+        Ignore rule **OR** None if the line is blank or a comment.
+    """
+    pattern: str = line.rstrip()
+
+    if not pattern or pattern.startswith("#"):
+        return None
+
+    negate: bool = pattern.startswith("!")
+    if negate:
+        pattern: str = pattern[1:]
+
+    if pattern.startswith("\\"):
+        pattern: str = pattern[1:]
+
+    dir_only: bool = pattern.endswith("/")
+    pattern: str = pattern.rstrip("/")
+
+    if not pattern:
+        return None
+
+    # Patterns with a separator are relative to the ignore file's directory, others match at any depth
+    anchored: bool = "/" in pattern
+    pattern: str = pattern.lstrip("/")
+
+    regex: str = _translate(pattern)
+
+    if not anchored:
+        regex: str = f"(?:.*/)?{regex}"
+
+    return base, re.compile(f"^{regex}$"), negate, dir_only
+
+
+def _translate(pattern: str) -> str:
+    """Helper function that translates a ``.gitignore`` glob into a regular expression.
+
+    Args:
+        pattern: Glob pattern.
+
+    Returns:
+        Regular expression string.
+    """
+    out: List[str] = []
+    i: int = 0
+    n: int = len(pattern)
+
+    while i < n:
+        if pattern.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("/**", i) and i + 3 == n:
+            out.append("/.*")
+            i += 3
+        elif pattern.startswith("**", i):
+            out.append(".*")
+            i += 2
+        elif pattern[i] == "*":
+            out.append("[^/]*")
+            i += 1
+        elif pattern[i] == "?":
+            out.append("[^/]")
+            i += 1
+        elif pattern[i] == "[":
+            j: int = pattern.find("]", i + 1)
+            if j == -1:
+                out.append(re.escape(pattern[i]))
+                i += 1
+            else:
+                body: str = pattern[i + 1 : j]
+                if body.startswith("!"):
+                    body: str = "^" + body[1:]
+                out.append(f"[{body}]")
+                i = j + 1
+        else:
+            out.append(re.escape(pattern[i]))
+            i += 1
+    return "".join(out)